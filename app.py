@@ -1,17 +1,101 @@
 import streamlit as st
-from pulp import LpProblem, LpVariable, LpMaximize, LpMinimize, lpSum, value, LpStatus
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import plotly.graph_objects as go
+import plotly.io as pio
 import numpy as np
 import pandas as pd
+import os
+import re
 from datetime import datetime
-
-# ---------- Page Configuration ---------- #
-st.set_page_config(page_title="🧮 LP Solver 3D++", layout="wide")
+from functools import cache, partial
+from io import BytesIO, StringIO
+
+from lpsolver import engine
+from lpsolver.batch import scenario_record, solve_scenarios
+from lpsolver.cache import DiskSolveCache, FigureCache, SolveCache, problem_hash
+from lpsolver.formats import name_problem
+from lpsolver.ingest import load_model, model_summary, save_model
+from lpsolver.history import SolutionHistory, describe, diff_solutions
+from lpsolver.jobs import CANCELLED, DONE, TIMED_OUT
+from lpsolver.geometry import (BOX, EMPTY, POLYGON, clip_lines, feasible_polygon, feasible_polytope, plot_window,
+                               polytope_mesh, thin_path)
+from lpsolver.model import (SENSE_SYMBOLS, dense_matrix, is_mip, model_from_constraints, format_constraint,
+                            model_shape)
+from lpsolver.parametric import PARAMETERS, parameter_value, parametric_sweep, sweep_table
+from lpsolver.robustness import (DISTRIBUTIONS, binding_table, objective_summary, perturbation_targets,
+                                 robustness_analysis, variable_table)
+from lpsolver.portfolio import TimingHistory, config_label, config_options, configurations, parse_config, shape_bucket
+from lpsolver.profiling import PhaseMetrics, PhaseTimer, solver_details, write_text_atomic
+from lpsolver.scheduler import PENDING, QUEUED, SchedulerBusy, SolveScheduler
+from lpsolver.sensitivity import has_sensitivity, sensitivity_tables
+from lpsolver.solve import (DEFAULT_PRESET, FEASIBLE, INCOMPLETE_STATUSES, LP_ONLY_BACKENDS, NO_SOLUTION_STATUSES, PRESETS,
+                            available_backends, mip_gap, solve_model)
+from lpsolver.warmstart import WarmStartSession
+
+# Per-variable metric cards are only drawn for small problems; larger ones get a table
+MAX_METRIC_VARS = 6
+# Imported models can have thousands of rows, so the formulation listing is truncated
+MAX_LISTED_CONSTRAINTS = 25
+# Only this many constraints get their own boundary line and legend entry on the 2D plot; the rest share one trace
+MAX_PLOTTED_CONSTRAINTS = 25
+# Constraints beyond those get merged into one background trace of at most this many lines
+MAX_BACKGROUND_LINES = 5_000
+# Traces with more points than this are drawn with WebGL (Scattergl) instead of SVG
+WEBGL_MIN_POINTS = 1_000
+# Plotted lines are thinned to about this many points across the visible axis range
+PLOT_RESOLUTION = 2_000
+# Rendered 2D/3D figures are reused across reruns; larger serialized payloads than the budget are flagged
+FIGURE_CACHE_MB = float(os.environ.get("LP_SOLVER_FIGURE_CACHE_MB", 64))
+FIGURE_BUDGET_KB = float(os.environ.get("LP_SOLVER_FIGURE_BUDGET_KB", 1024))
+# 3D feasible regions with more vertices than this are simplified before they are sent to the browser
+MAX_MESH_VERTICES = 2_000
+# Ranging and parametric sweeps work on a dense basis, so they are skipped for models with more rows x columns than this
+MAX_SENSITIVITY_CELLS = 2_000_000
+# Memory budget of the server-wide solve cache, shared by every session
+SOLVE_CACHE_MB = float(os.environ.get("LP_SOLVER_CACHE_MB", 256))
+# Optional SQLite result store shared across server processes and restarts (disabled when unset)
+SOLVE_CACHE_DB = os.environ.get("LP_SOLVER_CACHE_DB")
+SOLVE_CACHE_DB_MB = float(os.environ.get("LP_SOLVER_CACHE_DB_MB", 1024))
+SOLVE_CACHE_MAX_AGE_DAYS = float(os.environ.get("LP_SOLVER_CACHE_MAX_AGE_DAYS", 30))
+# Each session keeps its most recent solves (model and result arrays) for switching and diffing, within this budget
+SOLUTION_HISTORY_SIZE = int(os.environ.get("LP_SOLVER_HISTORY_SIZE", 10))
+SOLUTION_HISTORY_MB = float(os.environ.get("LP_SOLVER_HISTORY_MB", 64))
+# Variable types offered in the problem form; Integer and Binary make the model a MIP
+VARIABLE_TYPES = ("Continuous", "Integer", "Binary")
+# Solves run as background jobs: a run waits this long for its job before handing over to the live progress panel,
+# which polls every JOB_POLL_S seconds; the sidebar time limit (0 = none) starts at SOLVE_TIME_LIMIT_S
+JOB_INLINE_WAIT_S = float(os.environ.get("LP_SOLVER_JOB_WAIT_S", 1.0))
+JOB_POLL_S = 0.5
+SOLVE_TIME_LIMIT_S = float(os.environ.get("LP_SOLVER_TIME_LIMIT_S", 60))
+# One server-wide scheduler runs at most SOLVE_WORKERS solves at once (default: one per CPU); the rest queue, served
+# round-robin across sessions, and solves beyond SOLVE_QUEUE_LIMIT queued or SESSION_SOLVE_LIMIT per session are refused
+SOLVE_WORKERS = int(os.environ.get("LP_SOLVER_SOLVE_WORKERS", 0)) or os.cpu_count() or 1
+SOLVE_QUEUE_LIMIT = int(os.environ.get("LP_SOLVER_SOLVE_QUEUE", 32))
+SESSION_SOLVE_LIMIT = int(os.environ.get("LP_SOLVER_SESSION_SOLVES", 2))
+# Batch and robustness worker pools lease their processes from the same SOLVE_WORKERS slots, getting as many as are
+# free; a run waits up to BATCH_SLOT_WAIT_S seconds for the first one
+BATCH_SLOT_WAIT_S = float(os.environ.get("LP_SOLVER_BATCH_WAIT_S", 30))
+# Branch-and-bound threads a MIP solve starts with (default: every solver slot); each thread takes one of the slots
+MIP_THREADS = min(int(os.environ.get("LP_SOLVER_MIP_THREADS", 0)) or SOLVE_WORKERS, SOLVE_WORKERS)
+# Besides a single backend, the sidebar offers a race between configurations (backend and preset) and an automatic
+# pick of the configuration with the lowest median time so far on problems of the same shape (kept in TIMINGS_FILE)
+RACE_CHOICE = "🏁 Race"
+AUTO_CHOICE = "⚡ Auto"
+RACE_DEFAULT = ("CBC · Default", "CBC · Barrier", "HiGHS · Default", "NumPy Simplex · Default")
+TIMINGS_FILE = os.environ.get("LP_SOLVER_TIMINGS_FILE")
+# Imported models keep the objective sense their file declares unless the sidebar overrides it
+FILE_SENSE_CHOICE = "📄 As in File"
+# Presolve (dropping redundant rows, fixing variables, tightening bounds) and scaling run ahead of every solver by default
+PRESOLVE_DEFAULT = os.environ.get("LP_SOLVER_PRESOLVE", "1") != "0"
+# Monte Carlo robustness analysis: samples drawn by default, and the spread (relative std) each parameter starts with
+ROBUSTNESS_SAMPLES = int(os.environ.get("LP_SOLVER_ROBUSTNESS_SAMPLES", 1_000))
+ROBUSTNESS_SPREAD = float(os.environ.get("LP_SOLVER_ROBUSTNESS_SPREAD", 0.1))
+# Optional Prometheus textfile-collector target, rewritten with the metrics snapshot after every run
+METRICS_FILE = os.environ.get("LP_SOLVER_METRICS_FILE")
 
 # ---------- Enhanced Styling with Gradients ---------- #
-# Replace the existing st.markdown CSS section with this professional glassmorphic design
-
-st.markdown("""
+# Professional glassmorphic design, injected by apply_page_style() when the app runs
+PAGE_CSS = """
     <style>
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
 
@@ -581,9 +665,24 @@ st.markdown("""
             font-size: 0.85rem !important;
         }
     </style>
-""", unsafe_allow_html=True)
+"""
+
 
 # ---------- Functions ---------- #
+@cache
+def page_style():
+    # Comments and indentation stripped once per process; the stylesheet ships on full reruns only,
+    # since fragment reruns and form edits never reach apply_page_style()
+    css = re.sub(r"/\*.*?\*/", "", PAGE_CSS, flags=re.S)
+    return re.sub(r"\s*([{};])\s*", r"\1", re.sub(r"\s+", " ", css)).strip()
+
+
+def apply_page_style():
+    # Kept out of module scope so importing app.py (tests, tooling) has no Streamlit side effects
+    st.set_page_config(page_title="🧮 LP Solver 3D++", layout="wide")
+    st.markdown(page_style(), unsafe_allow_html=True)
+
+
 def get_user_input():
     with st.sidebar:
         st.markdown('<h2>⚙️ Configure Problem</h2>', unsafe_allow_html=True)
@@ -594,23 +693,124 @@ def get_user_input():
         problem_heading = st.text_input("🎯 Problem Heading", value="Linear Programming Problem")
 
         st.markdown("---")
-        st.markdown("**📝 Variable Names**")
-        variable_names = []
-        for i in range(3):
-            var_name = st.text_input(f"Variable x{i + 1}", value=f"x{i + 1}", key=f"varname_{i}")
-            variable_names.append(var_name)
+        input_mode = st.radio("📥 Input Mode", ("Manual", "Import File"),
+                              help="Import large models (CSV, Parquet, NumPy .npz, MPS or LP) instead of typing them in")
 
-        st.markdown("---")
-        st.markdown("**🔧 Problem Configuration**")
-        num_vars = st.slider("🔢 Number of Decision Variables", 2, 3, 2, help="Choose between 2D or 3D optimization")
-        num_constraints = st.slider("📊 Number of Constraints", 1, 5, 2,
-                                    help="More constraints = more realistic problems")
-        problem_type = st.radio("🎯 Optimization Type", ("Maximize", "Minimize"), help="Choose your objective")
+        uploaded_file = None
+        variable_names, num_vars, num_constraints = [], 0, 0
+        if input_mode == "Manual":
+            st.markdown("---")
+            st.markdown("**📝 Variable Names**")
+            for i in range(3):
+                var_name = st.text_input(f"Variable x{i + 1}", value=f"x{i + 1}", key=f"varname_{i}")
+                variable_names.append(var_name)
+
+            st.markdown("---")
+            st.markdown("**🔧 Problem Configuration**")
+            num_vars = st.slider("🔢 Number of Decision Variables", 2, 3, 2, help="Choose between 2D or 3D optimization")
+            num_constraints = st.slider("📊 Number of Constraints", 1, 5, 2,
+                                        help="More constraints = more realistic problems")
+        else:
+            st.markdown("---")
+            uploaded_file = st.file_uploader(
+                "📂 Model File", type=["csv", "parquet", "npz", "mps", "lp", "gz"],
+                help="One row per constraint with a column per variable plus 'sense' and 'rhs', "
+                     "and a row named 'objective'; an .npz archive with c, A, senses and rhs; "
+                     "or an MPS / CPLEX LP file (optionally gzipped)"
+            )
+
+        if input_mode == "Manual":
+            problem_type = st.radio("🎯 Optimization Type", ("Maximize", "Minimize"), help="Choose your objective")
+        else:
+            problem_type = st.radio("🎯 Optimization Type", (FILE_SENSE_CHOICE, "Maximize", "Minimize"),
+                                    help="Keep the sense the file declares, or override it")
+            problem_type = None if problem_type == FILE_SENSE_CHOICE else problem_type
+        solver = get_solver_choice()
+        time_limit = st.number_input("⏱️ Time Limit (s)", min_value=0.0, value=SOLVE_TIME_LIMIT_S, step=10.0,
+                                     help="Stop the solver after this many seconds (0 = no limit); "
+                                          "it then reports the best point it has")
+        mip_options = get_mip_options()
+        presolve_options = get_presolve_options()
 
         st.markdown("---")
         solve = st.button("🚀 SOLVE PROBLEM")
 
-    return problem_heading, variable_names[:num_vars], num_vars, num_constraints, problem_type, solve
+    return (problem_heading, variable_names[:num_vars], num_vars, num_constraints, problem_type, solver, time_limit,
+            mip_options, presolve_options, solve, uploaded_file)
+
+
+def get_solver_choice():
+    # One backend with a preset, a race between several configurations, or Auto
+    backends = available_backends()
+    backend = st.selectbox("🧠 Solver Backend", [*backends, RACE_CHOICE, AUTO_CHOICE],
+                           help="CBC, GLPK and HiGHS (where installed) run through PuLP; NumPy Simplex solves small "
+                                "and medium LPs in-process. Race runs several configurations at once and keeps the "
+                                "first answer; Auto picks the one that has been fastest on problems of this size")
+    if backend == RACE_CHOICE:
+        labels = [config_label(*config) for config in configurations(backends)]
+        racers = st.multiselect("🏁 Racers", labels, default=[label for label in RACE_DEFAULT if label in labels],
+                                help="Each racer takes a solver slot; the rest are stopped once one proves an answer")
+        return {"backend": RACE_CHOICE, "race": [parse_config(label) for label in racers]}
+    if backend == AUTO_CHOICE:
+        return {"backend": AUTO_CHOICE}
+    preset = st.selectbox("🎛️ Preset", list(PRESETS[backend]), help="The backend's algorithm settings")
+    return {"backend": backend, "preset": preset}
+
+
+def resolve_solver(choice, model, race=True):
+    """Solve options for the sidebar's solver ``choice`` on ``model``, and a note when the choice was adapted.
+    Without ``race`` a race choice falls back to its historically fastest racer, as Auto does over everything."""
+    mip = is_mip(model)
+    if choice["backend"] in (RACE_CHOICE, AUTO_CHOICE):
+        candidates = configurations(available_backends(), mip) if choice["backend"] == AUTO_CHOICE else [
+            tuple(config) for config in choice["race"] if not (mip and config[0] in LP_ONLY_BACKENDS)]
+        if race and choice["backend"] == RACE_CHOICE and len(candidates) > 1:
+            return {"race": [list(config) for config in candidates]}, None
+        picked = get_timings().recommend(model, candidates)
+        if picked is not None:
+            return config_options({}, *picked), (f"⚡ {config_label(*picked)} has been fastest on "
+                                                 f"{shape_bucket(model)} problems")
+        fallback = candidates[0] if candidates else ("CBC", DEFAULT_PRESET)
+        note = None if len(candidates) == 1 else (f"⚡ No timings yet for {shape_bucket(model)} problems, "
+                                                  f"so {config_label(*fallback)} solves this one")
+        return config_options({}, *fallback), note
+    if mip and choice["backend"] in LP_ONLY_BACKENDS:
+        return {"backend": "CBC"}, (f"🧩 Integer variables need branch and bound, "
+                                    f"so CBC solves this model instead of {choice['backend']}.")
+    return config_options({}, choice["backend"], choice["preset"]), None
+
+
+def solver_label(options):
+    if "race" in options:
+        return f"{RACE_CHOICE} of {len(options['race'])}"
+    return config_label(options["backend"], options.get("preset"))
+
+
+def get_mip_options():
+    # Branch-and-bound controls, passed to CBC only for models with integer variables (0 = solver default)
+    with st.expander("🧩 MIP Controls", expanded=False):
+        threads = st.number_input("🧵 Threads", min_value=1, max_value=SOLVE_WORKERS, value=MIP_THREADS,
+                                  help="Parallel branch-and-bound threads; each takes one of the server's solver slots")
+        gap_rel = st.number_input("📏 Relative Gap (%)", min_value=0.0, max_value=100.0, value=0.0, step=0.1,
+                                  help="Stop once the incumbent is within this percentage of the best bound")
+        gap_abs = st.number_input("📐 Absolute Gap", min_value=0.0, value=0.0,
+                                  help="Stop once the incumbent is within this much of the best bound")
+        max_nodes = st.number_input("🌳 Node Limit", min_value=0, value=0, step=1000,
+                                    help="Stop after exploring this many branch-and-bound nodes (0 = no limit)")
+    options = {"threads": int(threads), "gap_rel": gap_rel / 100, "gap_abs": gap_abs, "max_nodes": int(max_nodes)}
+    return {key: value for key, value in options.items() if value}
+
+
+def get_presolve_options():
+    with st.expander("🧹 Presolve", expanded=False):
+        presolve = st.checkbox("🧹 Presolve Reductions", value=PRESOLVE_DEFAULT,
+                               help="Drop empty, singleton, duplicate and redundant constraints, fix variables and "
+                                    "tighten bounds before the solver sees the model; the solution is mapped back")
+        scale = st.checkbox("📏 Geometric Scaling", value=True, disabled=not presolve,
+                            help="Scale rows and columns by powers of two so the coefficients are close to 1")
+    if not presolve:
+        return {}
+    return {"presolve": True} if scale else {"presolve": True, "scale": False}
 
 
 def get_objective_function(num_vars, variable_names):
@@ -690,102 +890,884 @@ def get_constraints(num_constraints, num_vars, variable_names):
     return constraints
 
 
-def solve_lp(num_vars, obj_coeffs, constraints, problem_type):
-    prob = LpProblem("LP", LpMaximize if problem_type == "Maximize" else LpMinimize)
-    vars_lp = [LpVariable(f"x{i + 1}", lowBound=0) for i in range(num_vars)]
-    prob += lpSum([obj_coeffs[i] * vars_lp[i] for i in range(num_vars)])
+def get_variable_domains(num_vars, variable_names):
+    st.markdown('<div class="section-card">', unsafe_allow_html=True)
+    st.subheader("🧱 Variable Domains")
+    st.markdown("*Integer and binary variables make this a mixed-integer program, solved by branch and bound*")
+
+    lb, ub, integer, previews = [], [], [], []
+    cols = st.columns(num_vars)
+    for i in range(num_vars):
+        with cols[i]:
+            kind = st.selectbox(f"Type of {variable_names[i]}", VARIABLE_TYPES, key=f"vartype_{i}",
+                                help="Binary variables are integers between 0 and 1, whatever their bounds")
+            low = st.number_input("Lower Bound", value=0.0, key=f"lb_{i}")
+            high = st.number_input("Upper Bound", value=None, key=f"ub_{i}", placeholder="∞")
+        if kind == "Binary":
+            low, high = 0.0, 1.0
+        lb.append(low)
+        ub.append(np.inf if high is None else high)
+        integer.append(kind != "Continuous")
+        upper = "∞" if high is None else f"{high:g}"
+        previews.append(f"{variable_names[i]} ∈ {{0, 1}}" if kind == "Binary" else
+                        f"{low:g} ≤ {variable_names[i]} ≤ {upper}" + (" (integer)" if kind == "Integer" else ""))
+
+    st.info("🧱 **Domains:** " + " • ".join(previews))
+    st.markdown('</div>', unsafe_allow_html=True)
+    return {"lb": lb, "ub": ub, "integer": integer}
+
+
+def get_problem_inputs(num_constraints, num_vars, variable_names):
+    # Coefficient edits are batched in a form: typing reruns nothing, and the page reruns once when applied
+    with st.form("problem_form", border=False):
+        obj_coeffs = get_objective_function(num_vars, variable_names)
+        constraints = get_constraints(num_constraints, num_vars, variable_names)
+        domains = get_variable_domains(num_vars, variable_names)
+        st.caption("✏️ Edits take effect when applied; the previews above show the applied values.")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.form_submit_button("✅ APPLY CHANGES", use_container_width=True)
+        with col2:
+            solve = st.form_submit_button("🚀 APPLY & SOLVE", use_container_width=True)
+    return obj_coeffs, constraints, domains, solve
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_uploaded_model(file_bytes, filename, problem_type):
+    # One bulk (chunked) read per distinct upload; reruns reuse the parsed arrays
+    return load_model(BytesIO(file_bytes), filename, sense=problem_type)
+
+
+def show_model_summary(model, filename):
+    st.markdown('<div class="section-card">', unsafe_allow_html=True)
+    st.subheader("📦 Imported Model")
+    st.markdown(f"*Loaded from* `{filename}`")
+
+    summary = model_summary(model)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("🔢 Variables", f"{summary['variables']:,}")
+    with col2:
+        st.metric("📊 Constraints", f"{summary['constraints']:,}")
+    with col3:
+        st.metric("🧩 Nonzeros", f"{summary['nonzeros']:,}")
+    with col4:
+        st.metric("🕸️ Density", f"{summary['density']:.2%}")
+
+    ranges_df = pd.DataFrame(
+        [summary["matrix_range"], summary["objective_range"], summary["rhs_range"]],
+        index=["|A| (nonzeros)", "Objective c", "Right-hand side b"],
+        columns=["Min", "Max"],
+    )
+    st.dataframe(ranges_df, use_container_width=True)
+    st.info(f"🎯 **Objective:** {model['sense']}")
+    st.info("📐 **Constraint senses:** " + " • ".join(f"{symbol} {count:,}" for symbol, count in summary["senses"].items()))
+    if summary["integers"]:
+        st.info(f"🧩 **Integer variables:** {summary['integers']:,} of {summary['variables']:,} (solved as a MIP by branch and bound)")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.cache_resource
+def get_solve_cache():
+    disk = None
+    if SOLVE_CACHE_DB:
+        disk = DiskSolveCache(SOLVE_CACHE_DB, max_bytes=int(SOLVE_CACHE_DB_MB * 1024 ** 2),
+                              max_age=SOLVE_CACHE_MAX_AGE_DAYS * 24 * 3600)
+    return SolveCache(max_bytes=int(SOLVE_CACHE_MB * 1024 ** 2), disk=disk)
+
+
+@st.cache_resource
+def get_scheduler():
+    # Shared by every session, so the host never runs more than SOLVE_WORKERS solver processes
+    return SolveScheduler(max_workers=SOLVE_WORKERS, max_queued=SOLVE_QUEUE_LIMIT, max_per_session=SESSION_SOLVE_LIMIT)
+
+
+@st.cache_resource
+def get_timings():
+    # Server-wide, like the scheduler: every session's solves teach Auto which configuration is fastest
+    return TimingHistory(TIMINGS_FILE)
+
+
+def session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+
+def get_warm_start():
+    # Each browser session keeps its own last optimal basis
+    if "warm_start" not in st.session_state:
+        st.session_state.warm_start = WarmStartSession()
+    return st.session_state.warm_start
+
+
+def get_solution_history():
+    # Per browser session, like the warm-start basis
+    if "solution_history" not in st.session_state:
+        st.session_state.solution_history = SolutionHistory(max_entries=SOLUTION_HISTORY_SIZE,
+                                                            max_bytes=int(SOLUTION_HISTORY_MB * 1024 ** 2))
+    return st.session_state.solution_history
+
+
+def submit_solve(model, key, options):
+    """Answers from the solve cache, or submits the solve to the scheduler and waits up to JOB_INLINE_WAIT_S
+    for it. Returns the result, or None while it is queued or running (or when the scheduler refused it)."""
+    # A new solve replaces the session's running one
+    pending = st.session_state.pop("solve_job", None)
+    if pending is not None:
+        pending["job"].cancel()
+
+    cache_key = problem_hash(model, options)
+    cached = get_solve_cache().get(cache_key)
+    if cached is not None:
+        return remember_solution(key, model, dict(cached, cached=True, key=cache_key))
+
+    try:
+        job = get_scheduler().submit(session_id(), cache_key, model, options, warm_start=get_warm_start())
+    except SchedulerBusy as error:
+        st.warning(f"🚦 {error}")
+        return None
+    st.session_state.solve_job = {"job": job, "key": key, "cache_key": cache_key}
+    job.wait(JOB_INLINE_WAIT_S)
+    return collect_solve_job()
+
+
+def collect_solve_job():
+    """Stores the session's finished job (solve cache, history, selection) and returns its result;
+    None while it runs or when it failed, was cancelled or timed out (reported here)."""
+    pending = st.session_state.get("solve_job")
+    if pending is None or pending["job"].poll() in PENDING:
+        return None
+    del st.session_state.solve_job
+    job = pending["job"]
+    if job.state != DONE:
+        icon = {CANCELLED: "⛔", TIMED_OUT: "⏱️"}.get(job.state, "❌")
+        (st.error if icon == "❌" else st.warning)(f"{icon} {job.error} (after {job.elapsed:.1f}s)")
+        return None
+
+    # A run stopped at a limit is not cached, so solving again retries it
+    if job.result["status"] not in INCOMPLETE_STATUSES:
+        get_solve_cache().put(pending["cache_key"], job.result)
+    if not job.deduplicated:
+        get_timings().record(job.model, job.options, job.result)
+    result = dict(job.result, cached=False, key=pending["cache_key"], queue_wait=job.wait_seconds)
+    return remember_solution(pending["key"], job.model, result)
+
+
+def remember_solution(key, model, result):
+    get_solution_history().add(key, model, result)
+    st.session_state.selected_solution = key
+    return result
+
+
+@st.fragment(run_every=JOB_POLL_S)
+def show_solve_progress():
+    # Polls the session's solve without rerunning the page; when it finishes, the full run collects and shows it
+    pending = st.session_state.get("solve_job")
+    if pending is None:
+        return
+    job = pending["job"]
+    if job.poll() not in PENDING:
+        st.rerun(scope="app")
+
+    progress = job.progress()
+    st.markdown('<div class="section-card">', unsafe_allow_html=True)
+    if job.state == QUEUED:
+        stats = get_scheduler().stats()
+        st.subheader("🕒 Waiting for a Solver")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Queue Position", job.position or "—")
+        col2.metric("Waiting", f"{progress['queued']:.1f} s")
+        col3.metric("Solver Slots Busy", f"{stats['slots_busy']} of {stats['workers']}")
+    elif "racers" in progress:
+        st.subheader(f"🏁 Racing {len(progress['racers'])} Solver Configurations")
+        st.metric("Elapsed", f"{progress['elapsed']:.1f} s")
+        st.dataframe(pd.DataFrame({
+            "Configuration": [racer["config"] for racer in progress["racers"]],
+            "State": [racer["state"] for racer in progress["racers"]],
+            "Iterations": [racer.get("iterations") for racer in progress["racers"]],
+            "Objective": [racer.get("incumbent", racer.get("objective")) for racer in progress["racers"]],
+            "Best Bound": [racer.get("bound") for racer in progress["racers"]],
+        }), use_container_width=True, hide_index=True)
+    elif is_mip(job.model):
+        st.subheader(f"⏳ Branch and Bound with {solver_label(job.options)}")
+        gap = mip_gap(progress.get("incumbent"), progress.get("bound"))
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Elapsed", f"{progress['elapsed']:.1f} s")
+        col2.metric("Incumbent", f"{progress['incumbent']:.6g}" if "incumbent" in progress else "—",
+                    help="Objective of the best integer solution found so far")
+        col3.metric("Best Bound", f"{progress['bound']:.6g}" if "bound" in progress else "—",
+                    help="No integer solution can do better than this")
+        col4.metric("Gap", f"{gap:.2%}" if gap is not None else "—")
+        col5.metric("Nodes", f"{progress['nodes']:,}" if "nodes" in progress else "—")
+    else:
+        st.subheader(f"⏳ Solving with {solver_label(job.options)}")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Elapsed", f"{progress['elapsed']:.1f} s")
+        col2.metric("Iterations", f"{progress['iterations']:,}" if "iterations" in progress else "—")
+        col3.metric("Objective", f"{progress['objective']:.6g}" if "objective" in progress else "—")
+        col4.metric("Best Bound", f"{progress['bound']:.6g}" if "bound" in progress else "—",
+                    help="A bound on the optimal objective, when the solver reports one")
+        if job.time_limit:
+            st.progress(min(progress["elapsed"] / job.time_limit, 1.0), text=f"Time limit: {job.time_limit:g}s")
+        notes = [f"queued for {progress['queued']:.1f}s" if progress["queued"] >= 0.1 else None,
+                 "sharing an identical solve another request started" if job.deduplicated else None]
+        if any(notes):
+            st.caption("🔗 " + " • ".join(note for note in notes if note))
+    if st.button("⛔ Cancel Solve", key="cancel_solve", help="Stops the solver process unless another session shares it"):
+        job.cancel()
+        st.rerun(scope="app")
+    st.markdown('</div>', unsafe_allow_html=True)
+
 
-    for name, coeffs, ineq, rhs in constraints:
-        expr = lpSum([coeffs[i] * vars_lp[i] for i in range(num_vars)])
-        if ineq == "<=":
-            prob += expr <= rhs, name
-        elif ineq == "=":
-            prob += expr == rhs, name
+def show_cache_stats(result):
+    stats = get_solve_cache().stats()
+    source = "⚡ Served from cache" if result["cached"] else f"🧮 Solved by {result['solver']} in {result['solve_time']:.3f}s"
+    if result.get("iterations") is not None:
+        source += f" ({result['iterations']} pivots)"
+    if result.get("warm_start") and not result["cached"]:
+        source += " • ♻️ warm start"
+        if result.get("cold_iterations_reference") is not None:
+            source += f" (the cold solve it started from, of an earlier model, took {result['cold_iterations_reference']})"
+    caption = (f"{source} • cache: {stats['hits']} hits / {stats['misses']} misses "
+               f"({stats['hit_rate']:.0%}), {stats['entries']} entries, "
+               f"{stats['bytes'] / 1024 ** 2:.1f} of {stats['max_bytes'] / 1024 ** 2:.0f} MB")
+    if "disk" in stats:
+        disk = stats["disk"]
+        caption += (f" • disk: {disk['hits']} hits, {disk['entries']} entries, "
+                    f"{disk['bytes'] / 1024 ** 2:.1f} of {disk['max_bytes'] / 1024 ** 2:.0f} MB")
+    st.caption(caption)
+
+
+@st.fragment
+def run_batch_scenarios(model, solver):
+    st.markdown("*Solve many variants of this model at once: each row of the table overrides "
+                "objective coefficients (`c:<variable>`) and/or right-hand sides (`rhs:<constraint>`)*")
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        scenario_file = st.file_uploader("📂 Scenario Table", type=["csv", "parquet"], key="scenario_file")
+    with col2:
+        max_workers = st.number_input("⚙️ Worker Processes", min_value=1, max_value=SOLVE_WORKERS,
+                                      value=SOLVE_WORKERS, key="batch_workers",
+                                      help="At most this many; fewer while other solves hold the server's slots")
+    run = st.button("🚀 SOLVE ALL SCENARIOS", disabled=scenario_file is None)
+
+    if run and scenario_file is not None:
+        if scenario_file.name.lower().endswith(".parquet"):
+            table = pd.read_parquet(BytesIO(scenario_file.getvalue()))
+        else:
+            table = pd.read_csv(BytesIO(scenario_file.getvalue()))
+
+        progress = st.progress(0.0, text="Waiting for free solver slots...")
+        table_slot = st.empty()
+        records, start = {}, datetime.now()
+        try:
+            with get_scheduler().lease(int(max_workers), timeout=BATCH_SLOT_WAIT_S) as workers:
+                progress.progress(0.0, text=f"Starting {workers} worker processes...")
+                for index, name, result in solve_scenarios(model, table, solver, max_workers=workers):
+                    records[index] = scenario_record(name, result, model["var_names"])
+                    progress.progress(len(records) / len(table),
+                                      text=f"Solved {len(records):,} of {len(table):,} scenarios")
+                    if len(records) % max(1, len(table) // 20) == 0:
+                        table_slot.dataframe(pd.DataFrame([records[k] for k in sorted(records)]),
+                                             use_container_width=True)
+        except SchedulerBusy as e:
+            progress.empty()
+            st.warning(f"🚦 {e}")
+        except ValueError as e:
+            st.error(f"❌ {e}")
         else:
-            prob += expr >= rhs, name
+            results_df = pd.DataFrame([records[k] for k in sorted(records)])
+            table_slot.dataframe(results_df, use_container_width=True)
+            elapsed = (datetime.now() - start).total_seconds()
+            solve_total = results_df["Solve Time (s)"].sum() if len(results_df) else 0.0
+            st.success(f"✅ {len(results_df):,} scenarios in {elapsed:.2f}s wall time "
+                       f"({solve_total:.2f}s of solver time across {results_df['Worker'].nunique() if len(results_df) else 0} workers)")
+            st.download_button(
+                label="📥 Download Scenario Results",
+                data=results_df.to_csv(index=False),
+                file_name=f"lp_scenarios_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+                on_click="ignore"
+            )
+
+
+def plot_parametric(sweep):
+    label = f"{'RHS' if sweep['kind'] == 'rhs' else 'Coefficient'} of {sweep['name']}"
+    # Breakpoints closer together than the plot resolution are thinned out of the drawn curve
+    values, objective, slopes = sweep["values"], sweep["objective"], np.r_[sweep["slopes"], np.nan]
+    if len(values) > 2:
+        window = ((values[0], values[-1]), (objective.min(), max(objective.max(), objective.min() + 1e-9)))
+        thinned_x, _ = thin_path(values, objective, window, PLOT_RESOLUTION)
+        kept = np.isin(values, thinned_x)
+        values, objective, slopes = values[kept], objective[kept], slopes[kept]
+    fig = go.Figure()
+    fig.add_trace(scatter_trace(
+        values,
+        objective,
+        mode='lines+markers',
+        name="Optimal Objective",
+        line=dict(color='#45B7D1', width=3),
+        marker=dict(size=8),
+        customdata=slopes,
+        hovertemplate=f"{label}: %{{x:.4g}}<br>Objective: %{{y:.4g}}<br>Slope to the right: %{{customdata:.4g}}<extra></extra>"
+    ))
+    fig.add_vline(x=sweep["start"], line=dict(color='red', dash='dash'),
+                  annotation_text="Current value", annotation_position="top")
+
+    fig.update_layout(
+        xaxis_title=label,
+        yaxis_title="Optimal Objective",
+        template="plotly_white",
+        title="Optimal Objective vs. Parameter (exact breakpoints)",
+        height=500
+    )
+    return fig
+
+
+@st.fragment
+def run_parametric_analysis(model):
+    st.markdown("*Trace the optimal objective while one right-hand side or objective coefficient varies. "
+                "The curve is piecewise linear; its exact breakpoints come from following the optimal "
+                "basis with the NumPy simplex, one pivot per breakpoint*")
+
+    num_rows, num_cols = model_shape(model)
+    if num_rows * num_cols > MAX_SENSITIVITY_CELLS:
+        st.info(f"📏 Parametric analysis is limited to models with at most {MAX_SENSITIVITY_CELLS:,} rows × columns.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        kind = st.radio("🎚️ Parameter", list(PARAMETERS), format_func=PARAMETERS.get, key="sweep_kind", horizontal=True)
+    with col2:
+        names = model["con_names"] if kind == "rhs" else model["var_names"]
+        name = st.selectbox("📌 Constraint" if kind == "rhs" else "📌 Variable", list(names), key="sweep_name")
+
+    current = parameter_value(model, kind, name)
+    span = max(abs(current), 1.0)
+    col1, col2 = st.columns(2)
+    with col1:
+        low = st.number_input("⬇️ From", value=current - span, key=f"sweep_low_{kind}_{name}")
+    with col2:
+        high = st.number_input("⬆️ To", value=current + span, key=f"sweep_high_{kind}_{name}")
+    run = st.button("📈 RUN PARAMETRIC SWEEP")
+
+    if run:
+        try:
+            sweep = parametric_sweep(model, kind, name, low, high)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        if sweep["status"] != "Optimal":
+            st.error(f"❌ No optimal solution at the start value {sweep['start']:.4g}: {sweep['status']}")
+            return
+
+        st.success(f"✅ {len(sweep['values']):,} breakpoints from {sweep['pivots']:,} pivots "
+                   f"in {sweep['solve_time']:.3f}s")
+        for side, status, end in (("below", sweep["status_below"], sweep["values"][0]),
+                                  ("above", sweep["status_above"], sweep["values"][-1])):
+            if status != "Optimal":
+                st.warning(f"⚠️ The problem is {status.lower()} {side} {end:.4g}")
+        st.plotly_chart(plot_parametric(sweep), use_container_width=True)
+
+        table = pd.DataFrame(sweep_table(model, sweep))
+        st.dataframe(table, use_container_width=True, hide_index=True)
+        st.download_button(
+            label="📥 Download Parametric CSV",
+            data=table.to_csv(index=False),
+            file_name=f"lp_parametric_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
+
+
+def plot_objective_distribution(analysis, base_objective):
+    fig = go.Figure()
+    fig.add_trace(go.Histogram(
+        x=analysis["objective"][~np.isnan(analysis["objective"])],
+        nbinsx=50,
+        marker=dict(color='#45B7D1'),
+        name="Optimal Objective"
+    ))
+    if base_objective is not None:
+        fig.add_vline(x=base_objective, line=dict(color='red', dash='dash'),
+                      annotation_text="Base model", annotation_position="top")
+    fig.update_layout(
+        xaxis_title="Optimal Objective",
+        yaxis_title="Samples",
+        template="plotly_white",
+        title="Distribution of the Optimal Objective",
+        height=450
+    )
+    return fig
+
+
+@st.fragment
+def run_robustness_analysis(model, solver):
+    st.markdown("*Sample the objective coefficients and right-hand sides from distributions around their "
+                "current values and solve every sample: the base basis answers the samples it stays optimal "
+                "for in a few matrix products, and the rest are re-solved from it across worker processes*")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        num_samples = st.number_input("🎲 Samples", min_value=10, max_value=1_000_000, value=ROBUSTNESS_SAMPLES,
+                                      step=100, key="robustness_samples")
+    with col2:
+        seed = st.number_input("🌱 Random Seed", min_value=0, value=0, key="robustness_seed")
+    with col3:
+        max_workers = st.number_input("⚙️ Worker Processes", min_value=1, max_value=SOLVE_WORKERS,
+                                      value=SOLVE_WORKERS, key="robustness_workers",
+                                      help="At most this many; fewer while other solves hold the server's slots")
+
+    # Spread is the relative standard deviation (normal), half-width (uniform, triangular) or log-scale deviation
+    targets = perturbation_targets(model)
+    defaults = pd.DataFrame({"Parameter": targets, "Distribution": DISTRIBUTIONS[0],
+                             "Spread %": 100 * ROBUSTNESS_SPREAD})
+    parameters = st.data_editor(
+        defaults,
+        column_config={
+            "Parameter": st.column_config.TextColumn(disabled=True),
+            "Distribution": st.column_config.SelectboxColumn(options=list(DISTRIBUTIONS), required=True),
+            "Spread %": st.column_config.NumberColumn(min_value=0.0, step=1.0, format="%.2f"),
+        },
+        hide_index=True,
+        use_container_width=True,
+        key=f"robustness_parameters_{hash(tuple(targets))}"
+    )
+    run = st.button("🎲 RUN ROBUSTNESS ANALYSIS")
+
+    if run:
+        perturbations = {row["Parameter"]: (row["Distribution"], row["Spread %"] / 100)
+                         for row in parameters.to_dict("records") if row["Spread %"] and row["Spread %"] > 0}
+        if not perturbations:
+            st.warning("⚠️ Give at least one parameter a spread above zero.")
+            return
+        progress = st.progress(0.0, text="Waiting for free solver slots...")
+        try:
+            with get_scheduler().lease(int(max_workers), timeout=BATCH_SLOT_WAIT_S) as workers:
+                progress.progress(0.0, text="Checking samples against the base basis...")
+                analysis = robustness_analysis(
+                    model, perturbations, int(num_samples), solver, max_workers=workers, seed=int(seed),
+                    progress=lambda done, total: progress.progress(done / total,
+                                                                   text=f"Solved {done:,} of {total:,} samples"))
+        except SchedulerBusy as e:
+            progress.empty()
+            st.warning(f"🚦 {e}")
+            return
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        progress.empty()
+        if not analysis["optimal"]:
+            st.error("❌ None of the samples has an optimal solution.")
+            return
+
+        summary = objective_summary(analysis)
+        st.success(f"✅ {analysis['samples']:,} samples in {analysis['seconds']:.2f}s: "
+                   f"{analysis['basis_reused']:,} answered by the base basis, {analysis['resolved']:,} re-solved")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("✅ Optimal", f"{analysis['optimal'] / analysis['samples']:.1%}")
+        with col2:
+            st.metric("📊 Mean Objective", f"{summary['Mean']:.4g}")
+        with col3:
+            st.metric("📏 Std Deviation", f"{summary['Std']:.4g}")
+        with col4:
+            st.metric("🎯 P5 – P95", f"{summary['P5']:.4g} – {summary['P95']:.4g}")
+        st.plotly_chart(plot_objective_distribution(analysis, analysis["base_objective"]), use_container_width=True)
+
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            st.markdown("**Decision Variables**")
+            st.dataframe(pd.DataFrame(variable_table(model, analysis)), use_container_width=True, hide_index=True)
+        with col2:
+            st.markdown("**Binding Frequency**")
+            st.dataframe(pd.DataFrame(binding_table(model, analysis)).sort_values("Binding %", ascending=False),
+                         use_container_width=True, hide_index=True)
+
+        samples = pd.DataFrame(analysis["parameters"], columns=analysis["labels"])
+        samples.insert(0, "Status", analysis["status"])
+        samples.insert(1, "Objective", analysis["objective"])
+        samples = pd.concat([samples, pd.DataFrame(analysis["x"], columns=list(model["var_names"]))], axis=1)
+        st.download_button(
+            label="📥 Download Samples CSV",
+            data=samples.to_csv(index=False),
+            file_name=f"lp_robustness_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
 
-    prob.solve()
-    return prob, vars_lp
 
+def solution_frame(result, variable_names):
+    # The export row plus the results table: one wide row for a few variables, one row per variable otherwise
+    solution_data = engine.solution_values(result, variable_names)
+    if len(variable_names) <= MAX_METRIC_VARS:
+        return solution_data, pd.DataFrame([solution_data])
+    return solution_data, pd.DataFrame({"Variable": list(solution_data), "Value": list(solution_data.values())})
 
-def show_solution(prob, vars_lp, variable_names):
+
+def show_solution(model, result):
     # Status with color coding
-    status = LpStatus[prob.status]
+    status = result["status"]
     if status == "Optimal":
         st.success(f"✅ Problem Solved Successfully: {status}")
+    elif status == FEASIBLE:
+        st.warning(f"⚠️ Stopped at a limit with a feasible integer solution, within {result['gap']:.2%} of the best bound"
+                   if result.get("gap") is not None else "⚠️ Stopped at a limit with a feasible integer solution")
     else:
         st.error(f"❌ Solution Status: {status}")
+    variable_names = model["var_names"]
+    solution_data, results_df = solution_frame(result, variable_names)
+    # Infeasible and unbounded models have no values to show; their diagnosis explains why
+    if status in NO_SOLUTION_STATUSES:
+        if "conflict" in result:
+            show_conflict(model, result["conflict"])
+        elif "ray" in result:
+            show_ray(model, result["ray"])
+        return solution_data
 
     st.markdown('<div class="section-card">', unsafe_allow_html=True)
     st.subheader("🎉 Optimization Results")
 
     # Create metrics for each variable
-    cols = st.columns(len(vars_lp) + 1)
-    solution_data = {}
-
-    for i, var in enumerate(vars_lp):
-        with cols[i]:
-            value_rounded = round(var.varValue, 3)
-            st.metric(
-                label=f"🎯 {variable_names[i]}",
-                value=f"{value_rounded}",
-                help=f"Optimal value for {variable_names[i]}"
-            )
-            solution_data[variable_names[i]] = var.varValue
+    x = result["x"].tolist()
+    show_metrics = len(x) <= MAX_METRIC_VARS
+    cols = st.columns(len(x) + 1 if show_metrics else 1)
+
+    for i, var_value in enumerate(x):
+        if show_metrics:
+            with cols[i]:
+                st.metric(
+                    label=f"🎯 {variable_names[i]}",
+                    value="—" if np.isnan(var_value) else f"{round(var_value, 3)}",
+                    help=f"Optimal value for {variable_names[i]}"
+                )
 
     # Objective value
     with cols[-1]:
-        obj_value = round(value(prob.objective), 3)
+        objective = result["objective"]
         st.metric(
             label="🏆 Objective Value",
-            value=f"{obj_value}",
+            value="—" if objective is None or np.isnan(objective) else f"{round(objective, 3)}",
             help="The optimized result of your objective function"
         )
-        solution_data['Objective Value'] = value(prob.objective)
+
+    if result.get("bound") is not None:
+        gap = "—" if result.get("gap") is None else f"{result['gap']:.2%}"
+        st.caption(f"🧩 Branch and bound: best bound {result['bound']:.6g} • gap {gap} • "
+                   f"{result.get('nodes') or 0:,} nodes explored")
 
     # Detailed table
     st.markdown("### 📊 Detailed Results")
-    results_df = pd.DataFrame([solution_data])
     st.dataframe(results_df, use_container_width=True)
 
     st.markdown('</div>', unsafe_allow_html=True)
     return solution_data
 
 
-def show_constraints(prob):
+def show_conflict(model, conflict):
+    st.markdown('<div class="section-card">', unsafe_allow_html=True)
+    st.subheader("🔎 Why It Is Infeasible")
+    if conflict["bounds"]:
+        st.markdown(f"The bounds of **{', '.join(conflict['bounds'])}** leave no values to choose from.")
+    if conflict["rows"]:
+        st.markdown(f"These **{len(conflict['rows'])}** constraints cannot all hold at once within the variable bounds. "
+                    + ("Dropping or relaxing any one of them makes the rest feasible." if conflict["minimal"] else ""))
+        st.dataframe(pd.DataFrame({"Constraint": conflict["names"],
+                                   "Formulation": [format_constraint(model, j) for j in conflict["rows"]]}),
+                     use_container_width=True, hide_index=True)
+    notes = [f"{conflict['checks']} feasibility checks in {conflict['seconds']:.2f}s"]
+    if conflict["relaxation"]:
+        notes.append("they conflict even without the integer requirements")
+    if not conflict["minimal"]:
+        notes.append("the time limit cut the search short, so the set may not be minimal")
+    st.caption("🔎 " + " • ".join(notes))
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def show_ray(model, ray):
+    st.markdown('<div class="section-card">', unsafe_allow_html=True)
+    st.subheader("🔎 Why It Is Unbounded")
+    direction = np.asarray(ray["direction"])
+    moving = np.flatnonzero(np.abs(direction) > 1e-9)
+    st.markdown(f"From any feasible point, moving along this direction keeps every constraint satisfied and changes "
+                f"the objective by **{ray['rate']:+.6g}** per step, without limit.")
+    st.dataframe(pd.DataFrame({"Variable": [model["var_names"][j] for j in moving], "Direction": direction[moving]}),
+                 use_container_width=True, hide_index=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def solution_key(model):
+    # Solutions are shown again only for the exact problem (including names) they were computed for
+    return problem_hash(model, {"names": [list(model["var_names"]), list(model["con_names"])]})
+
+
+def show_results(model, result, timer):
+    with timer.phase("show_solution"):
+        solution_data = show_solution(model, result)
+        show_cache_stats(result)
+        if result.get("presolve"):
+            show_presolve_report(model, result)
+        if result.get("race"):
+            show_race(result["race"])
+    if has_sensitivity(result):
+        with timer.phase("sensitivity"):
+            show_sensitivity(model, result)
+    with timer.phase("formulation"):
+        show_constraints(model)
+        if result["status"] not in NO_SOLUTION_STATUSES:
+            show_breakeven_and_eos(model["c"].tolist(), result["x"])
+    with timer.phase("export"):
+        export_solution_to_csv(solution_data, model, result)
+
+
+def show_race(standings):
+    outcomes = []
+    for racer in standings:
+        if racer["winner"]:
+            outcomes.append(f"**{racer['config']}** won in {racer['seconds']:.3f}s ({racer['status']})")
+        elif racer["state"] == DONE:
+            outcomes.append(f"{racer['config']} finished in {racer['seconds']:.3f}s ({racer['status']})")
+        else:
+            outcomes.append(f"{racer['config']} {racer['state'].replace('_', ' ')} after {racer['seconds']:.3f}s")
+    st.caption("🏁 Race: " + " • ".join(outcomes))
+
+
+@st.fragment
+def show_presolve_report(model, result):
+    report = result["presolve"]
+    removed_rows, removed_columns = sum(report["removed_rows"].values()), sum(report["removed_columns"].values())
+    with st.expander(f"🧹 Presolve: {removed_rows:,} rows and {removed_columns:,} columns removed", expanded=False):
+        if report["status"] is not None:
+            st.info(f"🧹 Presolve alone decided this problem: {report['status']}"
+                    + (f" ({report['reason']})" if report["reason"] else ""))
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Rows", f"{report['rows_after']:,}", delta=f"{report['rows_after'] - report['rows']:,}",
+                    delta_color="off", help=f"{report['rows']:,} in the original model")
+        col2.metric("Columns", f"{report['columns_after']:,}", delta=f"{report['columns_after'] - report['columns']:,}",
+                    delta_color="off", help=f"{report['columns']:,} in the original model")
+        col3.metric("Bounds Tightened", f"{report['bounds_tightened']:,}")
+        col4.metric("Coefficient Spread", "-" if report["spread_after"] is None else f"{report['spread_after']:.3g}",
+                    help=f"Largest over smallest |coefficient|: {report['spread_before']:.3g} before scaling")
+        st.dataframe(pd.DataFrame({
+            "Reduction": [f"{name} rows" for name in report["removed_rows"]]
+                         + [f"{name} columns" for name in report["removed_columns"]],
+            "Removed": [*report["removed_rows"].values(), *report["removed_columns"].values()],
+        }), use_container_width=True, hide_index=True)
+        st.caption(f"⏱️ Presolve {report['presolve_time'] * 1000:.1f} ms • postsolve "
+                   f"{report.get('postsolve_time', 0.0) * 1000:.1f} ms • solver {result['solve_time']:.3f}s "
+                   f"on the reduced model • {report['passes']} passes")
+
+        # Timing the same settings on the original model, through the solve cache
+        if st.button("⚖️ Compare Without Presolve", key=f"presolve_compare_{result.get('key')}"):
+            with st.spinner("Solving the original model..."):
+                plain = solve_model(model, report["options"], cache=get_solve_cache())
+            total = report["presolve_time"] + report.get("postsolve_time", 0.0) + result["solve_time"]
+            st.caption(f"⚖️ Without presolve: {plain['solve_time']:.3f}s{' (cached)' if plain.get('cached') else ''}, "
+                       f"status {plain['status']} • with presolve: {total:.3f}s including presolve and postsolve "
+                       f"({plain['solve_time'] / total if total else float('inf'):.2f}x)")
+
+
+def show_solution_diff(entry_a, entry_b):
+    summary, variables, constraints = diff_solutions(entry_a, entry_b)
+    st.markdown('<div class="section-card">', unsafe_allow_html=True)
+    st.subheader("🔀 Solution Comparison")
+    st.markdown("*Matched by name; only variables and constraint activities that differ are listed*")
+    st.dataframe(pd.DataFrame(summary), use_container_width=True, hide_index=True)
+    for title, rows, what in (("### 🎯 Variables", variables, "variable values"),
+                              ("### 📐 Constraint Activities", constraints, "constraint activities")):
+        st.markdown(title)
+        if rows:
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        else:
+            st.caption(f"✅ Same {what} in both solutions")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+def show_solution_panel(current_key, timer):
+    # Switching or comparing stored solutions reruns only this panel; nothing is solved again
+    history = get_solution_history()
+    entries = {entry["key"]: entry for entry in history.entries()}
+    if st.session_state.get("selected_solution") not in entries:
+        st.session_state.selected_solution = next(iter(entries))
+    if st.session_state.get("compare_solution") not in entries:
+        st.session_state.compare_solution = None
+
+    col1, col2 = st.columns(2)
+    with col1:
+        key = st.selectbox("🗂️ Showing Solution", list(entries), format_func=lambda k: describe(entries[k]),
+                           key="selected_solution", help=f"The last {SOLUTION_HISTORY_SIZE} solves of this session")
+    with col2:
+        other = st.selectbox("🔀 Compare With", [None, *entries], key="compare_solution",
+                             format_func=lambda k: "—" if k is None else describe(entries[k]))
+
+    entry = entries[key]
+    if key != current_key:
+        st.warning(f"📌 Showing solution #{entry['number']}, solved for different inputs than the current ones. "
+                   "Press **SOLVE** to solve the current problem.")
+    if other is not None and other != key:
+        show_solution_diff(entry, entries[other])
+
+    model, result = entry["model"], entry["result"]
+    show_results(model, result, timer)
+    if len(model["c"]) in (2, 3):
+        with timer.phase("plot") as details:
+            details.update((plot_2d if len(model["c"]) == 2 else plot_3d)(model, result["x"]))
+
+
+def sensitivity_frame(model, result):
+    variables, constraints = sensitivity_tables(model, result)
+    return pd.DataFrame(variables), pd.DataFrame(constraints)
+
+
+def show_sensitivity(model, result):
+    st.markdown('<div class="section-card">', unsafe_allow_html=True)
+    st.subheader("🧭 Sensitivity Analysis")
+    st.markdown("*Read from the optimal basis: what-if questions inside these ranges need no re-solve*")
+
+    variables_df, constraints_df = sensitivity_frame(model, result)
+    st.markdown("### 📐 Constraints")
+    st.dataframe(constraints_df, use_container_width=True, hide_index=True)
+    st.markdown("### 🎯 Decision Variables")
+    st.dataframe(variables_df, use_container_width=True, hide_index=True)
+
+    priced = constraints_df[constraints_df["Shadow Price"] != 0]
+    if len(priced):
+        first = priced.loc[priced["Shadow Price"].abs().idxmax()]
+        st.info(f"💡 **Insight:** Each extra unit of *{first['Constraint']}* changes the objective by "
+                f"**{first['Shadow Price']:.4g}**, as long as its right-hand side stays between "
+                f"{first['RHS Lower']:.4g} and {first['RHS Upper']:.4g}. Objective coefficients inside "
+                f"[Coeff. Lower, Coeff. Upper] keep the current solution optimal.")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def show_constraints(model):
     st.markdown('<div class="section-card">', unsafe_allow_html=True)
     st.subheader("📜 Problem Formulation")
     st.markdown("*Here's how your problem was interpreted:*")
 
-    for name, c in prob.constraints.items():
-        st.code(f"{name}: {c}", language="text")
+    num_constraints = len(model["con_names"])
+    for j in range(min(num_constraints, MAX_LISTED_CONSTRAINTS)):
+        st.code(f"{model['con_names'][j]}: {format_constraint(model, j)}", language="text")
+    if num_constraints > MAX_LISTED_CONSTRAINTS:
+        st.markdown(f"*… and {num_constraints - MAX_LISTED_CONSTRAINTS:,} more constraints*")
 
     st.markdown('</div>', unsafe_allow_html=True)
 
 
-def plot_2d(constraints, vars_lp):
-    st.markdown('<div class="section-card">', unsafe_allow_html=True)
-    st.subheader("📊 2D Feasible Region Visualization")
-    st.markdown("*Visual representation of constraints and optimal solution*")
+def scatter_trace(x, y, **kwargs):
+    # SVG for small traces; large ones switch to WebGL, which stays interactive with many points
+    trace = go.Scattergl if len(x) > WEBGL_MIN_POINTS else go.Scatter
+    return trace(x=x, y=y, **kwargs)
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(max_bytes=int(FIGURE_CACHE_MB * 1024 ** 2))
+
+
+def cached_figure(kind, build, model, x):
+    """Returns ((figure, notes), payload bytes, cached) for ``build(model, x)``, reusing the
+    figure across reruns of the same problem, names and solution."""
+    key = problem_hash(model, {"figure": kind, "x": np.asarray(x, dtype=np.float64).tolist(),
+                               "names": [model["var_names"], model["con_names"]]})
+    cache = get_figure_cache()
+    entry = cache.get(key)
+    if entry is not None:
+        return entry[0], entry[1], True
+    figure, notes = build(model, x)
+    entry = cache.put(key, (figure, notes), len(pio.to_json(figure, validate=False)))
+    return entry[0], entry[1], False
+
 
-    x_vals = np.linspace(0, 20, 400)
+def show_figure(kind, build, model, x):
+    (figure, notes), nbytes, cached = cached_figure(kind, build, model, x)
+    st.plotly_chart(figure, use_container_width=True)
+    for note in notes:
+        st.caption(note)
+    st.caption(f"🖼️ Figure payload {nbytes / 1024:,.0f} KB of the {FIGURE_BUDGET_KB:,.0f} KB budget • "
+               + ("⚡ reused from the figure cache" if cached else "built for this solution"))
+    if nbytes > FIGURE_BUDGET_KB * 1024:
+        st.warning("⚠️ This figure is over the payload budget and may render slowly in the browser.")
+    return {"figure": kind, "payload_kb": round(nbytes / 1024, 1), "figure_cached": cached}
+
+
+def figure_2d(model, x):
+    region = feasible_polygon(model)
+    window = plot_window(region, [x[:2]])
+    (x0, x1), (y0, y1) = window
     fig = go.Figure()
+    notes = []
 
     # Color palette for constraints
     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
 
-    for i, (name, (coeffs, ineq, rhs)) in enumerate([(n, (c, i, r)) for n, c, i, r in constraints]):
-        if coeffs[1] != 0:
-            y_vals = (rhs - coeffs[0] * x_vals) / coeffs[1]
-            fig.add_trace(go.Scatter(
-                x=x_vals,
-                y=y_vals,
-                name=name,
-                line=dict(color=colors[i % len(colors)], width=3)
-            ))
+    # Exact feasible region: filled polygon, or the segment / point left by equality constraints
+    vertices = region["vertices"]
+    if region["dimension"] == POLYGON:
+        ring_x, ring_y = thin_path(np.r_[vertices[:, 0], vertices[:1, 0]], np.r_[vertices[:, 1], vertices[:1, 1]],
+                                   window, PLOT_RESOLUTION)
+        fig.add_trace(scatter_trace(
+            ring_x,
+            ring_y,
+            fill='toself',
+            fillcolor='rgba(69, 183, 209, 0.25)',
+            line=dict(color='rgba(69, 183, 209, 0.9)', width=1),
+            name="Feasible Region" if region["bounded"] else "Feasible Region (unbounded)",
+            hoverinfo='skip'
+        ))
+    elif region["dimension"] != EMPTY:
+        fig.add_trace(go.Scatter(
+            x=vertices[:, 0],
+            y=vertices[:, 1],
+            mode='lines+markers',
+            line=dict(color='rgba(69, 183, 209, 0.9)', width=6),
+            name="Feasible Region"
+        ))
+    else:
+        notes.append("The feasible region has no area to draw.")
+
+    # Constraint boundaries clipped to the visible window (x2-free constraints come out vertical);
+    # the first few get their own legend entry, the rest share one trace
+    A = dense_matrix(model)
+    rows, segments = clip_lines(A, model["rhs"], window)
+    named = rows < MAX_PLOTTED_CONSTRAINTS
+    if (~named).sum() > MAX_BACKGROUND_LINES:
+        # Keep the background lines nearest the optimum; far-off ones only add payload
+        distance = np.abs(A[rows] @ x[:2] - model["rhs"][rows]) / np.linalg.norm(A[rows], axis=1)
+        distance[named] = -1.0
+        keep = np.sort(np.argsort(distance, kind="stable")[:int(named.sum()) + MAX_BACKGROUND_LINES])
+        rows, segments, named = rows[keep], segments[keep], named[keep]
+    for k, (i, segment) in enumerate(zip(rows[named].tolist(), segments[named])):
+        fig.add_trace(go.Scatter(
+            x=segment[:, 0],
+            y=segment[:, 1],
+            mode='lines',
+            name=f"{model['con_names'][i]} ({SENSE_SYMBOLS[int(model['senses'][i])]})",
+            line=dict(color=colors[i % len(colors)], width=3)
+        ))
+    if (~named).any():
+        # Single precision is plenty at screen resolution and halves the payload
+        others = np.concatenate([segments[~named], np.full((int((~named).sum()), 1, 2), np.nan)], axis=1)
+        others = others.reshape(-1, 2).astype(np.float32)
+        fig.add_trace(scatter_trace(
+            others[:, 0],
+            others[:, 1],
+            mode='lines',
+            name=f"Other constraints ({int((~named).sum()):,})",
+            line=dict(color='rgba(120, 120, 120, 0.5)', width=1),
+            hoverinfo='skip'
+        ))
+    hidden = len(model["con_names"]) - len(rows)
+    if hidden:
+        notes.append(f"{hidden:,} constraint lines lie outside the visible window or far from the optimum "
+                     "and are not drawn; the shaded region accounts for all of them.")
 
     # Optimal point
-    x_opt, y_opt = vars_lp[0].varValue, vars_lp[1].varValue
+    x_opt, y_opt = x[0], x[1]
     fig.add_trace(go.Scatter(
         x=[x_opt],
         y=[y_opt],
@@ -797,25 +1779,72 @@ def plot_2d(constraints, vars_lp):
     ))
 
     fig.update_layout(
-        xaxis_title="x₁",
-        yaxis_title="x₂",
+        xaxis_title=model["var_names"][0],
+        yaxis_title=model["var_names"][1],
+        xaxis=dict(range=[x0, x1]),
+        yaxis=dict(range=[y0, y1]),
         template="plotly_white",
         title="Feasible Region and Optimal Solution",
         showlegend=True,
         height=600
     )
-    st.plotly_chart(fig, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+    return fig, notes
 
 
-def plot_3d(vars_lp):
+@st.fragment
+def plot_2d(model, x):
     st.markdown('<div class="section-card">', unsafe_allow_html=True)
-    st.subheader("📈 3D Solution Visualization")
-    st.markdown("*Three-dimensional representation of your optimal solution*")
+    st.subheader("📊 2D Feasible Region Visualization")
+    st.markdown("*Visual representation of constraints and optimal solution*")
+    details = show_figure("2d", figure_2d, model, x)
+    st.markdown('</div>', unsafe_allow_html=True)
+    return details
+
 
-    x, y, z = vars_lp[0].varValue, vars_lp[1].varValue, vars_lp[2].varValue
+def figure_3d(model, x_opt):
+    region = feasible_polytope(model, x_opt, max_vertices=MAX_MESH_VERTICES)
+    vertices, triangles, triangle_faces, edges = polytope_mesh(region)
+    (x0, x1), (y0, y1), (z0, z1) = region["window"]
+    x, y, z = x_opt[0], x_opt[1], x_opt[2]
     fig = go.Figure()
 
+    # Faces coloured by role: optimal face, binding constraints, cut-off box, the rest
+    face_colors = []
+    for (tag, _), optimal in zip(region["faces"], region["optimal"]):
+        if optimal:
+            face_colors.append('#FFD700')
+        elif tag in region["binding"]:
+            face_colors.append('#FF6B6B')
+        elif tag == BOX:
+            face_colors.append('#DDDDDD')
+        else:
+            face_colors.append('#45B7D1')
+    if len(triangles):
+        fig.add_trace(go.Mesh3d(
+            x=vertices[:, 0],
+            y=vertices[:, 1],
+            z=vertices[:, 2],
+            i=triangles[:, 0],
+            j=triangles[:, 1],
+            k=triangles[:, 2],
+            facecolor=np.array(face_colors)[triangle_faces],
+            opacity=0.45,
+            flatshading=True,
+            hoverinfo='skip',
+            name="Feasible Region"
+        ))
+        segments = np.full((len(edges), 3, 3), np.nan)
+        segments[:, :2] = vertices[edges]
+        fig.add_trace(go.Scatter3d(
+            x=segments[:, :, 0].ravel(),
+            y=segments[:, :, 1].ravel(),
+            z=segments[:, :, 2].ravel(),
+            mode='lines',
+            line=dict(color='rgba(60, 60, 60, 0.6)', width=2),
+            hoverinfo='skip',
+            name="Edges"
+        ))
+
     fig.add_trace(go.Scatter3d(
         x=[x],
         y=[y],
@@ -828,28 +1857,45 @@ def plot_3d(vars_lp):
 
     fig.update_layout(
         scene=dict(
-            xaxis_title='x₁',
-            yaxis_title='x₂',
-            zaxis_title='x₃',
+            xaxis=dict(title=model["var_names"][0], range=[x0, x1]),
+            yaxis=dict(title=model["var_names"][1], range=[y0, y1]),
+            zaxis=dict(title=model["var_names"][2], range=[z0, z1]),
             bgcolor="rgba(0,0,0,0)"
         ),
         margin=dict(l=0, r=0, b=0, t=30),
         template="plotly_white",
-        title="3D Optimal Solution",
+        title="3D Feasible Region and Optimal Solution",
         height=600
     )
-    st.plotly_chart(fig, use_container_width=True)
+
+    binding = sorted(region["labels"][tag] for tag in region["binding"] if tag != BOX)
+    legend = "🟨 optimal face • 🟥 binding constraints" + (" • ⬜ cut-off box (the region is unbounded)" if not region["bounded"] else "")
+    notes = [legend + (f" • binding at the optimum: {', '.join(binding)}" if binding else "")]
+    if region["decimated"]:
+        notes.append(f"Simplified for display to the {len(region['faces']):,} largest faces of {region['total_faces']:,} "
+                     f"(at most {MAX_MESH_VERTICES:,} vertices); binding constraints are always kept.")
+    if not region["faces"]:
+        notes.append("The feasible region has no volume to draw.")
+    return fig, notes
+
+
+@st.fragment
+def plot_3d(model, x_opt):
+    st.markdown('<div class="section-card">', unsafe_allow_html=True)
+    st.subheader("📈 3D Solution Visualization")
+    st.markdown("*Three-dimensional representation of the feasible region and your optimal solution*")
+    details = show_figure("3d", figure_3d, model, x_opt)
     st.markdown('</div>', unsafe_allow_html=True)
+    return details
 
 
-def show_breakeven_and_eos(obj_coeffs, vars_lp):
+def show_breakeven_and_eos(obj_coeffs, x):
     st.markdown('<div class="section-card">', unsafe_allow_html=True)
     st.subheader("📘 Economic Analysis")
     st.markdown("*Break-even analysis and economies of scale insights*")
 
-    total_cost = sum([obj_coeffs[i] * vars_lp[i].varValue for i in range(len(obj_coeffs))])
-    total_units = sum([vars_lp[i].varValue for i in range(len(vars_lp))])
-    avg_cost = total_cost / total_units if total_units else 0
+    summary = engine.economic_summary(obj_coeffs, x)
+    total_cost, total_units, avg_cost = summary["total_cost"], summary["total_units"], summary["avg_cost"]
 
     # Create metrics
     col1, col2, col3 = st.columns(3)
@@ -869,7 +1915,13 @@ def show_breakeven_and_eos(obj_coeffs, vars_lp):
     st.markdown('</div>', unsafe_allow_html=True)
 
 
-def export_solution_to_csv(solution_data):
+def model_file_text(model, extension):
+    buffer = StringIO()
+    save_model(model, buffer, f"model{extension}")
+    return buffer.getvalue()
+
+
+def export_solution_to_csv(solution_data, model=None, result=None):
     st.markdown('<div class="section-card">', unsafe_allow_html=True)
     st.subheader("💾 Export Results")
 
@@ -883,14 +1935,145 @@ def export_solution_to_csv(solution_data):
             label="📥 Download CSV",
             data=pd.DataFrame([solution_data]).to_csv(index=False),
             file_name=f"lp_solution_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
+            mime="text/csv",
+            on_click="ignore"
         )
 
+    if model is not None and result is not None and has_sensitivity(result):
+        variables_df, constraints_df = sensitivity_frame(model, result)
+        report = pd.concat([variables_df.assign(Kind="Variable"), constraints_df.assign(Kind="Constraint")],
+                           ignore_index=True)
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            st.markdown("**Shadow prices, slacks, reduced costs and ranging intervals.**")
+        with col2:
+            st.download_button(
+                label="📥 Download Sensitivity CSV",
+                data=report[["Kind", *report.columns.drop("Kind")]].to_csv(index=False),
+                file_name=f"lp_sensitivity_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+                on_click="ignore"
+            )
+
+    if model is not None:
+        st.markdown("**Download the model itself to open it in other solvers.**")
+        cols = st.columns(2)
+        for col, (label, extension) in zip(cols, (("📥 Download MPS", ".mps"), ("📥 Download LP", ".lp"))):
+            problem = name_problem(model, extension[1:])
+            with col:
+                # Files are generated only when clicked, so large imported models cost nothing up front
+                st.download_button(
+                    label=label,
+                    data=partial(model_file_text, model, extension),
+                    file_name=f"lp_model_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}",
+                    mime="text/plain",
+                    disabled=problem is not None,
+                    help=problem,
+                    on_click="ignore"
+                )
+
     st.markdown('</div>', unsafe_allow_html=True)
 
 
+@st.cache_resource
+def get_phase_metrics():
+    return PhaseMetrics()
+
+
+def metrics_snapshot():
+    cache = get_solve_cache().stats()
+    figures = get_figure_cache().stats()
+    scheduler = get_scheduler().stats()
+    return get_phase_metrics().prometheus_text(extra=(
+        ("solve_workers", "gauge", "Solver slots (threads) the scheduler runs at most at once.", scheduler["workers"]),
+        ("solve_running", "gauge", "Solves running now.", scheduler["running"]),
+        ("solve_slots_busy", "gauge", "Solver slots held by running solves (one per thread) and worker pools.",
+         scheduler["slots_busy"]),
+        ("solve_slots_leased", "gauge", "Solver slots leased by batch and robustness worker pools.",
+         scheduler["slots_leased"]),
+        ("solve_queue_depth", "gauge", "Solves waiting for a solver slot.", scheduler["queued"]),
+        ("solve_submitted_total", "counter", "Solves admitted by the scheduler.", scheduler["submitted"]),
+        ("solve_rejected_total", "counter", "Solves refused by admission control.", scheduler["rejected"]),
+        ("solve_deduplicated_total", "counter", "Solves that joined an identical in-flight solve.", scheduler["deduplicated"]),
+        ("solve_cancelled_total", "counter", "Solves cancelled by their session.", scheduler["cancelled"]),
+        ("solve_cache_hits_total", "counter", "Solve cache hits.", cache["hits"]),
+        ("solve_cache_misses_total", "counter", "Solve cache misses.", cache["misses"]),
+        ("solve_cache_bytes", "gauge", "Bytes held by the in-memory solve cache.", cache["bytes"]),
+        ("figure_cache_hits_total", "counter", "Figure cache hits.", figures["hits"]),
+        ("figure_cache_bytes", "gauge", "Serialized bytes held by the figure cache.", figures["bytes"]),
+    ))
+
+
+def record_run(timer):
+    get_phase_metrics().observe(timer)
+    if METRICS_FILE:
+        try:
+            write_text_atomic(METRICS_FILE, metrics_snapshot())
+        except OSError:
+            pass  # monitoring must never break the page
+
+
+def phase_details(phase):
+    return ", ".join(f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}"
+                     for key, value in phase.items() if key not in ("phase", "seconds"))
+
+
+def show_diagnostics(timer):
+    st.markdown("*Where the last full run's time went, phase by phase. Reruns scoped to one fragment "
+                "(a plot or an analysis panel) are not included*")
+    total = timer.total()
+    phases = sorted(timer.phases, key=lambda phase: -phase["seconds"])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("⏱️ Timed Total", f"{total * 1000:,.1f} ms")
+    with col2:
+        st.metric("🐢 Slowest Phase", phases[0]["phase"] if phases else "-")
+    solve = next((phase for phase in timer.phases if phase["phase"] == "solve"), None)
+    with col3:
+        st.metric("🔁 Solver Iterations", "-" if solve is None or solve.get("iterations") is None else f"{solve['iterations']:,}")
+
+    st.dataframe(pd.DataFrame({
+        "Phase": [phase["phase"] for phase in timer.phases],
+        "ms": [phase["seconds"] * 1000 for phase in timer.phases],
+        "Share": [f"{phase['seconds'] / total:.0%}" if total else "-" for phase in timer.phases],
+        "Details": [phase_details(phase) for phase in timer.phases],
+    }), use_container_width=True, hide_index=True)
+    if solve is not None and solve.get("solver_time") is not None and not solve.get("cached"):
+        st.caption(f"🧮 {solve['solver']} reports {solve['solver_time']:.3f}s of its own wall time out of "
+                   f"{solve['solve_time']:.3f}s for the call; the rest is handing it the model (for CBC, writing an "
+                   "MPS file and starting its process) and reading the solution back.")
+
+    timings = get_timings().table()
+    if timings:
+        st.markdown("**⚡ Solver Timings** — median solve time per configuration and problem shape, as used by Auto")
+        st.dataframe(pd.DataFrame({
+            "Shape": [row["bucket"] for row in timings],
+            "Configuration": [row["config"] for row in timings],
+            "Median s": [row["median_s"] for row in timings],
+            "Solves": [row["solves"] for row in timings],
+            "Races Won": [f"{row['wins']} of {row['races']}" if row["races"] else "-" for row in timings],
+        }), use_container_width=True, hide_index=True)
+
+    scheduler = get_scheduler().stats()
+    st.caption(f"🚦 Solver slots: {scheduler['slots_busy']} of {scheduler['workers']} busy, {scheduler['queued']} queued • "
+               f"{scheduler['submitted']} admitted, {scheduler['rejected']} refused, "
+               f"{scheduler['deduplicated']} shared an identical in-flight solve")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("📥 Download Timings (JSON)", data=timer.to_json(),
+                           file_name=f"lp_timings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                           mime="application/json", on_click="ignore")
+    with col2:
+        st.download_button("📥 Prometheus Snapshot", data=metrics_snapshot(), file_name="lp_solver_metrics.prom",
+                           mime="text/plain", on_click="ignore",
+                           help="Server-wide totals in the Prometheus text exposition format")
+
+
 # ---------- Main Application ---------- #
 def main():
+    apply_page_style()
+
     # Header with enhanced styling
     st.markdown("""
         <div style='text-align: center; padding: 20px; margin-bottom: 30px;'>
@@ -904,31 +2087,85 @@ def main():
         </div>
     """, unsafe_allow_html=True)
 
+    get_scheduler()  # created (and the solver processes' fork server started) before the first solve
+    timer = PhaseTimer()
+
     # Get user inputs
-    problem_heading, variable_names, num_vars, num_constraints, problem_type, solve = get_user_input()
+    with timer.phase("inputs"):
+        (problem_heading, variable_names, num_vars, num_constraints, problem_type, solver, time_limit,
+         mip_options, presolve_options, solve, uploaded_file) = get_user_input()
 
     # Main content
     st.title(f"🎯 {problem_heading}")
 
     # Get problem definition
-    obj_coeffs = get_objective_function(num_vars, variable_names)
-    constraints = get_constraints(num_constraints, num_vars, variable_names)
-
-    # Solve and display results
-    if solve:
-        with st.spinner('🔄 Optimizing your problem...'):
-            prob, vars_lp = solve_lp(num_vars, obj_coeffs, constraints, problem_type)
-
-        solution_data = show_solution(prob, vars_lp, variable_names)
-        show_constraints(prob)
-        show_breakeven_and_eos(obj_coeffs, vars_lp)
-        export_solution_to_csv(solution_data)
-
-        # Visualizations
-        if num_vars == 2:
-            plot_2d(constraints, vars_lp)
-        elif num_vars == 3:
-            plot_3d(vars_lp)
+    model = None
+    if uploaded_file is not None:
+        try:
+            with timer.phase("load_model"):
+                model = load_uploaded_model(uploaded_file.getvalue(), uploaded_file.name, problem_type)
+        except (ValueError, ImportError) as e:
+            st.error(f"❌ Could not import {uploaded_file.name}: {e}")
+        else:
+            show_model_summary(model, uploaded_file.name)
+    elif num_vars:
+        with timer.phase("problem_input"):
+            obj_coeffs, constraints, domains, form_solve = get_problem_inputs(num_constraints, num_vars, variable_names)
+        solve = solve or form_solve
+        with timer.phase("model_build"):
+            model = model_from_constraints(num_vars, obj_coeffs, constraints, problem_type, variable_names, **domains)
+    else:
+        st.info("📂 Upload a model file in the sidebar to get started.")
+
+    # Solve; solutions stay in the session history, so reruns and downloads never need a re-solve
+    history = get_solution_history()
+    current_key = solution_key(model) if model is not None else None
+    if solve and model is not None:
+        mip = is_mip(model)
+        options, note = resolve_solver(solver, model)
+        if note:
+            st.info(note)
+        with st.spinner('🔄 Optimizing your problem...'), timer.phase("solve", backend=solver_label(options)) as details:
+            num_rows, num_cols = model_shape(model)
+            # A MIP has no duals to range, but takes the branch-and-bound controls
+            options["sensitivity"] = not mip and num_rows * num_cols <= MAX_SENSITIVITY_CELLS
+            options.update(presolve_options, diagnose=True)
+            if mip:
+                options.update(mip_options)
+            if time_limit:
+                options["time_limit"] = time_limit
+            result = submit_solve(model, current_key, options)
+            if result is not None:
+                details.update(solver_details(result))
+            else:
+                details["job"] = st.session_state.solve_job["job"].state if "solve_job" in st.session_state else "refused"
+    elif "solve_job" in st.session_state:
+        with timer.phase("solve", backend=solver_label(st.session_state.solve_job["job"].options)) as details:
+            result = collect_solve_job()
+            if result is not None:
+                details.update(solver_details(result))
+    elif current_key != st.session_state.get("last_problem_key") and current_key in history:
+        # Editing the inputs back to an earlier problem brings its stored solution back
+        st.session_state.selected_solution = current_key
+    st.session_state.last_problem_key = current_key
+
+    if "solve_job" in st.session_state:
+        show_solve_progress()
+    if len(history):
+        show_solution_panel(current_key, timer)
+
+    if model is not None:
+        with st.expander("🧪 Batch Scenarios", expanded=False), timer.phase("batch_scenarios"):
+            # Scenarios are solved one configuration each rather than raced
+            run_batch_scenarios(model, dict(resolve_solver(solver, model, race=False)[0], **presolve_options))
+        with st.expander("📈 Parametric Analysis", expanded=False), timer.phase("parametric"):
+            run_parametric_analysis(model)
+        with st.expander("🎲 Robustness Analysis", expanded=False), timer.phase("robustness"):
+            run_robustness_analysis(model, dict(resolve_solver(solver, model, race=False)[0], **presolve_options))
+
+    record_run(timer)
+    with st.expander("🩺 Diagnostics", expanded=False):
+        show_diagnostics(timer)
 
     # Footer
     st.markdown("---")
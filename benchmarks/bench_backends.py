@@ -0,0 +1,67 @@
+"""Compares solve latency of the installed backends; the speedup is CBC over the in-process NumPy simplex.
+
+Usage: python benchmarks/bench_backends.py [--sizes 5 20 50 100 200 400] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lpsolver.model import make_model  # noqa: E402
+from lpsolver.solve import BACKENDS, available_backends  # noqa: E402
+
+warnings.simplefilter("ignore", DeprecationWarning)
+
+
+def random_feasible_model(size, density=0.3, seed=0):
+    # Nonnegative A and positive b keep the origin feasible; positive c keeps maximization bounded
+    rng = np.random.default_rng(seed)
+    A = rng.random((size, size)) * (rng.random((size, size)) < density)
+    A[np.arange(size), rng.integers(0, size, size)] += 1.0
+    A[rng.integers(0, size, size), np.arange(size)] += 1.0
+    return make_model(rng.random(size), A, ["<="] * size, rng.uniform(1, 10, size))
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 50, 100, 200, 400])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    names = available_backends()
+    cbc, simplex = names.index("CBC"), names.index("NumPy Simplex")
+    print(f"{'rows x cols':>12} " + " ".join(f"{name + ' ms':>17}" for name in names) + f" {'speedup':>8} {'|Δobj|':>9}")
+    for size in args.sizes:
+        model = random_feasible_model(size)
+        timings, objectives = [], []
+        for name in names:
+            # CBC writes its log to the inherited stdout; keep the table readable
+            saved = os.dup(1)
+            os.dup2(devnull, 1)
+            try:
+                elapsed, result = best_of(lambda: BACKENDS[name](model, {"backend": name}), args.repeat)
+            finally:
+                os.dup2(saved, 1)
+                os.close(saved)
+            timings.append(elapsed)
+            objectives.append(result["objective"])
+        print(f"{f'{size} x {size}':>12} " + " ".join(f"{t * 1000:>17.2f}" for t in timings)
+              + f" {timings[cbc] / timings[simplex]:>7.1f}x {abs(objectives[cbc] - objectives[simplex]):>9.2e}")
+
+
+if __name__ == "__main__":
+    main()
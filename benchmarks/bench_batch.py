@@ -0,0 +1,54 @@
+"""Measures batch scenario throughput as the worker pool grows.
+
+Usage: python benchmarks/bench_batch.py [--size 60] [--scenarios 400] [--workers 1 2 4] [--backend "NumPy Simplex"]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_backends import random_feasible_model  # noqa: E402
+from lpsolver.batch import solve_scenarios_frame  # noqa: E402
+from lpsolver.solve import BACKENDS  # noqa: E402
+
+warnings.simplefilter("ignore", DeprecationWarning)
+
+
+def random_scenarios(model, num_scenarios, seed=1):
+    # Perturb every right-hand side and a third of the objective by up to ±20%
+    rng = np.random.default_rng(seed)
+    table = {"scenario": [f"S{k + 1}" for k in range(num_scenarios)]}
+    for j, name in enumerate(model["con_names"]):
+        table[f"rhs:{name}"] = model["rhs"][j] * rng.uniform(0.8, 1.2, num_scenarios)
+    for i, name in enumerate(model["var_names"][::3]):
+        table[f"c:{name}"] = model["c"][3 * i] * rng.uniform(0.8, 1.2, num_scenarios)
+    return pd.DataFrame(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=60)
+    parser.add_argument("--scenarios", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--backend", default="NumPy Simplex", choices=list(BACKENDS))
+    args = parser.parse_args()
+
+    model = random_feasible_model(args.size)
+    table = random_scenarios(model, args.scenarios)
+    print(f"{args.scenarios} scenarios of a {args.size} x {args.size} model, {args.backend}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'wall s':>9} {'scen/s':>9} {'solver s':>9} {'optimal':>8}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        frame = solve_scenarios_frame(model, table, {"backend": args.backend}, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {elapsed:>9.2f} {len(frame) / elapsed:>9.1f} "
+              f"{frame['Solve Time (s)'].sum():>9.2f} {(frame['Status'] == 'Optimal').sum():>8}")
+
+
+if __name__ == "__main__":
+    main()
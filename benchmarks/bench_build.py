@@ -0,0 +1,77 @@
+"""Times PuLP model construction per nonzero: per-row lpSum loop vs the bulk CSR builder.
+
+Usage: python benchmarks/bench_build.py [--sizes 1000 10000 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lpsolver.model import csr_from_coo, make_model, build_pulp_problem  # noqa: E402
+
+warnings.simplefilter("ignore", DeprecationWarning)
+
+# The legacy loop is quadratic in the row width, so it is only timed up to this many nonzeros
+LEGACY_MAX_NNZ = 10_000
+
+
+def random_sparse_model(nnz, density=0.01, seed=0):
+    rng = np.random.default_rng(seed)
+    num_vars = max(10, int(np.sqrt(nnz / density)))
+    num_constraints = max(1, nnz // max(1, int(num_vars * density)))
+    rows = rng.integers(0, num_constraints, nnz)
+    cols = rng.integers(0, num_vars, nnz)
+    vals = rng.uniform(1, 10, nnz)
+    A = csr_from_coo(rows, cols, vals, (num_constraints, num_vars))
+    return make_model(rng.uniform(1, 10, num_vars), A, ["<="] * num_constraints,
+                      rng.uniform(100, 1000, num_constraints))
+
+
+def build_legacy(model):
+    # The original solve_lp construction: one lpSum over every column of every row
+    from pulp import LpProblem, LpVariable, LpMaximize, lpSum
+
+    num_constraints, num_vars = len(model["rhs"]), len(model["c"])
+    indptr, indices, data = model["A_indptr"], model["A_indices"], model["A_data"]
+    prob = LpProblem("LP", LpMaximize)
+    vars_lp = [LpVariable(f"x{i + 1}", lowBound=0) for i in range(num_vars)]
+    prob += lpSum([model["c"][i] * vars_lp[i] for i in range(num_vars)])
+    for j in range(num_constraints):
+        coeffs = np.zeros(num_vars)
+        coeffs[indices[indptr[j]:indptr[j + 1]]] = data[indptr[j]:indptr[j + 1]]
+        prob += lpSum([coeffs[i] * vars_lp[i] for i in range(num_vars)]) <= model["rhs"][j], f"c{j}"
+    return prob
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'nnz':>10} {'rows':>8} {'cols':>8} {'bulk s':>9} {'bulk ns/nz':>11} {'legacy s':>9} {'legacy ns/nz':>13}")
+    for nnz in args.sizes:
+        model = random_sparse_model(nnz)
+        actual_nnz = len(model["A_data"])
+        bulk = best_of(lambda: build_pulp_problem(model), args.repeat)
+        legacy = best_of(lambda: build_legacy(model), 1) if nnz <= LEGACY_MAX_NNZ else None
+        print(f"{actual_nnz:>10} {len(model['rhs']):>8} {len(model['c']):>8} {bulk:>9.3f} "
+              f"{bulk / actual_nnz * 1e9:>11.0f} "
+              + (f"{legacy:>9.3f} {legacy / actual_nnz * 1e9:>13.0f}" if legacy is not None else f"{'-':>9} {'-':>13}"))
+
+
+if __name__ == "__main__":
+    main()
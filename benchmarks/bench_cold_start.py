@@ -0,0 +1,64 @@
+"""Measures cold-start import time of the headless engine against the full Streamlit app.
+
+Each module is imported in a fresh interpreter. The run fails if the engine pulls in
+Streamlit, Plotly or pandas, or if its import time exceeds --max-ratio of the app's.
+
+Usage: python benchmarks/bench_cold_start.py [--repeat 5] [--max-ratio 0.25]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["lpsolver.engine", "lpsolver.cli", "app"]
+# UI-only packages the engine must not load
+FORBIDDEN = ["streamlit", "plotly", "pandas"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def cold_import(module):
+    probe = PROBE.format(module=module, forbidden=FORBIDDEN)
+    output = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ratio", type=float, default=0.25)
+    args = parser.parse_args()
+
+    medians, leaks = {}, {}
+    print(f"{'module':>16} {'median ms':>10} {'min ms':>8}  heavy packages loaded")
+    for module in MODULES:
+        runs = [cold_import(module) for _ in range(args.repeat)]
+        seconds = [run["seconds"] for run in runs]
+        medians[module] = statistics.median(seconds)
+        leaks[module] = runs[0]["loaded"]
+        print(f"{module:>16} {medians[module] * 1000:>10.1f} {min(seconds) * 1000:>8.1f}  "
+              f"{', '.join(leaks[module]) or '-'}")
+
+    failures = [f"{module} imports {', '.join(leaks[module])}"
+                for module in MODULES if module != "app" and leaks[module]]
+    ratio = medians["lpsolver.engine"] / medians["app"]
+    print(f"engine / app import time: {ratio:.2f} (limit {args.max_ratio:.2f})")
+    if ratio > args.max_ratio:
+        failures.append(f"engine import is {ratio:.2f}x the app's (limit {args.max_ratio:.2f})")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Measures build time and serialized payload of the 2D/3D figures, and the figure cache.
+
+The run fails if any figure's JSON payload exceeds the app's FIGURE_BUDGET_KB.
+
+Usage: python benchmarks/bench_figures.py [--constraints 100 5000 50000] [--constraints-3d 50 3000]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import plotly.io as pio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app  # noqa: E402
+from bench_geometry import random_polygon_model, random_polytope_model  # noqa: E402
+
+warnings.simplefilter("ignore")
+
+
+def measure(kind, build, model, x):
+    start = time.perf_counter()
+    figure, _ = build(model, x)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    payload = len(pio.to_json(figure, validate=False))
+    serialize_time = time.perf_counter() - start
+
+    app.get_figure_cache().clear()
+    app.cached_figure(kind, build, model, x)
+    start = time.perf_counter()
+    _, _, cached = app.cached_figure(kind, build, model, x)
+    assert cached
+    return build_time, serialize_time, time.perf_counter() - start, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--constraints", type=int, nargs="+", default=[100, 5_000, 50_000])
+    parser.add_argument("--constraints-3d", type=int, nargs="+", default=[50, 3_000])
+    args = parser.parse_args()
+
+    cases = [("2d", app.figure_2d, random_polygon_model(n), np.zeros(2), n) for n in args.constraints]
+    cases += [("3d", app.figure_3d, random_polytope_model(n), np.zeros(3), n) for n in args.constraints_3d]
+    failures = []
+    print(f"{'figure':>6} {'constraints':>11} {'build ms':>9} {'to_json ms':>10} {'cache hit ms':>12} {'payload KB':>10}")
+    for kind, build, model, x, n in cases:
+        build_time, serialize_time, hit_time, payload = measure(kind, build, model, x)
+        print(f"{kind:>6} {n:>11,} {build_time * 1000:>9.1f} {serialize_time * 1000:>10.1f} "
+              f"{hit_time * 1000:>12.2f} {payload / 1024:>10.0f}")
+        if payload > app.FIGURE_BUDGET_KB * 1024:
+            failures.append(f"{kind} figure with {n:,} constraints is {payload / 1024:.0f} KB "
+                            f"(budget {app.FIGURE_BUDGET_KB:.0f} KB)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Measures MPS / LP write and read throughput on random sparse models.
+
+Usage: python benchmarks/bench_formats.py [--nnz 100000 1000000] [--memory]
+
+--memory also reports peak traced allocations while reading (tracemalloc makes the
+read itself several times slower, so timings are taken in a separate pass).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lpsolver.formats import read_lp_model, read_mps_model, write_lp, write_mps  # noqa: E402
+from lpsolver.model import csr_from_coo, make_model  # noqa: E402
+
+FORMATS = {".mps": (write_mps, read_mps_model), ".lp": (write_lp, read_lp_model)}
+
+
+def random_sparse_model(nnz, seed=0):
+    rng = np.random.default_rng(seed)
+    num_rows, num_cols = max(1, nnz // 20), max(1, nnz // 40)
+    A = csr_from_coo(rng.integers(0, num_rows, nnz), rng.integers(0, num_cols, nnz),
+                     rng.normal(size=nnz), (num_rows, num_cols))
+    return make_model(rng.normal(size=num_cols), A, ["<="] * num_rows, rng.random(num_rows), "Minimize")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nnz", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--memory", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'nonzeros':>10} {'format':>6} {'file MB':>8} {'write s':>8} {'read s':>7} {'ns/nnz':>7} {'peak B/nnz':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for nnz in args.nnz:
+            model = random_sparse_model(nnz)
+            actual = len(model["A_data"])
+            for extension, (write, read) in FORMATS.items():
+                path = os.path.join(directory, "model" + extension)
+                start = time.perf_counter()
+                write(model, path)
+                write_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                loaded = read(path)
+                read_time = time.perf_counter() - start
+                assert np.array_equal(loaded["A_data"], model["A_data"])
+
+                peak = "-"
+                if args.memory:
+                    tracemalloc.start()
+                    read(path)
+                    peak = f"{tracemalloc.get_traced_memory()[1] / actual:.0f}"
+                    tracemalloc.stop()
+                print(f"{actual:>10,} {extension:>6} {os.path.getsize(path) / 1e6:>8.1f} {write_time:>8.2f} "
+                      f"{read_time:>7.2f} {read_time / actual * 1e9:>7.0f} {peak:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Measures the exact 2D feasible polygon and 3D polytope as the number of constraints grows.
+
+Usage: python benchmarks/bench_geometry.py [--constraints 1000 10000 100000] [--constraints-3d 500 5000]
+                                           [--max-vertices 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lpsolver.geometry import feasible_polygon, feasible_polytope, polytope_mesh  # noqa: E402
+from lpsolver.model import make_model  # noqa: E402
+
+
+def random_polygon_model(num_constraints, seed=0):
+    # Tangent lines around a ring of random radii: every constraint is a candidate edge
+    rng = np.random.default_rng(seed)
+    angle = rng.uniform(0, 2 * np.pi, num_constraints)
+    A = np.c_[np.cos(angle), np.sin(angle)]
+    return make_model([1.0, 1.0], A, ["<="] * num_constraints, rng.uniform(5, 10, num_constraints), lb=-np.inf)
+
+
+def random_polytope_model(num_constraints, seed=0):
+    # Tangent planes around a sphere of slightly varying radius
+    rng = np.random.default_rng(seed)
+    A = rng.normal(size=(num_constraints, 3))
+    A /= np.linalg.norm(A, axis=1)[:, None]
+    return make_model([1.0, 1.0, 1.0], A, ["<="] * num_constraints, rng.uniform(5, 6, num_constraints), lb=-np.inf)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--constraints", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--constraints-3d", type=int, nargs="+", default=[500, 5_000])
+    parser.add_argument("--max-vertices", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'constraints':>11} {'vertices':>8} {'ms':>8}")
+    for num_constraints in args.constraints:
+        model = random_polygon_model(num_constraints)
+        start = time.perf_counter()
+        region = feasible_polygon(model)
+        elapsed = time.perf_counter() - start
+        print(f"{num_constraints:>11,} {len(region['vertices']):>8} {elapsed * 1000:>8.1f}")
+
+    print(f"\n{'3D constraints':>14} {'vertices':>8} {'faces':>6} {'ms':>8} {'mesh KB':>8}  (budget {args.max_vertices:,} vertices)")
+    for num_constraints in args.constraints_3d:
+        model = random_polytope_model(num_constraints)
+        start = time.perf_counter()
+        region = feasible_polytope(model, max_vertices=args.max_vertices)
+        vertices, triangles, _, edges = polytope_mesh(region)
+        elapsed = time.perf_counter() - start
+        payload = (vertices.size + triangles.size + 2 * edges.size) * 8 / 1024
+        print(f"{num_constraints:>14,} {len(vertices):>8} {len(region['faces']):>6} {elapsed * 1000:>8.1f} {payload:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compares a parametric sweep with re-solving on a grid of parameter values.
+
+Usage: python benchmarks/bench_parametric.py [--size 100] [--grid 50]
+
+The sweep returns the exact breakpoints; the grid only samples the curve, so its largest
+deviation from the sweep's piecewise-linear interpolation is reported as a check.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_backends import random_feasible_model  # noqa: E402
+from lpsolver.parametric import parameter_value, parametric_sweep  # noqa: E402
+from lpsolver.simplex import solve_simplex  # noqa: E402
+
+
+def grid_solves(model, kind, index, values):
+    key = "rhs" if kind == "rhs" else "c"
+    objectives = []
+    for value in values:
+        changed = np.array(model[key], dtype=np.float64)
+        changed[index] = value
+        objectives.append(solve_simplex(dict(model, **{key: changed}))["objective"])
+    return np.array(objectives)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--grid", type=int, default=50)
+    args = parser.parse_args()
+
+    model = random_feasible_model(args.size)
+    print(f"{'parameter':>10} {'breakpoints':>11} {'pivots':>7} {'sweep s':>8} {'grid s':>7} {'max |error|':>12}")
+    for kind, names in (("rhs", model["con_names"]), ("objective", model["var_names"])):
+        name = names[0]
+        current = parameter_value(model, kind, name)
+        low, high = 0.0, 4.0 * max(current, 1.0)
+
+        start = time.perf_counter()
+        sweep = parametric_sweep(model, kind, name, low, high)
+        sweep_time = time.perf_counter() - start
+
+        values = np.linspace(low, high, args.grid)
+        start = time.perf_counter()
+        objectives = grid_solves(model, kind, list(names).index(name), values)
+        grid_time = time.perf_counter() - start
+
+        error = np.abs(np.interp(values, sweep["values"], sweep["objective"]) - objectives).max()
+        print(f"{kind:>10} {len(sweep['values']):>11} {sweep['pivots']:>7} {sweep_time:>8.3f} "
+              f"{grid_time:>7.2f} {error:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Racing solver configurations against running each one alone, per LP family.
+
+Usage: python benchmarks/bench_portfolio.py [--size 400] [--repeat 3]
+       [--race "CBC · Default" "CBC · Barrier" ...]
+
+Every installed configuration (backend · preset) runs alone as a background job, as the app
+runs solves, so the times include starting the job. The race runs the --race configurations
+at once and keeps the first proven answer; "oracle" is the best single configuration per
+family, which the race (or Auto, once it has timings) tries to match without knowing it in
+advance. Racing pays off when configurations differ a lot and there are spare CPUs for the racers.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lp_families import degenerate, diet, random_sparse, transportation  # noqa: E402
+from lpsolver.jobs import DONE, start_job_server  # noqa: E402
+from lpsolver.model import model_from_constraints  # noqa: E402
+from lpsolver.portfolio import config_label, config_options, configurations, parse_config, start_job  # noqa: E402
+from lpsolver.solve import available_backends  # noqa: E402
+
+FAMILIES = {
+    "random_sparse": lambda n: random_sparse(n, n),
+    "transportation": lambda n: transportation(n // 10, n // 10),
+    "diet": lambda n: diet(n, n // 4),
+    "degenerate": lambda n: degenerate(n, n),
+}
+RACE = ["CBC · Default", "CBC · Barrier", "HiGHS · Default", "NumPy Simplex · Default"]
+
+
+def best_wall(model, options, repeat):
+    """Fastest end-to-end time of ``repeat`` jobs, and the last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        job = start_job(model, options)
+        if job.wait() != DONE:
+            raise RuntimeError(f"{options}: {job.error}")
+        timings.append(time.perf_counter() - start)
+    return min(timings), job.result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--race", nargs="+", default=RACE,
+                        help="configurations to race (default: one per backend plus CBC's barrier, where installed)")
+    args = parser.parse_args()
+
+    configs = configurations(available_backends())
+    racers = [list(parse_config(label)) for label in args.race if parse_config(label) in configs]
+    start_job_server()
+    best_wall(model_from_constraints(*random_sparse(10, 10)), {}, 1)  # warm-up: the fork server's first job
+    print(f"{len(racers)} racers ({', '.join(config_label(*racer) for racer in racers)}), {os.cpu_count()} CPUs")
+    for family, build in FAMILIES.items():
+        model = model_from_constraints(*build(args.size))
+        singles = {config_label(*config): best_wall(model, config_options({}, *config), args.repeat)[0]
+                   for config in configs}
+        race, result = best_wall(model, {"race": racers}, args.repeat)
+        oracle = min(singles, key=singles.get)
+        winner = next(racer["config"] for racer in result["race"] if racer["winner"])
+        print(f"\n{family} ({args.size}): race {race * 1000:.1f} ms won by {winner}; "
+              f"oracle {oracle} {singles[oracle] * 1000:.1f} ms")
+        for label, seconds in sorted(singles.items(), key=lambda item: item[1]):
+            print(f"  {label:>42} {seconds * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
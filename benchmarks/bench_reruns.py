@@ -0,0 +1,139 @@
+"""Server CPU per user interaction, driving the app headlessly with Streamlit's AppTest.
+
+Usage: python benchmarks/bench_reruns.py [--repeat 5] [--baseline-app OLD_APP.py]
+
+Each interaction is replayed the way the browser would send it: edits inside a form send
+nothing until the form is submitted, widgets inside a fragment rerun only that fragment,
+and download buttons with on_click="ignore" do not rerun at all. Everything else reruns the
+whole script. Pass an earlier app.py (e.g. ``git show <rev>:app.py > /tmp/app_old.py``) as
+--baseline-app to measure it under the same harness and report the reduction.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import warnings
+from functools import partial
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData  # noqa: E402
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner  # noqa: E402
+
+warnings.simplefilter("ignore")
+
+# Coefficient edits and download clicks per session in the summary scenario
+EDITS = 6
+DOWNLOADS = 2
+
+
+def measure(action):
+    cpu, wall = time.process_time(), time.perf_counter()
+    action()
+    return time.process_time() - cpu, time.perf_counter() - wall
+
+
+def fragment_id(at, name):
+    # AppTest has no lookup by function; the fragment closure holds the decorated function
+    for fid, wrapped in at._fragment_storage._fragments.items():
+        cells = [cell.cell_contents for cell in wrapped.__closure__ or ()]
+        if any(getattr(cell, "__name__", None) == name for cell in cells):
+            return fid
+    return None
+
+
+def run_fragment(at, fragment):
+    """Reruns one fragment only, as the browser requests it when a widget inside it changes."""
+    scoped = partial(RerunData, fragment_id_queue=[fragment], is_fragment_scoped_rerun=True)
+    with mock.patch.object(local_script_runner, "RerunData", scoped):
+        at.run()
+
+
+def solved_app(path):
+    at = AppTest.from_file(path, default_timeout=120).run()
+    at.sidebar.button[0].click().run()
+    return at
+
+
+def interactions(path):
+    """(interaction, reruns, cpu seconds, wall seconds) for one replay of each interaction."""
+    rows = []
+
+    at = AppTest.from_file(path, default_timeout=120)
+    rows.append(("page load", 1, *measure(at.run)))
+    rows.append(("solve", 1, *measure(at.sidebar.button[0].click().run)))
+
+    widget = at.number_input(key="obj_0")
+    if widget.form_id:
+        rows.append(("coefficient edit", 0, 0.0, 0.0))
+        submit = next(button for button in at.button if button.form_id == widget.form_id)
+        rows.append(("apply edits", 1, *measure(lambda: (widget.set_value(2.0), submit.click().run()))))
+    else:
+        rows.append(("coefficient edit", 1, *measure(widget.set_value(2.0).run)))
+
+    at = solved_app(path)
+    sweep = fragment_id(at, "run_parametric_analysis")
+    at.radio(key="sweep_kind").set_value("objective")
+    if sweep is not None:
+        rows.append(("sweep parameter change", 1, *measure(partial(run_fragment, at, sweep))))
+        at.run()  # the scoped run leaves a partial element tree; rebuild it for the next lookup
+    else:
+        rows.append(("sweep parameter change", 1, *measure(at.run)))
+
+    download = at.get("download_button")[0]
+    if download.proto.ignore_rerun:
+        rows.append(("download click", 0, 0.0, 0.0))
+    else:
+        rows.append(("download click", 1, *measure(at.run)))
+    return rows
+
+
+def median_rows(path, repeat):
+    # AppTest recompiles the script on every run; a server compiles it once, so share one bytecode cache
+    shared = partial(lambda cache: cache, ScriptCache())
+    with mock.patch.object(app_test, "ScriptCache", shared), mock.patch.object(local_script_runner, "ScriptCache", shared):
+        return _median_rows(path, repeat)
+
+
+def _median_rows(path, repeat):
+    interactions(path)  # warm-up: module imports and first-use caches are not per interaction
+    runs = [interactions(path) for _ in range(repeat)]
+    return [(name, reruns, statistics.median(run[i][2] for run in runs), statistics.median(run[i][3] for run in runs))
+            for i, (name, reruns, _, _) in enumerate(runs[0])]
+
+
+def session_cpu(rows):
+    # One session: load, EDITS coefficient edits, solve, one sweep change and DOWNLOADS downloads
+    cost = {name: cpu for name, _, cpu, _ in rows}
+    return (cost["page load"] + EDITS * cost["coefficient edit"] + cost.get("apply edits", 0.0) + cost["solve"]
+            + cost["sweep parameter change"] + DOWNLOADS * cost["download click"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--baseline-app", help="an earlier app.py to compare against")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    apps = [("current", args.app)] + ([("baseline", args.baseline_app)] if args.baseline_app else [])
+    results = {}
+    for label, path in apps:
+        rows = results[label] = median_rows(path, args.repeat)
+        print(f"\n{label}: {path}")
+        print(f"{'interaction':>24} {'reruns':>7} {'CPU ms':>8} {'wall ms':>8}")
+        for name, reruns, cpu, wall in rows:
+            print(f"{name:>24} {reruns:>7} {cpu * 1000:>8.1f} {wall * 1000:>8.1f}")
+        print(f"{'session CPU ms':>24} {'':>7} {session_cpu(rows) * 1000:>8.1f}")
+    if "baseline" in results:
+        before, after = session_cpu(results["baseline"]), session_cpu(results["current"])
+        print(f"\nserver CPU per session: {before * 1000:.0f} ms -> {after * 1000:.0f} ms "
+              f"({1 - after / before:.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""A burst of sessions solving at once, with and without the shared solve scheduler.
+
+Usage: python benchmarks/bench_scheduler.py [--sessions 8] [--workers N] [--size 300]
+       [--shared 0.5] [--backend CBC]
+
+Every session submits one solve at the same moment; a --shared fraction of them ask for the
+same problem (as when many users open the same example). "unbounded" starts every solve at
+once, as sessions did before the scheduler; "scheduled" runs at most --workers at a time
+(default: one per CPU) and lets identical problems share one solve. Reported per mode: wall
+time for the whole burst, peak solver processes, solves actually run, and the p50 / p95 / max
+time a session waited for its result.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lp_families import random_sparse  # noqa: E402
+from lpsolver.cache import problem_hash  # noqa: E402
+from lpsolver.model import model_from_constraints  # noqa: E402
+from lpsolver.jobs import DONE  # noqa: E402
+from lpsolver.scheduler import PENDING, SolveScheduler  # noqa: E402
+
+
+def burst(requests, workers):
+    """Submits every (model, options) request at once; returns the burst's figures."""
+    scheduler = SolveScheduler(max_workers=workers, max_queued=len(requests), max_per_session=1)
+    start = time.perf_counter()
+    tickets = [scheduler.submit(f"session-{i}", problem_hash(model, options), model, options)
+               for i, (model, options) in enumerate(requests)]
+    peak, latencies, pending = 0, {}, set(range(len(tickets)))
+    while pending:
+        peak = max(peak, scheduler.stats()["running"])
+        for i in list(pending):
+            if tickets[i].poll() not in PENDING:
+                latencies[i] = time.perf_counter() - start
+                pending.discard(i)
+        time.sleep(0.005)
+    wall = time.perf_counter() - start
+    failed = [ticket.error for ticket in tickets if ticket.state != DONE]
+    if failed:
+        raise RuntimeError(f"{len(failed)} solves failed: {failed[0]}")
+    values = sorted(latencies.values())
+    return {
+        "wall": wall,
+        "peak": peak,
+        "solves": scheduler.stats()["started"],
+        "p50": statistics.median(values),
+        "p95": values[min(len(values) - 1, int(0.95 * len(values)))],
+        "max": values[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--size", type=int, default=300, help="rows and columns of each sparse LP")
+    parser.add_argument("--shared", type=float, default=0.5, help="fraction of sessions solving the same problem")
+    parser.add_argument("--backend", default="CBC")
+    args = parser.parse_args()
+
+    shared = int(args.sessions * args.shared)
+    models = [model_from_constraints(*random_sparse(args.size, args.size, seed=0 if i < shared else i))
+              for i in range(args.sessions)]
+    options = {"backend": args.backend}
+    burst([(models[0], options)], 1)  # warm-up: starts the fork server
+
+    print(f"{args.sessions} sessions, {shared} on the same {args.size}x{args.size} problem, "
+          f"{args.backend}, {args.workers} workers")
+    print(f"{'mode':>10} {'wall s':>8} {'peak procs':>11} {'solves':>7} {'p50 s':>7} {'p95 s':>7} {'max s':>7}")
+    # Unbounded: every session starts its own solve at once; a per-request tag defeats deduplication
+    unbounded = [(model, dict(options, request=i)) for i, model in enumerate(models)]
+    for mode, requests, workers in (("unbounded", unbounded, args.sessions),
+                                    ("scheduled", [(model, options) for model in models], args.workers)):
+        row = burst(requests, workers)
+        print(f"{mode:>10} {row['wall']:>8.2f} {row['peak']:>11} {row['solves']:>7} "
+              f"{row['p50']:>7.2f} {row['p95']:>7.2f} {row['max']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
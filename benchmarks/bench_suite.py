@@ -0,0 +1,173 @@
+"""End-to-end benchmark over generated LP families, timed per stage.
+
+Stages: ``build`` (the array model, as solve_lp builds it), ``solve`` (uncached, per backend),
+``table`` (the results table show_solution renders) and ``plot`` (the 2D/3D figure, for
+2- and 3-variable instances). Each time is the median of --repeat runs.
+
+Usage: python benchmarks/bench_suite.py [--preset quick|full] [--backend CBC "NumPy Simplex"]
+       [--repeat 5] [--output results.json] [--baseline old.json] [--tolerance 0.25]
+
+The run fails when the backends disagree on an instance's status or optimal objective, and
+with --baseline when any stage is slower than its baseline time by more than
+--tolerance (relative) and --floor-ms (absolute, to ignore timer noise on tiny stages).
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app  # noqa: E402
+from lp_families import FAMILIES, PRESETS  # noqa: E402
+from lpsolver.model import model_from_constraints  # noqa: E402
+from lpsolver.solve import BACKENDS, available_backends, solve_model  # noqa: E402
+
+warnings.simplefilter("ignore")
+
+PLOTS = {2: ("2d", app.figure_2d), 3: ("3d", app.figure_3d)}
+
+
+@contextlib.contextmanager
+def quiet():
+    # CBC writes its log straight to file descriptor 1
+    sys.stdout.flush()
+    saved = os.dup(1)
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+    try:
+        yield
+    finally:
+        os.dup2(saved, 1)
+        os.close(saved)
+
+
+def timed(repeat, stage, *args):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = stage(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), value
+
+
+def run_instance(family, size, backend, repeat):
+    num_vars, obj_coeffs, constraints, problem_type = FAMILIES[family](*size)
+    stages = {}
+    stages["build"], model = timed(repeat, model_from_constraints, num_vars, obj_coeffs, constraints, problem_type)
+    with quiet():
+        stages["solve"], result = timed(repeat, solve_model, model, {"backend": backend})
+    if result["status"] == "Optimal":
+        stages["table"], _ = timed(repeat, app.solution_frame, result, model["var_names"])
+        if num_vars in PLOTS:
+            stages["plot"], _ = timed(repeat, PLOTS[num_vars][1], model, result["x"])
+    return {
+        "family": family,
+        "size": list(size),
+        "backend": backend,
+        "rows": len(model["rhs"]),
+        "cols": num_vars,
+        "nnz": len(model["A_data"]),
+        "status": result["status"],
+        "objective": result["objective"],
+        "seconds": stages,
+    }
+
+
+def case_key(case):
+    return (case["family"], tuple(case["size"]), case["backend"])
+
+
+def disagreements(cases, tolerance=1e-6):
+    # Every backend timed on an instance must reach the same status and optimal objective
+    by_instance = {}
+    for case in cases:
+        by_instance.setdefault((case["family"], tuple(case["size"])), []).append(case)
+    found = []
+    for (family, size), group in by_instance.items():
+        first = group[0]
+        for case in group[1:]:
+            same = case["status"] == first["status"] and (
+                case["status"] != "Optimal"
+                or abs(case["objective"] - first["objective"]) <= tolerance * max(1.0, abs(first["objective"])))
+            if not same:
+                found.append(f"{family} {size}: {first['backend']} {first['status']} {first['objective']} but "
+                             f"{case['backend']} {case['status']} {case['objective']}")
+    return found
+
+
+def regressions(cases, baseline, tolerance, floor):
+    previous = {case_key(case): case for case in baseline["cases"]}
+    found = []
+    for case in cases:
+        old = previous.get(case_key(case))
+        if old is None:
+            continue
+        for stage, seconds in case["seconds"].items():
+            before = old["seconds"].get(stage)
+            if before is not None and seconds > before * (1 + tolerance) and seconds - before > floor:
+                found.append(f"{case['family']} {tuple(case['size'])} [{case['backend']}] {stage}: "
+                             f"{before * 1000:.2f} ms -> {seconds * 1000:.2f} ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--family", nargs="+", choices=sorted(FAMILIES), help="only these families")
+    parser.add_argument("--backend", nargs="+", choices=sorted(BACKENDS), default=available_backends())
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown per stage")
+    parser.add_argument("--floor-ms", type=float, default=1.0, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    cases = []
+    print(f"{'family':>15} {'size':>12} {'backend':>14} {'status':>10} "
+          f"{'build ms':>9} {'solve ms':>9} {'table ms':>9} {'plot ms':>9}")
+    for family, sizes in PRESETS[args.preset].items():
+        if args.family and family not in args.family:
+            continue
+        for size in sizes:
+            for backend in args.backend:
+                case = run_instance(family, size, backend, args.repeat)
+                cases.append(case)
+                cells = [f"{case['seconds'][stage] * 1000:>9.2f}" if stage in case["seconds"] else f"{'-':>9}"
+                         for stage in ("build", "solve", "table", "plot")]
+                print(f"{family:>15} {'x'.join(map(str, size)):>12} {backend:>14} {case['status']:>10} "
+                      + " ".join(cells))
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "preset": args.preset,
+            "repeat": args.repeat,
+        },
+        "cases": cases,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = disagreements(cases)
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures += regressions(cases, json.load(f), args.tolerance, args.floor_ms / 1000)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Correctness checks for the solver paths the benchmarks time.
+
+Usage: python benchmarks/check_results.py [--checks backends presolve formats ...] [--preset quick|full]
+
+Each check solves or transforms the generated LP families and compares the outcome with an
+independent route to the same answer: the NumPy simplex against CBC, presolve on against off,
+a model written to MPS / LP and read back against the original, a conflict set against
+re-solves with each of its rows dropped, and so on. Every failed comparison is printed and the
+run exits with status 1, so it can gate a change next to the timing baselines.
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_iis import infeasible_model  # noqa: E402
+from lp_families import FAMILIES, PRESETS  # noqa: E402
+from lpsolver.cache import DiskSolveCache, SolveCache, problem_hash  # noqa: E402
+from lpsolver.diagnosis import find_conflict, unbounded_ray  # noqa: E402
+from lpsolver.geometry import POINT, SEGMENT, feasible_polygon  # noqa: E402
+from lpsolver.ingest import load_model, save_model  # noqa: E402
+from lpsolver.model import dense_matrix, make_model, model_from_constraints, model_shape, select_rows  # noqa: E402
+from lpsolver.parametric import parametric_sweep  # noqa: E402
+from lpsolver.robustness import perturbation_targets, robustness_analysis, sample_parameters  # noqa: E402
+from lpsolver.scheduler import SolveScheduler  # noqa: E402
+from lpsolver.sensitivity import SENSITIVITY_KEYS  # noqa: E402
+from lpsolver.solve import available_backends, run_solve  # noqa: E402
+
+warnings.simplefilter("ignore")
+
+# Relative agreement asked of two optimal objectives
+OBJECTIVE_TOLERANCE = 1e-6
+FEASIBILITY_TOLERANCE = 1e-6
+# Presolve compares simplex duals and ranges on models up to this many basis cells (rows x (rows + columns))
+RANGED_CELLS = 100_000
+
+
+@contextlib.contextmanager
+def quiet():
+    # CBC writes its log straight to file descriptor 1
+    sys.stdout.flush()
+    saved = os.dup(1)
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+    try:
+        yield
+    finally:
+        os.dup2(saved, 1)
+        os.close(saved)
+
+
+def solve(model, options):
+    with quiet():
+        return run_solve(model, options)
+
+
+def same_objective(a, b):
+    return abs(a - b) <= OBJECTIVE_TOLERANCE * max(1.0, abs(a), abs(b))
+
+
+def violation(model, x):
+    # Largest constraint or bound violation of x, relative to 1 + |rhs|
+    activity = dense_matrix(model) @ x
+    rhs, senses = np.asarray(model["rhs"]), np.asarray(model["senses"])
+    excess = np.where(senses == -1, activity - rhs, np.where(senses == 1, rhs - activity, np.abs(activity - rhs)))
+    bounds = np.maximum(np.asarray(model["lb"]) - x, x - np.asarray(model["ub"]))
+    return max(float((excess / (1.0 + np.abs(rhs))).max(initial=0.0)), float(bounds.max(initial=0.0)))
+
+
+def family_models(preset):
+    for family, sizes in PRESETS[preset].items():
+        for size in sizes:
+            yield f"{family} {'x'.join(map(str, size))}", model_from_constraints(*FAMILIES[family](*size))
+
+
+# ---------- Checks ---------- #
+# Each yields one failure message per wrong outcome
+def check_backends(preset):
+    """Every backend reaches the same status and objective, at a feasible point."""
+    for name, model in family_models(preset):
+        reference = solve(model, {"backend": "CBC"})
+        for backend in available_backends():
+            result = reference if backend == "CBC" else solve(model, {"backend": backend})
+            if result["status"] != reference["status"]:
+                yield f"{name}: {backend} says {result['status']}, CBC {reference['status']}"
+            elif result["status"] == "Optimal":
+                if not same_objective(result["objective"], reference["objective"]):
+                    yield f"{name}: {backend} objective {result['objective']:.10g} vs CBC {reference['objective']:.10g}"
+                if violation(model, result["x"]) > FEASIBILITY_TOLERANCE:
+                    yield f"{name}: {backend} solution violates a constraint by {violation(model, result['x']):.2e}"
+
+
+def check_presolve(preset):
+    """Presolve (with and without scaling) and postsolve keep the status and objective, and the
+    simplex duals and ranges."""
+    for name, model in family_models(preset):
+        for backend in ("CBC", "NumPy Simplex"):
+            # CBC's own tolerances move its points by ~1e-7, so only the simplex compares ranges,
+            # and only where ranging the dense basis is quick
+            rows, cols = model_shape(model)
+            ranged = {"sensitivity": True} if backend == "NumPy Simplex" and rows * (rows + cols) <= RANGED_CELLS else {}
+            plain = solve(model, dict(ranged, backend=backend))
+            for options in ({"presolve": True}, {"presolve": True, "scale": False}):
+                reduced = solve(model, dict(options, backend=backend, **ranged))
+                label = f"{name} [{backend}, scale={options.get('scale', True)}]"
+                if reduced["status"] != plain["status"]:
+                    yield f"{label}: {reduced['status']} with presolve, {plain['status']} without"
+                elif plain["status"] == "Optimal":
+                    if not same_objective(reduced["objective"], plain["objective"]):
+                        yield f"{label}: objective {reduced['objective']:.10g} with presolve, {plain['objective']:.10g} without"
+                    if violation(model, reduced["x"]) > FEASIBILITY_TOLERANCE:
+                        yield f"{label}: postsolved point violates a constraint by {violation(model, reduced['x']):.2e}"
+                    for key in SENSITIVITY_KEYS if ranged else ():
+                        if not np.allclose(reduced[key], plain[key], rtol=1e-6, atol=1e-6):
+                            yield f"{label}: {key} differ with presolve"
+
+
+def _format_models(preset):
+    yield from family_models(preset)
+    # Every sense, bound kind and integer column in one model
+    A = np.array([[1.0, 2.5, 0.0, -1.0], [0.0, 1.0, 3.0, 0.0], [1.0, 1.0, 1.0, 1.0]])
+    yield "mixed bounds", make_model([1.5, -2.0, 0.25, 3.0], A, [-1, 1, 0], [10.0, 2.0, 6.0], sense="Minimize",
+                                     lb=[0.0, -np.inf, -5.0, 1.0], ub=[4.0, np.inf, 5.0, 1.0],
+                                     integer=[False, True, False, False])
+
+
+def check_formats(preset):
+    """A model written to MPS and LP reads back with the same arrays, names and sense."""
+    keys = ("c", "rhs", "senses", "lb", "ub")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, model in _format_models(preset):
+            for extension in (".mps", ".lp"):
+                path = os.path.join(directory, f"model{extension}")
+                save_model(model, path)
+                back = load_model(path)
+                label = f"{name} [{extension}]"
+                if back["sense"] != model["sense"]:
+                    yield f"{label}: sense {back['sense']} read back as {model['sense']}"
+                if list(back["var_names"]) != list(model["var_names"]) or list(back["con_names"]) != list(model["con_names"]):
+                    yield f"{label}: names differ after the round trip"
+                    continue
+                for key in keys:
+                    if not np.array_equal(np.asarray(back[key], dtype=np.float64), np.asarray(model[key], dtype=np.float64)):
+                        yield f"{label}: {key} differs after the round trip"
+                if not np.array_equal(dense_matrix(back), dense_matrix(model)):
+                    yield f"{label}: the constraint matrix differs after the round trip"
+                if not np.array_equal(np.asarray(back["integer"], dtype=bool), np.asarray(model["integer"], dtype=bool)):
+                    yield f"{label}: integrality differs after the round trip"
+
+
+def check_conflicts(preset):
+    """A conflict is infeasible, stays irreducible (dropping any row makes it feasible) and is the
+    planted one; an unbounded model's ray keeps every row and improves the objective."""
+    sizes = (60, 200) if preset == "quick" else (100, 300, 1000)
+    for rows in sizes:
+        model, chain = infeasible_model(rows, rows // 2, 5)
+        for label, instance in (("LP", model), ("MIP", dict(model, integer=np.r_[True, np.zeros(rows // 2 - 1, bool)]))):
+            with quiet():
+                conflict = find_conflict(instance, {"backend": "CBC"}, time_limit=600)
+            name = f"{label} {rows} rows"
+            if conflict is None:
+                yield f"{name}: no conflict found in an infeasible model"
+                continue
+            if conflict["rows"] != chain:
+                yield f"{name}: conflict {conflict['rows']} is not the planted {chain}"
+            feasibility = dict(instance, c=np.zeros(len(instance["c"])))
+            if solve(select_rows(feasibility, conflict["rows"]), {"backend": "CBC"})["status"] != "Infeasible":
+                yield f"{name}: the conflict rows are feasible on their own"
+            for row in conflict["rows"]:
+                rest = [other for other in conflict["rows"] if other != row]
+                if solve(select_rows(feasibility, rest), {"backend": "CBC"})["status"] != "Optimal":
+                    yield f"{name}: the conflict stays infeasible without row {row}, so it is not minimal"
+
+    # max x + y  s.t.  x - y <= 1: unbounded along (1, 1)
+    model = make_model([1.0, 1.0], np.array([[1.0, -1.0]]), [-1], [1.0])
+    ray = unbounded_ray(model)
+    if ray is None:
+        yield "unbounded model: no ray found"
+    else:
+        direction = np.array(ray["direction"])
+        if (dense_matrix(model) @ direction > FEASIBILITY_TOLERANCE).any() or (direction < -FEASIBILITY_TOLERANCE).any() or ray["rate"] <= 0:
+            yield f"unbounded model: {ray['direction']} is not an improving ray"
+
+
+def check_parametric(preset):
+    """The swept objective matches direct solves at and between the breakpoints."""
+    for name, model in family_models(preset):
+        if len(model["rhs"]) * len(model["c"]) > 20_000:
+            continue
+        for kind, target in (("rhs", model["con_names"][0]), ("objective", model["var_names"][0])):
+            current = float((model["rhs"] if kind == "rhs" else model["c"])[0])
+            span = max(abs(current), 1.0)
+            sweep = parametric_sweep(model, kind, target, current - span, current + span)
+            if sweep["status"] != "Optimal":
+                continue
+            values = sweep["values"]
+            probes = np.r_[values, (values[:-1] + values[1:]) / 2]
+            expected = np.interp(probes, values, sweep["objective"])
+            key = "rhs" if kind == "rhs" else "c"
+            for value, objective in zip(probes, expected):
+                changed = np.array(model[key], dtype=np.float64)
+                changed[0] = value
+                result = solve(dict(model, **{key: changed}), {"backend": "CBC"})
+                if result["status"] != "Optimal" or not same_objective(result["objective"], objective):
+                    yield (f"{name}: {kind} of {target} at {value:.6g} gives {result['objective']} by CBC, "
+                           f"{objective:.10g} by the sweep")
+                    break
+
+
+def check_cache(preset):
+    """Results come back intact from memory and disk, and the key separates models and options."""
+    model = model_from_constraints(*FAMILIES["random_sparse"](50, 50))
+    result = solve(model, {"backend": "CBC"})
+    key = problem_hash(model, {"backend": "CBC"})
+    changed = dict(model, c=np.asarray(model["c"]) * 1.01)
+    if len({key, problem_hash(model, {"backend": "NumPy Simplex"}), problem_hash(changed, {"backend": "CBC"})}) != 3:
+        yield "problem_hash gives the same key to different models or options"
+    if problem_hash(dict(model), {"backend": "CBC"}) != key:
+        yield "problem_hash is not stable for the same model"
+    with tempfile.TemporaryDirectory() as directory:
+        for label, cache in (("memory", SolveCache()), ("disk", DiskSolveCache(os.path.join(directory, "cache.db")))):
+            cache.put(key, result)
+            cached = cache.get(key)
+            if cached is None:
+                yield f"{label} cache lost the result"
+            elif not (np.array_equal(cached["x"], result["x"]) and cached["objective"] == result["objective"]
+                      and cached["status"] == result["status"]):
+                yield f"{label} cache returned a different result"
+
+
+def check_scheduler(preset):
+    """Identical submissions share one solve, and running work and leases never exceed the slots."""
+    scheduler = SolveScheduler(max_workers=1, max_per_session=4)
+    models = [model_from_constraints(*FAMILIES["random_dense"](30, 30, seed=seed)) for seed in range(3)]
+    keys = [problem_hash(model, {"backend": "CBC"}) for model in models]
+    tickets = [scheduler.submit("a", keys[0], models[0], {"backend": "CBC"}),
+               scheduler.submit("b", keys[0], models[0], {"backend": "CBC"})]
+    tickets += [scheduler.submit("a", key, model, {"backend": "CBC"}) for key, model in zip(keys[1:], models[1:])]
+    peak, deadline = 0, time.perf_counter() + 120
+    while any(ticket.poll() in ("queued", "running") for ticket in tickets) and time.perf_counter() < deadline:
+        peak = max(peak, scheduler.stats()["slots_busy"])
+        time.sleep(0.01)
+    if peak > 1:
+        yield f"{peak} slots busy with max_workers=1"
+    if not tickets[1].deduplicated or scheduler.stats()["started"] != 3:
+        yield f"identical submissions were not shared ({scheduler.stats()['started']} solves for 3 problems)"
+    for ticket, model in zip([tickets[0], tickets[2], tickets[3]], models):
+        expected = solve(model, {"backend": "CBC"})
+        if ticket.result is None or not same_objective(ticket.result["objective"], expected["objective"]):
+            yield "a scheduled solve disagrees with a direct solve"
+    if tickets[1].result is None or tickets[1].result["objective"] != tickets[0].result["objective"]:
+        yield "the shared ticket did not get the shared result"
+    # A worker pool's lease takes the free slots and holds back queued solves until it ends
+    with scheduler.lease(4) as granted:
+        ticket = scheduler.submit("a", problem_hash(models[0], {"backend": "NumPy Simplex"}), models[0],
+                                  {"backend": "NumPy Simplex"})
+        time.sleep(0.1)
+        if granted != 1 or ticket.poll() != "queued":
+            yield f"a lease on max_workers=1 got {granted} slots and left a solve {ticket.poll()}"
+    if ticket.wait(60) != "done":
+        yield "a solve queued behind a lease did not run once it ended"
+
+
+def check_geometry(preset):
+    """2D regions hold only feasible vertices, and zero-area regions come out as a segment or point."""
+    for seed in range(5):
+        model = model_from_constraints(*FAMILIES["random_dense"](20, 2, seed=seed))
+        region = feasible_polygon(model)
+        if max((violation(model, vertex) for vertex in region["vertices"]), default=0.0) > FEASIBILITY_TOLERANCE:
+            yield f"random_dense 20x2 seed {seed}: a polygon vertex lies outside the region"
+    segment = make_model([1.0, 1.0], np.array([[1.0, 1.0], [1.0, 1.0]]), [-1, 1], [4.0, 4.0])
+    point = make_model([1.0, 1.0], np.array([[1.0, 0.0], [0.0, 1.0]]), [-1, -1], [0.0, 0.0])
+    if feasible_polygon(segment)["dimension"] != SEGMENT:
+        yield "x + y <= 4 with x + y >= 4 is not drawn as a segment"
+    if feasible_polygon(point)["dimension"] != POINT:
+        yield "x <= 0, y <= 0 with nonnegative bounds is not drawn as a point"
+
+
+def check_robustness(preset):
+    """Samples answered by the base basis or re-solved warm match solving them one by one."""
+    model = model_from_constraints(*FAMILIES["random_sparse"](40, 40))
+    perturbations = {label: ("normal", 0.01) for label in perturbation_targets(model)}
+    analysis = robustness_analysis(model, perturbations, 200, max_workers=1, seed=0)
+    if not analysis["basis_reused"] or not analysis["resolved"]:
+        yield f"expected both reused and re-solved samples, got {analysis['basis_reused']} and {analysis['resolved']}"
+    C, B = sample_parameters(model, perturbations, 200, seed=0)
+    for k in range(0, 200, 10):
+        result = solve(dict(model, c=C[k], rhs=B[k]), {"backend": "CBC"})
+        if result["status"] != analysis["status"][k] or not same_objective(result["objective"], analysis["objective"][k]):
+            yield f"sample {k}: {analysis['status'][k]} {analysis['objective'][k]:.10g} vs CBC {result['status']} {result['objective']}"
+
+
+CHECKS = {
+    "backends": check_backends,
+    "presolve": check_presolve,
+    "formats": check_formats,
+    "conflicts": check_conflicts,
+    "parametric": check_parametric,
+    "cache": check_cache,
+    "scheduler": check_scheduler,
+    "geometry": check_geometry,
+    "robustness": check_robustness,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", nargs="+", choices=list(CHECKS), default=list(CHECKS))
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    args = parser.parse_args()
+
+    failures = 0
+    for name in args.checks:
+        start = time.perf_counter()
+        found = list(CHECKS[name](args.preset))
+        failures += len(found)
+        print(f"{'FAIL' if found else 'ok':>4} {name:<12} {time.perf_counter() - start:>7.2f}s")
+        for failure in found:
+            print(f"       {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
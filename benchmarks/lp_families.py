@@ -0,0 +1,109 @@
+"""Reproducible LP families for the benchmark suite.
+
+Every generator returns the arguments ``engine.solve_lp`` takes (``num_vars, obj_coeffs,
+constraints, problem_type``), with constraints as (name, coeffs, sense, rhs) tuples like the
+app builds. All instances are feasible and bounded, and the same seed always gives the same
+instance.
+"""
+import numpy as np
+
+
+def _constraints(A, senses, rhs, prefix="c"):
+    return [(f"{prefix}{j + 1}", row.tolist(), sense, float(b)) for j, (row, sense, b) in enumerate(zip(A, senses, rhs))]
+
+
+def random_dense(rows, cols, seed=0):
+    # Nonnegative A with a positive entry in every column and positive b: the origin is feasible
+    # and a positive maximization objective is bounded
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(0.1, 1.0, (rows, cols))
+    return cols, rng.uniform(1, 10, cols).tolist(), _constraints(A, ["<="] * rows, rng.uniform(10, 100, rows)), "Maximize"
+
+
+def random_sparse(rows, cols, density=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(0.1, 1.0, (rows, cols)) * (rng.random((rows, cols)) < density)
+    A[rng.integers(0, rows, cols), np.arange(cols)] += 1.0
+    return cols, rng.uniform(1, 10, cols).tolist(), _constraints(A, ["<="] * rows, rng.uniform(10, 100, rows)), "Maximize"
+
+
+def transportation(sources, sinks, seed=0):
+    # Ship from sources (supply <=) to sinks (demand >=) at minimum cost; supply covers demand
+    rng = np.random.default_rng(seed)
+    demand = rng.uniform(10, 50, sinks)
+    supply = rng.dirichlet(np.ones(sources)) * demand.sum() * 1.2 + 1.0
+    num_vars = sources * sinks
+    A_supply = np.kron(np.eye(sources), np.ones(sinks))
+    A_demand = np.kron(np.ones(sources), np.eye(sinks))
+    constraints = (_constraints(A_supply, ["<="] * sources, supply, "supply")
+                   + _constraints(A_demand, [">="] * sinks, demand, "demand"))
+    return num_vars, rng.uniform(1, 20, num_vars).tolist(), constraints, "Minimize"
+
+
+def diet(foods, nutrients, seed=0):
+    # Cheapest diet meeting minimum nutrient levels, with a cap on every food
+    rng = np.random.default_rng(seed)
+    content = rng.uniform(0, 10, (nutrients, foods))
+    requirement = content.sum(axis=1) * rng.uniform(0.5, 2.0, nutrients)
+    A = np.vstack([content, np.eye(foods)])
+    senses = [">="] * nutrients + ["<="] * foods
+    rhs = np.r_[requirement, np.full(foods, 10.0)]
+    return foods, rng.uniform(1, 5, foods).tolist(), _constraints(A, senses, rhs, "n"), "Minimize"
+
+
+def degenerate(rows, cols, seed=0):
+    # Every constraint passes through x = 1, so the optimal vertex is heavily degenerate
+    rng = np.random.default_rng(seed)
+    A = rng.integers(0, 4, (rows, cols)).astype(np.float64)
+    A[np.arange(rows), rng.integers(0, cols, rows)] += 1.0
+    A[rng.integers(0, rows, cols), np.arange(cols)] += 1.0
+    return cols, rng.uniform(1, 10, cols).tolist(), _constraints(A, ["<="] * rows, A.sum(axis=1)), "Maximize"
+
+
+def redundant(rows, cols, seed=0):
+    # A sparse model padded the way generated models often are: scaled copies of rows, single-variable
+    # caps and fixings, loose rows that never bind, and coefficients spread over many magnitudes
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(0.1, 1.0, (rows, cols)) * (rng.random((rows, cols)) < 0.05)
+    A[rng.integers(0, rows, cols), np.arange(cols)] += 1.0
+    rhs = rng.uniform(10, 100, rows)
+    scale = 10.0 ** rng.integers(-3, 4, rows)
+    copies = rng.integers(0, rows, rows // 4)
+    factors = rng.uniform(0.5, 5.0, len(copies))
+    caps, fixed = np.arange(0, cols, 7), np.arange(3, cols, 11)
+    A = np.vstack([A * scale[:, None], A[copies] * factors[:, None], np.eye(cols)[caps], np.eye(cols)[fixed],
+                   np.ones((rows // 10, cols))])
+    senses = ["<="] * (rows + len(copies) + len(caps)) + ["="] * len(fixed) + ["<="] * (rows // 10)
+    b = np.r_[rhs * scale, rhs[copies] * factors * rng.uniform(1.0, 1.5, len(copies)), rng.uniform(1, 5, len(caps)),
+              rng.uniform(0, 2, len(fixed)), np.full(rows // 10, 1e3 * cols)]
+    return cols, rng.uniform(1, 10, cols).tolist(), _constraints(A, senses, b), "Maximize"
+
+
+FAMILIES = {
+    "random_dense": random_dense,
+    "random_sparse": random_sparse,
+    "transportation": transportation,
+    "diet": diet,
+    "degenerate": degenerate,
+    "redundant": redundant,
+}
+
+# Size arguments per family; the 2- and 3-column instances also exercise the plots
+PRESETS = {
+    "quick": {
+        "random_dense": [(20, 2), (20, 3), (50, 50)],
+        "random_sparse": [(100, 100)],
+        "transportation": [(5, 10)],
+        "diet": [(30, 10)],
+        "degenerate": [(40, 20)],
+        "redundant": [(100, 100)],
+    },
+    "full": {
+        "random_dense": [(200, 2), (200, 3), (100, 100), (300, 300)],
+        "random_sparse": [(300, 300), (1000, 1000)],
+        "transportation": [(10, 20), (30, 40)],
+        "diet": [(100, 20), (400, 40)],
+        "degenerate": [(100, 50), (300, 150)],
+        "redundant": [(300, 300), (1000, 1000)],
+    },
+}
@@ -0,0 +1,6 @@
+"""Modeling and solving core used by the LP Solver 3D++ Streamlit app.
+
+The package never imports Streamlit or Plotly, so it also serves scripts and batch jobs
+(see ``lpsolver.engine``) and the command line (``python -m lpsolver model.csv``).
+"""
+from lpsolver.model import make_model, model_from_constraints, build_pulp_problem
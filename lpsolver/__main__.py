@@ -0,0 +1,5 @@
+import sys
+
+from lpsolver.cli import main
+
+sys.exit(main())
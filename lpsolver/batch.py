@@ -0,0 +1,188 @@
+"""Batch scenario solving over a process pool.
+
+A scenario table has one row per scenario. Columns named ``c:<variable>`` override objective
+coefficients and columns named ``rhs:<constraint>`` override right-hand sides; bare variable or
+constraint names work too when they are unambiguous. Empty cells keep the base value, and an
+optional ``scenario`` column names the rows.
+
+The base constraint matrix is copied once into shared memory and every worker maps it in its
+initializer, so a task only carries its scenarios' objective and RHS vectors.
+"""
+import copy
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from lpsolver.model import integer_mask
+
+# Arrays every scenario shares; c and rhs are sent per task
+SHARED_ARRAYS = ("A_data", "A_indices", "A_indptr", "senses", "lb", "ub", "integer")
+SCENARIO_COLUMN = "scenario"
+
+_worker_base = None
+_worker_memory = None
+_worker_warm_start = None
+_worker_seed = None
+
+
+# ---------- Scenario Tables ---------- #
+def resolve_parameters(model, labels):
+    """(kind, index) for each label: ``("c", i)`` for an objective coefficient, ``("rhs", j)`` for a right-hand side."""
+    var_index = {name: i for i, name in enumerate(model["var_names"])}
+    con_index = {name: j for j, name in enumerate(model["con_names"])}
+    targets = []
+    for label in labels:
+        label = str(label).strip()
+        if label.startswith("c:") and label[2:].strip() in var_index:
+            targets.append(("c", var_index[label[2:].strip()]))
+        elif label.startswith("rhs:") and label[4:].strip() in con_index:
+            targets.append(("rhs", con_index[label[4:].strip()]))
+        elif label in var_index and label not in con_index:
+            targets.append(("c", var_index[label]))
+        elif label in con_index and label not in var_index:
+            targets.append(("rhs", con_index[label]))
+        else:
+            raise ValueError(f"Scenario column '{label}' matches no variable ('c:<name>') "
+                             f"or constraint ('rhs:<name>') unambiguously")
+    return targets
+
+
+def scenario_arrays(model, table):
+    """Returns (names, C, B): scenario names and full objective / RHS matrices."""
+    num_scenarios = len(table)
+    C = np.tile(model["c"], (num_scenarios, 1))
+    B = np.tile(model["rhs"], (num_scenarios, 1))
+
+    columns = [column for column in table.columns if str(column).strip().lower() != SCENARIO_COLUMN]
+    for column, (kind, index) in zip(columns, resolve_parameters(model, columns)):
+        target = C if kind == "c" else B
+        values = table[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        override = ~np.isnan(values)
+        target[override, index] = values[override]
+
+    scenario_col = next((col for col in table.columns if str(col).strip().lower() == SCENARIO_COLUMN), None)
+    names = (table[scenario_col].astype(str).tolist() if scenario_col is not None
+             else [f"Scenario_{k + 1}" for k in range(num_scenarios)])
+    return names, C, B
+
+
+# ---------- Shared Memory ---------- #
+def _share_base(model):
+    arrays = {key: np.ascontiguousarray(integer_mask(model) if key == "integer" else model[key])
+              for key in SHARED_ARRAYS}
+    layout, offset = {}, 0
+    for key, array in arrays.items():
+        layout[key] = (array.dtype.str, array.shape, offset)
+        offset += array.nbytes
+    memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for key, array in arrays.items():
+        dtype, shape, start = layout[key]
+        np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=start)[...] = array
+    return memory, layout
+
+
+def _init_worker(memory_name, layout, base, seed=None):
+    global _worker_base, _worker_memory, _worker_warm_start, _worker_seed
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_base = dict(base)
+    for key, (dtype, shape, start) in layout.items():
+        array = np.ndarray(shape, dtype=dtype, buffer=_worker_memory.buf, offset=start)
+        array.flags.writeable = False
+        _worker_base[key] = array
+    _worker_warm_start = None
+    _worker_seed = seed
+
+
+def _solve_chunk(indices, C, B, options):
+    from lpsolver.solve import run_solve
+    from lpsolver.warmstart import WarmStartSession
+
+    global _worker_warm_start
+    backend = options.get("backend", "CBC")
+    # Simplex workers carry their basis from one scenario to the next
+    if backend == "NumPy Simplex" and _worker_warm_start is None:
+        _worker_warm_start = WarmStartSession()
+
+    rows = []
+    for index, c, rhs in zip(indices, C, B):
+        model = dict(_worker_base, c=c, rhs=rhs)
+        # A seed session starts every scenario from the same basis instead of the previous scenario's
+        warm_start = copy.copy(_worker_seed) if _worker_seed is not None else _worker_warm_start
+        start = time.perf_counter()
+        result = run_solve(model, options, warm_start)
+        result["wall_time"] = time.perf_counter() - start
+        result["worker"] = os.getpid()
+        rows.append((index, result))
+    return rows
+
+
+# ---------- Batch Driver ---------- #
+def solve_scenarios(model, table, options=None, max_workers=None, chunk_size=None):
+    """Solves every scenario in ``table`` and yields (index, name, result) as chunks finish."""
+    names, C, B = scenario_arrays(model, table)
+    for index, result in solve_arrays(model, C, B, options, max_workers, chunk_size):
+        yield index, names[index], result
+
+
+def solve_arrays(model, C, B, options=None, max_workers=None, chunk_size=None, seed=None):
+    """Solves ``model`` with each row of ``C`` / ``B`` as its objective / RHS and yields (index, result)
+    as chunks finish. ``seed``, a WarmStartSession, warm starts every NumPy Simplex solve from its basis."""
+    options = dict(options or {})
+    num_scenarios = len(C)
+    if not num_scenarios:
+        return
+    max_workers = max_workers or os.cpu_count() or 1
+    # A few chunks per worker balances load without paying per-scenario IPC
+    chunk_size = chunk_size or max(1, math.ceil(num_scenarios / (max_workers * 4)))
+
+    base = {key: model[key] for key in ("sense", "var_names", "con_names")}
+    memory, layout = _share_base(model)
+    try:
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context("spawn"),
+                                   initializer=_init_worker, initargs=(memory.name, layout, base, seed))
+        futures = []
+        try:
+            futures = [
+                pool.submit(_solve_chunk, list(range(start, min(start + chunk_size, num_scenarios))),
+                            C[start:start + chunk_size], B[start:start + chunk_size], options)
+                for start in range(0, num_scenarios, chunk_size)
+            ]
+            for future in as_completed(futures):
+                yield from future.result()
+        except BaseException:
+            # Closed early (the caller stopped reading, or a chunk failed): drop the chunks not yet
+            # started instead of solving them all before returning
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def scenario_record(name, result, var_names):
+    record = {
+        "Scenario": name,
+        "Status": result["status"],
+        "Objective": result["objective"],
+        "Solve Time (s)": result["solve_time"],
+        "Wall Time (s)": result["wall_time"],
+        "Worker": result["worker"],
+    }
+    record.update(zip(var_names, result["x"].tolist()))
+    return record
+
+
+def solve_scenarios_frame(model, table, options=None, max_workers=None, chunk_size=None):
+    import pandas as pd
+
+    records = {}
+    for index, name, result in solve_scenarios(model, table, options, max_workers, chunk_size):
+        records[index] = scenario_record(name, result, model["var_names"])
+    return pd.DataFrame([records[index] for index in sorted(records)])
@@ -0,0 +1,333 @@
+"""Content-addressed caches: solve results (in memory with an optional SQLite tier) and rendered figures."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from lpsolver.model import integer_mask
+
+# Every field that can change the solution; names and display labels are deliberately left out
+HASHED_ARRAYS = (
+    ("c", "<f8"),
+    ("A_data", "<f8"),
+    ("A_indices", "<i8"),
+    ("A_indptr", "<i8"),
+    ("senses", "<i1"),
+    ("rhs", "<f8"),
+    ("lb", "<f8"),
+    ("ub", "<f8"),
+)
+
+# Rough per-entry bookkeeping cost (dict, key string, OrderedDict node)
+ENTRY_OVERHEAD_BYTES = 512
+
+
+def problem_hash(model, options=None):
+    digest = hashlib.sha256()
+    digest.update(str(model["sense"]).encode())
+    for key, dtype in HASHED_ARRAYS:
+        array = np.ascontiguousarray(model[key], dtype=dtype)
+        if array.dtype.kind == "f":
+            array = array + 0.0  # -0.0 and 0.0 hash the same
+        digest.update(key.encode())
+        digest.update(len(array).to_bytes(8, "little"))
+        digest.update(array.tobytes())
+    # Integrality only enters the hash when some variable has it, so pure LPs keep their keys
+    integer = integer_mask(model)
+    if integer.any():
+        digest.update(b"integer")
+        digest.update(np.packbits(integer).tobytes())
+    digest.update(json.dumps(options or {}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def result_nbytes(result):
+    return ENTRY_OVERHEAD_BYTES + sum(value.nbytes for value in result.values() if isinstance(value, np.ndarray))
+
+
+def freeze_result(result):
+    # Cached arrays are shared between callers, so make accidental in-place edits fail loudly
+    frozen = dict(result)
+    for key, value in frozen.items():
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+            value.flags.writeable = False
+            frozen[key] = value
+    return frozen
+
+
+# ---------- Binary Packing ---------- #
+def pack_result(result):
+    # Arrays are stored as raw little-endian bytes next to a JSON header; nothing is pickled
+    meta, arrays, chunks, offset = {}, {}, [], 0
+    for key, value in result.items():
+        if isinstance(value, np.ndarray):
+            array = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+            arrays[key] = [array.dtype.str, list(array.shape), offset, array.nbytes]
+            chunks.append(array.tobytes())
+            offset += array.nbytes
+        else:
+            meta[key] = value
+    meta["__arrays__"] = arrays
+    return json.dumps(meta, default=float), b"".join(chunks)
+
+
+def unpack_result(meta, blob):
+    result = json.loads(meta)
+    for key, (dtype, shape, offset, nbytes) in result.pop("__arrays__").items():
+        result[key] = np.frombuffer(blob, dtype=dtype, count=nbytes // np.dtype(dtype).itemsize,
+                                    offset=offset).reshape(shape).copy()
+    return result
+
+
+# ---------- Persistent Tier ---------- #
+class DiskSolveCache:
+    """SQLite result store shared by every server process, evicted by total size and age."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY,
+            meta TEXT NOT NULL,
+            arrays BLOB NOT NULL,
+            nbytes INTEGER NOT NULL,
+            created REAL NOT NULL,
+            accessed REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+    """
+
+    def __init__(self, path, max_bytes=1024 ** 3, max_age=30 * 24 * 3600, timeout=30.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connection(self):
+        # sqlite3 connections cannot cross threads, so each thread keeps its own
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connection()
+        row = conn.execute("SELECT meta, arrays, created FROM results WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None or now - row[2] > self.max_age:
+            self.misses += 1
+            return None
+        try:
+            conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.OperationalError:
+            pass  # another process holds the write lock; recency is best effort
+        self.hits += 1
+        return unpack_result(row[0], row[1])
+
+    def put(self, key, result):
+        meta, blob = pack_result(result)
+        nbytes = len(meta) + len(blob)
+        if nbytes > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                         (key, meta, blob, nbytes, now, now))
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn, now):
+        evicted = conn.execute("DELETE FROM results WHERE created < ?", (now - self.max_age,)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM results").fetchone()[0]
+        if total > self.max_bytes:
+            # Drop least recently used rows until the store fits its budget again
+            excess = total - self.max_bytes
+            victims, freed = [], 0
+            for key, nbytes in conn.execute("SELECT key, nbytes FROM results ORDER BY accessed"):
+                victims.append((key,))
+                freed += nbytes
+                if freed >= excess:
+                    break
+            conn.executemany("DELETE FROM results WHERE key = ?", victims)
+            evicted += len(victims)
+        self.evictions += evicted
+
+    def clear(self):
+        self._connection().execute("DELETE FROM results")
+
+    def stats(self):
+        entries, nbytes = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM results").fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# ---------- In-Memory Tier ---------- #
+class SolveCache:
+    """Thread-safe LRU mapping of problem hash -> solve result, bounded by memory.
+
+    With a ``disk`` tier, memory misses fall through to it and every new result is written
+    to both, so warm restarts and sibling server processes reuse earlier solves.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 ** 2, disk=None):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        if self.disk is not None:
+            try:
+                result = self.disk.get(key)
+            except sqlite3.Error:
+                result = None  # an unreadable store degrades to a plain miss
+            if result is not None:
+                return self._store(key, result)
+        return None
+
+    def put(self, key, result):
+        self._store(key, result)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, result)
+            except sqlite3.Error:
+                pass  # the solve already succeeded; losing the persistent copy is harmless
+
+    def _store(self, key, result):
+        result = freeze_result(result)
+        size = result_nbytes(result)
+        if size > self.max_bytes:
+            return result
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (result, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+class FigureCache:
+    """Thread-safe LRU of rendered figures keyed by problem hash, bounded by payload size.
+
+    Entries are whatever the caller builds (the app stores Plotly figures with their display
+    notes) together with the byte size of the serialized figure, which is what the browser
+    receives on every rerun.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns (figure, nbytes) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, figure, nbytes):
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if nbytes <= self.max_bytes:
+                self._entries[key] = (figure, nbytes)
+                self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+        return figure, nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,128 @@
+"""Command-line solver: ``python -m lpsolver model.mps [-o solution.json]``.
+
+Reads a CSV, Parquet, .npz, MPS or CPLEX LP model, solves it and writes the status, objective
+and variable values as JSON (default) or CSV. Solver logs go to stderr so stdout stays
+machine-readable.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from lpsolver.cache import DiskSolveCache, SolveCache
+from lpsolver.ingest import load_model, save_model
+from lpsolver.sensitivity import has_sensitivity, sensitivity_tables
+from lpsolver.solve import BACKENDS, DEFAULT_PRESET, MIP_OPTIONS, solve_model
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m lpsolver", description=__doc__.splitlines()[0])
+    parser.add_argument("model", help="model file (.csv, .parquet, .npz, .mps or .lp, optionally .gz)")
+    parser.add_argument("-o", "--output", help="write results here instead of stdout (.json or .csv)")
+    parser.add_argument("--format", choices=("json", "csv"),
+                        help="output format (default: from the output extension, else json)")
+    parser.add_argument("--sense", choices=("Maximize", "Minimize"),
+                        help="override the objective sense (tabular files default to Maximize, MPS to Minimize)")
+    parser.add_argument("--save-model", metavar="PATH",
+                        help="also write the parsed model (.mps, .lp or .npz), e.g. to convert between formats")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="CBC")
+    parser.add_argument("--preset", default=DEFAULT_PRESET,
+                        help="the backend's algorithm preset, e.g. 'Dual Simplex' or 'Barrier' for CBC")
+    parser.add_argument("--sensitivity", action="store_true",
+                        help="also report shadow prices, reduced costs and ranging (JSON output only)")
+    parser.add_argument("--time-limit", type=float, metavar="SECONDS",
+                        help="stop the solver after this long and report the best point it has")
+    parser.add_argument("--presolve", action="store_true",
+                        help="reduce and scale the model before solving (the JSON output reports the reductions)")
+    parser.add_argument("--no-scaling", action="store_true", help="with --presolve, leave the coefficients unscaled")
+    parser.add_argument("--diagnose", action="store_true",
+                        help="report a minimal set of conflicting constraints when the model is infeasible, or an "
+                             "improving ray when it is unbounded (JSON output only)")
+    mip = parser.add_argument_group("MIP controls", "branch-and-bound settings for models with integer variables")
+    mip.add_argument("--threads", type=int, help="parallel branch-and-bound threads")
+    mip.add_argument("--gap-rel", type=float, metavar="FRACTION", help="stop within this relative gap, e.g. 0.01")
+    mip.add_argument("--gap-abs", type=float, help="stop within this absolute gap")
+    mip.add_argument("--max-nodes", type=int, help="stop after exploring this many nodes")
+    parser.add_argument("--cache-db", default=os.environ.get("LP_SOLVER_CACHE_DB"),
+                        help="SQLite result cache shared with the app (default: $LP_SOLVER_CACHE_DB)")
+    return parser.parse_args(argv)
+
+
+def write_json(stream, model, result):
+    payload = {
+        "status": result["status"],
+        "objective": result["objective"],
+        "solver": result["solver"],
+        "solve_time": result["solve_time"],
+        "cached": result["cached"],
+        "variables": dict(zip(model["var_names"], result["x"].tolist())),
+    }
+    for key in ("bound", "gap", "nodes", "conflict"):
+        if key in result:
+            payload[key] = result[key]
+    if "presolve" in result:
+        payload["presolve"] = {key: value for key, value in result["presolve"].items() if key != "options"}
+    if "ray" in result:
+        payload["ray"] = {"direction": dict(zip(model["var_names"], result["ray"]["direction"])),
+                          "rate": result["ray"]["rate"]}
+    if has_sensitivity(result):
+        payload["sensitivity"] = dict(zip(("variables", "constraints"), sensitivity_tables(model, result)))
+    json.dump(payload, stream, indent=2, allow_nan=True)
+    stream.write("\n")
+
+
+def write_csv(stream, model, result):
+    writer = csv.writer(stream)
+    writer.writerow(["Variable", "Value"])
+    writer.writerows(zip(model["var_names"], result["x"].tolist()))
+    writer.writerow(["Objective Value", result["objective"]])
+
+
+WRITERS = {"json": write_json, "csv": write_csv}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fmt = args.format or ("csv" if args.output and args.output.lower().endswith(".csv") else "json")
+    cache = SolveCache(disk=DiskSolveCache(args.cache_db)) if args.cache_db else None
+
+    # Anything a solver prints on the inherited stdout goes to stderr, keeping stdout for the results
+    sys.stdout.flush()
+    saved = os.dup(1)
+    os.dup2(2, 1)
+    try:
+        model = load_model(args.model, sense=args.sense)
+        if args.save_model:
+            save_model(model, args.save_model)
+        options = {"backend": args.backend, "sensitivity": args.sensitivity}
+        if args.diagnose:
+            options["diagnose"] = True
+        if args.preset != DEFAULT_PRESET:
+            options["preset"] = args.preset
+        if args.presolve:
+            options["presolve"] = True
+            if args.no_scaling:
+                options["scale"] = False
+        for key in ("time_limit", *MIP_OPTIONS):
+            if getattr(args, key) is not None:
+                options[key] = getattr(args, key)
+        result = solve_model(model, options, cache=cache)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        os.dup2(saved, 1)
+        os.close(saved)
+
+    if args.output:
+        with open(args.output, "w", newline="") as stream:
+            WRITERS[fmt](stream, model, result)
+    else:
+        WRITERS[fmt](sys.stdout, model, result)
+    # Scripts can branch on the exit code: 0 optimal, 1 anything else
+    return 0 if result["status"] == "Optimal" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
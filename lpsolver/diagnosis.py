@@ -0,0 +1,223 @@
+"""Diagnosis of models without an optimal solution.
+
+An infeasible model gets a conflict: a set of its constraints that cannot hold together within
+the variable bounds, and that is irreducible (an IIS) - dropping any one of them leaves the rest
+feasible. An unbounded model gets a ray: a direction along which every constraint stays
+satisfied and the objective improves without limit.
+
+Conflicts are found by QuickXplain's bisection over the constraints, which takes about
+k·log(m/k) feasibility checks for k conflicting rows out of m rather than one check per row.
+For LPs a check re-solves one zero-objective simplex, warm started from the previous check's
+basis, with the rows left out made free; the first check's Farkas certificate narrows the
+candidates before the bisection starts. Large models and MIPs check subsets with a backend.
+"""
+import time
+
+import numpy as np
+
+from lpsolver.model import integer_mask, is_mip, model_shape, select_rows
+from lpsolver.simplex import AT_LOWER, AT_UPPER, AT_ZERO, BASIC, INFEASIBLE, OPTIMAL, SimplexSolver
+
+# Largest dense simplex tableau (rows x (columns + rows)) the warm-started checks build
+SIMPLEX_MAX_CELLS = 4_000_000
+# Default time budget of one diagnosis; a conflict cut short is infeasible but may not be minimal
+DIAGNOSIS_TIME_S = 30.0
+CERTIFICATE_TOLERANCE = 1e-9
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+# ---------- Feasibility Checks ---------- #
+class _SimplexChecks:
+    """Feasibility of subsets of an LP's rows. Rows outside the subset get a free slack, so every
+    check has the same columns and starts from the last basis."""
+
+    def __init__(self, model, deadline):
+        self.model = dict(model, c=np.zeros(len(model["c"])), integer=None)
+        self.deadline = deadline
+        self.state = None
+        self.solves = 0
+
+    def infeasible(self, rows):
+        """None when ``rows`` hold together, else the ones the infeasibility proof uses."""
+        if time.perf_counter() > self.deadline:
+            raise _OutOfTime
+        self.solves += 1
+        solver = SimplexSolver(self.model)
+        n, m = solver.n, solver.m
+        enabled = np.zeros(m, dtype=bool)
+        enabled[rows] = True
+        solver.lower[n:] = np.where(enabled, solver.lower[n:], -np.inf)
+        solver.upper[n:] = np.where(enabled, solver.upper[n:], np.inf)
+        status = solver.solve() if self.state is None else solver.warm_solve(self._restate(solver))
+        if status not in (OPTIMAL, INFEASIBLE):
+            status = solver.solve()
+        if solver.basis_state() is not None:
+            self.state = solver.basis_state()
+        if status != INFEASIBLE:
+            return None
+        y = np.abs(solver.infeasibility_certificate())
+        return np.flatnonzero(enabled & (y > CERTIFICATE_TOLERANCE * max(1.0, y.max(initial=0.0))))
+
+    def _restate(self, solver):
+        # Slack bounds are 0 or infinite, so only the side a nonbasic slack sits on can change
+        status = self.state["status"].copy()
+        slacks = status[solver.n:]
+        lower, upper = solver.lower[solver.n:], solver.upper[solver.n:]
+        side = np.where(np.isfinite(lower), AT_LOWER, np.where(np.isfinite(upper), AT_UPPER, AT_ZERO))
+        slacks[slacks != BASIC] = side[slacks != BASIC]
+        return {"basis": self.state["basis"], "status": status}
+
+
+class _BackendChecks:
+    """Feasibility of row subsets solved from scratch by a backend; needed for MIPs and for models
+    too large for the dense simplex."""
+
+    def __init__(self, model, options, deadline):
+        from lpsolver.solve import LP_ONLY_BACKENDS
+
+        self.model = dict(model, c=np.zeros(len(model["c"])))
+        backend = options.get("backend", "CBC")
+        self.options = {"backend": "CBC" if backend in LP_ONLY_BACKENDS else backend}
+        if backend not in LP_ONLY_BACKENDS and options.get("preset"):
+            self.options["preset"] = options["preset"]
+        if options.get("threads"):
+            self.options["threads"] = options["threads"]
+        self.deadline = deadline
+        self.solves = 0
+
+    def infeasible(self, rows):
+        from lpsolver.solve import run_solve
+
+        remaining = self.deadline - time.perf_counter()
+        if remaining <= 0:
+            raise _OutOfTime
+        self.solves += 1
+        # A check stopped at the time limit counts as feasible, which keeps its rows in the conflict
+        result = run_solve(select_rows(self.model, rows), dict(self.options, time_limit=remaining))
+        return np.asarray(rows) if result["status"] == "Infeasible" else None
+
+
+def _fits_simplex(model):
+    rows, cols = model_shape(model)
+    return rows * (rows + cols) <= SIMPLEX_MAX_CELLS
+
+
+def _checks(model, options, deadline):
+    if _fits_simplex(model) and not is_mip(model):
+        return _SimplexChecks(model, deadline)
+    return _BackendChecks(model, options, deadline)
+
+
+# ---------- Conflicts ---------- #
+def _quickxplain(checks, candidates):
+    # Junker's QuickXplain: the smallest part of ``candidates`` that conflicts together with
+    # ``background`` (which holds on its own); ``added`` says whether background grew since the last check
+    def explain(background, added, candidates):
+        if added and checks.infeasible(background) is not None:
+            return []
+        if len(candidates) == 1:
+            return candidates
+        half = len(candidates) // 2
+        first, second = candidates[:half], candidates[half:]
+        second_part = explain(background + first, True, second)
+        first_part = explain(background + second_part, bool(second_part), first)
+        return first_part + second_part
+
+    return explain([], False, candidates)
+
+
+def find_conflict(model, options=None, time_limit=DIAGNOSIS_TIME_S):
+    """An irreducible set of conflicting constraints of an infeasible ``model``.
+
+    Returns ``rows`` and ``names`` of the conflicting constraints, ``bounds`` (variables whose
+    own bounds cross, which conflict without any row), ``minimal`` (False when the time limit
+    cut the search short), ``relaxation`` (True when a MIP's LP relaxation already conflicts),
+    ``checks`` (feasibility solves) and ``seconds``. None when the rows are found to hold together.
+    """
+    start = time.perf_counter()
+    options = options or {}
+    deadline = start + time_limit
+    lb, ub = np.asarray(model["lb"]), np.asarray(model["ub"])
+    integer = integer_mask(model)
+    crossed = (lb > ub) | (integer & (np.ceil(lb - 1e-9) > np.floor(ub + 1e-9)))
+    conflict = {"rows": [], "names": [], "bounds": [model["var_names"][j] for j in np.flatnonzero(crossed)],
+                "minimal": True, "relaxation": False, "checks": 0}
+    if crossed.any():
+        return dict(conflict, seconds=time.perf_counter() - start)
+
+    rows = np.arange(model_shape(model)[0])
+    checks = relaxed = _checks(model, options, deadline)
+    try:
+        certificate = None
+        if is_mip(model) and _fits_simplex(model):
+            # A conflict in the LP relaxation is one of the MIP too, and far cheaper to isolate
+            relaxed = _SimplexChecks(model, deadline)
+            certificate = relaxed.infeasible(rows)
+            if certificate is not None:
+                checks, conflict["relaxation"] = relaxed, True
+        if certificate is None:
+            certificate = checks.infeasible(rows)
+            if certificate is None:
+                return None
+        # Every certificate that proves infeasible on its own is a smaller starting point
+        while 0 < len(certificate) < len(rows):
+            proven = checks.infeasible(certificate)
+            if proven is None:
+                break
+            rows, certificate = certificate, proven
+        rows = _quickxplain(checks, rows.tolist())
+    except _OutOfTime:
+        conflict["minimal"] = False
+    rows = sorted(int(j) for j in rows)
+    solves = checks.solves + (relaxed.solves if relaxed is not checks else 0)
+    conflict.update(rows=rows, names=[model["con_names"][j] for j in rows], checks=solves)
+    return dict(conflict, seconds=time.perf_counter() - start)
+
+
+# ---------- Unbounded Rays ---------- #
+def unbounded_ray(model, options=None, time_limit=DIAGNOSIS_TIME_S):
+    """A direction showing ``model`` (or its LP relaxation) is unbounded.
+
+    ``direction`` keeps every constraint satisfied from any feasible point (A·d is within each
+    row's sense of zero, and d only moves variables away from their finite bounds), and ``rate``
+    is the objective gain per unit step, scaled so the largest entry of ``direction`` is 1. None
+    when there is no such direction, i.e. the model is bounded or infeasible.
+    """
+    from lpsolver.solve import LP_ONLY_BACKENDS, run_solve
+
+    start = time.perf_counter()
+    options = options or {}
+    rows, cols = model_shape(model)
+    lb, ub = np.asarray(model["lb"]), np.asarray(model["ub"])
+    # The directions within a box keep A·d on the right side of zero and improve the objective
+    ray_model = dict(model, rhs=np.zeros(rows), lb=np.where(np.isfinite(lb), 0.0, -1.0),
+                     ub=np.where(np.isfinite(ub), 0.0, 1.0), integer=np.zeros(cols, dtype=bool))
+    backend = options.get("backend", "CBC")
+    if _fits_simplex(model):
+        backend = "NumPy Simplex"
+    elif backend in LP_ONLY_BACKENDS:
+        backend = "CBC"
+    result = run_solve(ray_model, {"backend": backend, "time_limit": time_limit})
+    if result["status"] != "Optimal":
+        return None
+    direction = np.asarray(result["x"])
+    rate = float(np.asarray(model["c"]) @ direction)
+    scale = np.abs(direction).max(initial=0.0)
+    improving = rate > 1e-9 if model["sense"] == "Maximize" else rate < -1e-9
+    if not improving or scale <= 0:
+        return None
+    return {"direction": (direction / scale).tolist(), "rate": float(rate / scale), "seconds": time.perf_counter() - start}
+
+
+def diagnose(model, result, options=None, time_limit=DIAGNOSIS_TIME_S):
+    """``conflict`` for an infeasible ``result``, ``ray`` for an unbounded one (empty when none is found)."""
+    if result["status"] == "Infeasible":
+        conflict = find_conflict(model, options, time_limit)
+        return {} if conflict is None else {"conflict": conflict}
+    if result["status"] == "Unbounded":
+        ray = unbounded_ray(model, options, time_limit)
+        return {} if ray is None else {"ray": ray}
+    return {}
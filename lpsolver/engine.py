@@ -0,0 +1,59 @@
+"""Headless entry points for scripts, batch jobs and tests.
+
+Everything here runs without Streamlit, Plotly or pandas; the app is a thin UI over these
+functions. Heavy optional pieces (PuLP, pandas for tabular import) are imported on first use.
+"""
+from lpsolver.ingest import load_model
+from lpsolver.model import model_from_constraints
+from lpsolver.parametric import parametric_sweep
+from lpsolver.robustness import robustness_analysis
+from lpsolver.solve import solve_model
+
+
+def solve_lp(num_vars, obj_coeffs, constraints, problem_type, backend="CBC", cache=None, warm_start=None):
+    """Solves constraints given as (name, coeffs, sense, rhs) tuples and returns the result dict."""
+    model = model_from_constraints(num_vars, obj_coeffs, constraints, problem_type)
+    return solve_model(model, {"backend": backend}, cache=cache, warm_start=warm_start)
+
+
+def sweep_lp(num_vars, obj_coeffs, constraints, problem_type, kind, name, low, high):
+    """Parametric sweep of one right-hand side (``kind="rhs"``) or objective coefficient
+    (``kind="objective"``) over [low, high]; returns the breakpoints of the optimal objective."""
+    model = model_from_constraints(num_vars, obj_coeffs, constraints, problem_type)
+    return parametric_sweep(model, kind, name, low, high)
+
+
+def robustness_lp(num_vars, obj_coeffs, constraints, problem_type, perturbations, num_samples=1_000,
+                  backend="CBC", seed=None, max_workers=None):
+    """Monte Carlo robustness analysis: ``perturbations`` maps ``c:<variable>`` / ``rhs:<constraint>``
+    labels to (distribution, relative spread); returns the robustness_analysis dict."""
+    model = model_from_constraints(num_vars, obj_coeffs, constraints, problem_type)
+    return robustness_analysis(model, perturbations, num_samples, {"backend": backend}, max_workers, seed)
+
+
+def solve_file(path, sense=None, backend="CBC", cache=None):
+    """Loads a CSV, Parquet, .npz, MPS or LP model file (MPS and LP optionally gzipped, e.g.
+    ``model.mps.gz``) and solves it; returns (model, result).
+
+    ``sense`` overrides the objective sense the file declares. Without a declared sense, MPS and
+    LP files default to minimization and tabular files to maximization.
+    """
+    model = load_model(path, sense=sense)
+    return model, solve_model(model, {"backend": backend}, cache=cache)
+
+
+def solution_values(result, var_names):
+    # Same layout as the app's CSV export: one entry per variable plus the objective
+    solution = dict(zip(var_names, result["x"].tolist()))
+    solution["Objective Value"] = result["objective"]
+    return solution
+
+
+def economic_summary(obj_coeffs, x):
+    total_cost = sum(obj_coeffs[i] * x[i] for i in range(len(obj_coeffs)))
+    total_units = sum(x[i] for i in range(len(x)))
+    return {
+        "total_cost": float(total_cost),
+        "total_units": float(total_units),
+        "avg_cost": float(total_cost / total_units) if total_units else 0.0,
+    }
@@ -0,0 +1,743 @@
+"""Streaming readers and writers for MPS (free and fixed format) and CPLEX LP files.
+
+Readers make one pass over the file, line by line, and collect coefficients into typed
+``array.array`` buffers indexed by integer row / column ids. Memory therefore grows by a few
+bytes per nonzero plus one dict entry per row and column name, never by a Python object per
+coefficient. Gzipped files are recognised from their magic bytes. Writers stream one column
+(MPS) or row (LP) at a time.
+
+The array model has no place for a few things these formats can express:
+
+* ranged rows are split into two rows, ``<name>`` and ``<name>_range``;
+* objective constants are dropped;
+* binaries become integer variables with [0, 1] bounds, and integer columns without bounds
+  keep [0, inf) (the MPS writer spells that bound out, as COIN and CPLEX read such columns
+  as binary);
+* quadratic sections, SOS and semi-continuous bounds are rejected with a ValueError.
+"""
+import array
+import gzip
+import io
+import os
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+
+from lpsolver.model import SENSE_SYMBOLS, integer_mask, make_model
+
+# Rows are grouped this many lines at a time before a write() call
+WRITE_BATCH = 10_000
+
+INF = float("inf")
+
+
+# ---------- Streams ---------- #
+@contextmanager
+def _open_text(source):
+    if isinstance(source, io.TextIOBase):
+        yield source
+        return
+    raw = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    if not hasattr(raw, "peek"):
+        raw = io.BufferedReader(raw)
+    if raw.peek(2)[:2] == b"\x1f\x8b":
+        raw = gzip.GzipFile(fileobj=raw)
+    text = io.TextIOWrapper(raw, encoding="latin-1")
+    try:
+        yield text
+    finally:
+        text.close()
+
+
+@contextmanager
+def _open_output(target):
+    if hasattr(target, "write"):
+        yield target
+        return
+    path = os.fspath(target)
+    stream = gzip.open(path, "wt", encoding="latin-1") if path.endswith(".gz") else open(path, "w", encoding="latin-1")
+    try:
+        yield stream
+    finally:
+        stream.close()
+
+
+def _number(value):
+    # Shortest text that round-trips the float exactly
+    if value == INF:
+        return "1e+30"
+    if value == -INF:
+        return "-1e+30"
+    return repr(float(value)).removesuffix(".0")
+
+
+# make_model accepts anything with .tocoo(); this hands it the buffers without a second sort
+class _CooMatrix(namedtuple("_CooMatrix", "row col data shape")):
+    def tocoo(self):
+        return self
+
+
+def _buffer_model(c, rows, cols, vals, senses, rhs, sense, var_names, con_names, lb, ub, integer):
+    A = _CooMatrix(np.frombuffer(rows, dtype=np.int64), np.frombuffer(cols, dtype=np.int64),
+                   np.frombuffer(vals, dtype=np.float64), (len(rhs), len(c)))
+    return make_model(np.frombuffer(c, dtype=np.float64), A, np.frombuffer(senses, dtype=np.int8),
+                      np.frombuffer(rhs, dtype=np.float64), sense, var_names=var_names,
+                      con_names=con_names, lb=np.frombuffer(lb, dtype=np.float64),
+                      ub=np.frombuffer(ub, dtype=np.float64), integer=np.frombuffer(integer, dtype=np.bool_))
+
+
+def _split_ranges(rows, cols, vals, senses, rhs, con_names, ranges):
+    """Turns each ranged row into the original row plus a copy bounding the other side."""
+    if not ranges:
+        return rows, cols, vals, senses, rhs
+    num_rows = len(rhs)
+    senses = np.frombuffer(senses, dtype=np.int8).copy()
+    rhs = np.frombuffer(rhs, dtype=np.float64).copy()
+    ranged = np.array(sorted(ranges), dtype=np.int64)
+    width = np.array([ranges[i] for i in ranged.tolist()])
+
+    extra_senses, extra_rhs = np.empty(len(ranged), np.int8), np.empty(len(ranged))
+    for k, (i, r) in enumerate(zip(ranged.tolist(), width.tolist())):
+        if senses[i] == -1 or (senses[i] == 0 and r < 0):
+            extra_senses[k], extra_rhs[k] = 1, rhs[i] - abs(r)
+            senses[i] = -1
+        else:
+            extra_senses[k], extra_rhs[k] = -1, rhs[i] + abs(r)
+            senses[i] = 1
+        con_names.append(f"{con_names[i]}_range")
+
+    rows, cols, vals = (np.frombuffer(buf, dtype=dtype) for buf, dtype in
+                        ((rows, np.int64), (cols, np.int64), (vals, np.float64)))
+    new_id = np.full(num_rows, -1, dtype=np.int64)
+    new_id[ranged] = num_rows + np.arange(len(ranged))
+    copied = new_id[rows] >= 0
+    return (np.concatenate([rows, new_id[rows[copied]]]), np.concatenate([cols, cols[copied]]),
+            np.concatenate([vals, vals[copied]]), np.concatenate([senses, extra_senses]),
+            np.concatenate([rhs, extra_rhs]))
+
+
+# ---------- MPS Reader ---------- #
+MPS_SECTIONS = {"NAME", "OBJSENSE", "OBJSENS", "OBJNAME", "ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS", "ENDATA"}
+MPS_UNSUPPORTED = {"QUADOBJ", "QMATRIX", "QSECTION", "QCMATRIX", "SOS", "INDICATORS", "CSECTION"}
+MPS_ROW_TYPES = {"L": -1, "E": 0, "G": 1}
+# Valid whitespace-split field counts per section; anything else is reparsed by column position
+MPS_FIELD_COUNTS = {"ROWS": (2,), "COLUMNS": (3, 5), "RHS": (2, 3, 4, 5), "RANGES": (2, 3, 4, 5), "BOUNDS": (2, 3, 4)}
+OBJECTIVE_ROW, FREE_ROW = -1, -2
+
+
+def _fixed_fields(line):
+    # Fixed MPS columns 2-3, 5-12, 15-22, 25-36, 40-47 and 50-61; names may contain spaces
+    fields = (line[1:3], line[4:12], line[14:22], line[24:36], line[39:47], line[49:61])
+    return [field.strip() for field in fields if field.strip()]
+
+
+def read_mps_model(source, sense=None, fixed=None):
+    """Reads a free or fixed format MPS file. ``fixed=None`` switches to fixed columns at the
+    first line whose whitespace-split field count does not fit its section.
+
+    The objective sense comes from an OBJSENSE section (default Minimize) unless ``sense``
+    is given.
+    """
+    file_sense, objective_name = None, None
+    row_index, con_names = {}, []
+    senses, rhs = array.array("b"), array.array("d")
+    col_index, c, lb, ub = {}, array.array("d"), array.array("d"), array.array("d")
+    integer = array.array("b")
+    rows, cols, vals = array.array("q"), array.array("q"), array.array("d")
+    ranges = {}
+    section, last_col, j, has_objective, in_integers = None, None, -1, False, False
+
+    with _open_text(source) as stream:
+        for number, line in enumerate(stream, 1):
+            if not line.strip() or line[0] in "*$":
+                continue
+            if not line[0].isspace():
+                keyword, rest = (line.split(None, 1) + [""])[:2]
+                keyword = keyword.upper()
+                if keyword in MPS_UNSUPPORTED:
+                    raise ValueError(f"MPS section {keyword} (line {number}) is not supported")
+                if keyword not in MPS_SECTIONS:
+                    # Free MPS data lines may start in column 1
+                    if section is None:
+                        raise ValueError(f"Unknown MPS section '{keyword}' on line {number}")
+                else:
+                    section = keyword
+                    if section in ("OBJSENSE", "OBJSENS") and rest.strip():
+                        file_sense = rest.strip().upper()
+                    elif section == "OBJNAME" and rest.strip():
+                        objective_name = rest.strip()
+                    elif section == "ENDATA":
+                        break
+                    continue
+
+            tokens = _fixed_fields(line) if fixed else line.split()
+            if fixed is None and section in MPS_FIELD_COUNTS and len(tokens) not in MPS_FIELD_COUNTS[section]:
+                # Names with spaces: the rest of the file is read by column position
+                fixed = True
+                tokens = _fixed_fields(line)
+
+            try:
+                if section == "COLUMNS":
+                    if len(tokens) == 3 and tokens[1].strip("'\"").upper() == "MARKER":
+                        # Columns between 'INTORG' and 'INTEND' markers are integer
+                        in_integers = tokens[2].strip("'\"").upper() == "INTORG"
+                        continue
+                    if tokens[0] != last_col:
+                        last_col = tokens[0]
+                        j = col_index.get(last_col)
+                        if j is None:
+                            j = col_index[last_col] = len(c)
+                            c.append(0.0)
+                            lb.append(0.0)
+                            ub.append(INF)
+                            integer.append(in_integers)
+                    for k in range(1, len(tokens) - 1, 2):
+                        i = row_index[tokens[k]]
+                        if i >= 0:
+                            rows.append(i)
+                            cols.append(j)
+                            vals.append(float(tokens[k + 1]))
+                        elif i == OBJECTIVE_ROW:
+                            c[j] += float(tokens[k + 1])
+                elif section == "ROWS":
+                    row_type, name = tokens[0].upper(), tokens[1]
+                    if row_type == "N":
+                        # The first N row (or the one OBJNAME picks) is the objective; others are ignored
+                        is_objective = name == objective_name if objective_name else not has_objective
+                        row_index[name] = OBJECTIVE_ROW if is_objective else FREE_ROW
+                        has_objective = has_objective or is_objective
+                    else:
+                        row_index[name] = len(rhs)
+                        con_names.append(name)
+                        senses.append(MPS_ROW_TYPES[row_type])
+                        rhs.append(0.0)
+                elif section in ("RHS", "RANGES"):
+                    # An odd field count means the leading field is the (ignored) set name
+                    for k in range(len(tokens) % 2, len(tokens) - 1, 2):
+                        i = row_index[tokens[k]]
+                        if i < 0:
+                            continue  # objective constants have no place in the model
+                        if section == "RHS":
+                            rhs[i] = float(tokens[k + 1])
+                        else:
+                            ranges[i] = float(tokens[k + 1])
+                elif section == "BOUNDS":
+                    _apply_mps_bound(tokens, col_index, c, lb, ub, integer)
+                elif section in ("OBJSENSE", "OBJSENS"):
+                    file_sense = tokens[0].upper()
+                elif section == "OBJNAME":
+                    objective_name = tokens[0]
+                else:
+                    raise ValueError(f"Data outside of a section: {line.strip()!r}")
+            except KeyError as e:
+                raise ValueError(f"Line {number}: unknown name or type {e.args[0]!r}") from None
+            except (IndexError, ValueError) as e:
+                raise ValueError(f"Line {number}: cannot parse {line.strip()!r} ({e})") from None
+
+    if file_sense is not None and file_sense not in ("MAX", "MAXIMIZE", "MIN", "MINIMIZE"):
+        raise ValueError(f"Unknown OBJSENSE {file_sense!r}")
+    sense = sense or ("Maximize" if file_sense in ("MAX", "MAXIMIZE") else "Minimize")
+    rows, cols, vals, senses, rhs = _split_ranges(rows, cols, vals, senses, rhs, con_names, ranges)
+    return _buffer_model(c, rows, cols, vals, senses, rhs, sense, list(col_index), con_names, lb, ub, integer)
+
+
+def _apply_mps_bound(tokens, col_index, c, lb, ub, integer):
+    bound_type = tokens[0].upper()
+    if bound_type in ("FR", "MI", "PL", "BV"):
+        # Some writers add a dummy value after the column name
+        name, value = tokens[2] if len(tokens) == 4 else tokens[-1], None
+    else:
+        name, value = tokens[-2], float(tokens[-1])
+    j = col_index.get(name)
+    if j is None:
+        # A column that only appears in BOUNDS still exists, with no coefficients
+        j = col_index[name] = len(c)
+        c.append(0.0)
+        lb.append(0.0)
+        ub.append(INF)
+        integer.append(False)
+
+    if bound_type in ("UI", "LI", "BV"):
+        integer[j] = True
+    if bound_type in ("UP", "UI"):
+        ub[j] = value
+        if value < 0 and lb[j] == 0:
+            lb[j] = -INF  # classic MPS rule: a negative upper bound frees the default lower one
+    elif bound_type in ("LO", "LI"):
+        lb[j] = value
+    elif bound_type == "FX":
+        lb[j] = ub[j] = value
+    elif bound_type == "FR":
+        lb[j], ub[j] = -INF, INF
+    elif bound_type == "MI":
+        lb[j] = -INF
+    elif bound_type == "PL":
+        ub[j] = INF
+    elif bound_type == "BV":
+        lb[j], ub[j] = 0.0, 1.0
+    else:
+        raise ValueError(f"unsupported bound type {bound_type}")
+
+
+# ---------- Name Checks ---------- #
+def name_problem(model, fmt):
+    """Describes the first variable or constraint name ``fmt`` ("mps", "fixed" or "lp")
+    cannot represent, or returns None when every name can be written as is."""
+    for kind, names in (("Variable", model["var_names"]), ("Constraint", model["con_names"])):
+        for name in map(str, names):
+            if fmt == "fixed" and not 0 < len(name) <= 8:
+                return f"{kind} name {name!r} does not fit the 8 characters fixed MPS allows"
+            if fmt == "mps" and (not name or any(ch.isspace() for ch in name)):
+                return f"{kind} name {name!r} contains whitespace, which free MPS cannot represent"
+            if fmt == "lp" and (not LP_NAME.fullmatch(name) or LP_RESERVED.fullmatch(name)):
+                return f"{kind} name {name!r} is not valid in the LP format"
+    return None
+
+
+# ---------- MPS Writer ---------- #
+def _unique_name(base, taken):
+    name, k = base, 0
+    while name in taken:
+        k += 1
+        name = f"{base}{k}"
+    return name
+
+
+def _fixed_number(value):
+    text = _number(value)
+    for digits in range(12, 0, -1):
+        if len(text) <= 12:
+            return text
+        text = f"{value:.{digits}g}"
+    return text
+
+
+def write_mps(model, target, fixed=False, name="LP"):
+    """Writes free (default) or fixed format MPS; a maximization adds an OBJSENSE section."""
+    problem = name_problem(model, "fixed" if fixed else "mps")
+    if problem:
+        raise ValueError(problem)
+    var_names, con_names = model["var_names"], model["con_names"]
+    if fixed:
+        line = "    {:<8}  {:<8}  {:>12}\n".format
+        number = _fixed_number
+    else:
+        line = "    {}  {}  {}\n".format
+        number = _number
+    objective = _unique_name("OBJ", set(con_names))
+    row_types = {-1: "L", 0: "E", 1: "G"}
+
+    num_vars = len(model["c"])
+    indptr, indices, data = model["A_indptr"], model["A_indices"], model["A_data"]
+    # Column-major view of the CSR matrix, one stable argsort instead of a dense transpose
+    order = np.argsort(indices, kind="stable")
+    row_of = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))[order]
+    col_ptr = np.zeros(num_vars + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=num_vars), out=col_ptr[1:])
+    values = data[order]
+
+    with _open_output(target) as out:
+        out.write(f"NAME          {name}\n")
+        if model["sense"] == "Maximize":
+            out.write("OBJSENSE\n    MAX\n")
+        out.write(f"ROWS\n N  {objective}\n")
+        for start in range(0, len(con_names), WRITE_BATCH):
+            out.write("".join(f" {row_types[s]}  {n}\n" for s, n in
+                              zip(model["senses"][start:start + WRITE_BATCH].tolist(), con_names[start:start + WRITE_BATCH])))
+
+        out.write("COLUMNS\n")
+        lines, in_integers, markers = [], False, 0
+        for j, (var, cost, is_integer) in enumerate(zip(var_names, model["c"].tolist(), integer_mask(model).tolist())):
+            if is_integer != in_integers:
+                # Each run of integer columns sits between a pair of markers
+                markers += is_integer
+                lines.append(line(f"MKR{markers}", "'MARKER'", "'INTORG'" if is_integer else "'INTEND'"))
+                in_integers = is_integer
+            if cost:
+                lines.append(line(var, objective, number(cost)))
+            for i, value in zip(row_of[col_ptr[j]:col_ptr[j + 1]].tolist(), values[col_ptr[j]:col_ptr[j + 1]].tolist()):
+                lines.append(line(var, con_names[i], number(value)))
+            if not cost and col_ptr[j] == col_ptr[j + 1]:
+                lines.append(line(var, objective, "0"))  # keeps empty columns in the file
+            if len(lines) >= WRITE_BATCH:
+                out.write("".join(lines))
+                lines = []
+        if in_integers:
+            lines.append(line(f"MKR{markers}", "'MARKER'", "'INTEND'"))
+        out.write("".join(lines))
+
+        out.write("RHS\n")
+        nonzero = np.flatnonzero(model["rhs"])
+        for start in range(0, len(nonzero), WRITE_BATCH):
+            out.write("".join(line("RHS", con_names[i], number(model["rhs"][i]))
+                              for i in nonzero[start:start + WRITE_BATCH].tolist()))
+
+        bounds = []
+        for var, low, high, is_integer in zip(var_names, model["lb"].tolist(), model["ub"].tolist(),
+                                              integer_mask(model).tolist()):
+            bounds.extend(_mps_bounds(var, low, high, number, is_integer))
+        if bounds:
+            out.write("BOUNDS\n" + "".join(bounds))
+        out.write("ENDATA\n")
+
+
+def _mps_bounds(var, low, high, number, is_integer=False):
+    # Type in columns 2-3, bound set name from column 5, then the usual name / value fields
+    def row(bound_type, var, value):
+        return f" {bound_type} {'BND':<8}  {var:<8}  {value:>12}".rstrip() + "\n"
+
+    if low == 0 and high == INF:
+        return [row("PL", var, "")] if is_integer else []
+    if low == -INF and high == INF:
+        return [row("FR", var, "")]
+    if low == high:
+        return [row("FX", var, number(low))]
+    bounds = []
+    if low == -INF:
+        bounds.append(row("MI", var, ""))
+    elif low != 0:
+        bounds.append(row("LO", var, number(low)))
+    if high != INF:
+        bounds.append(row("UP", var, number(high)))
+    return bounds
+
+
+# ---------- LP Reader ---------- #
+LP_TOKEN = re.compile(r"""
+    (?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?            # number
+  | <=|>=|=<|=>|<|>|=                           # comparison
+  | [+\-:]                                      # sign or label colon
+  | [A-Za-z_!"\#$%&()/,;?@'`{}|~][\w!"\#$%&()/,.;?@'`{}|~]*  # name
+  | \S                                          # anything else is an error
+""", re.VERBOSE)
+# Token kind from its first character; classifying this way is much faster than named groups
+LP_TOKEN_KINDS = {**dict.fromkeys("0123456789.", "num"), **dict.fromkeys("<>=", "op"),
+                  "+": "sign", "-": "sign", ":": "colon",
+                  **dict.fromkeys("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_!\"#$%&()/,;?@'`{}|~", "name")}
+LP_SECTIONS = [
+    (re.compile(r"(maximi[sz]e|maximum|max)\b", re.I), "max"),
+    (re.compile(r"(minimi[sz]e|minimum|min)\b", re.I), "min"),
+    (re.compile(r"(subject\s+to|such\s+that|s\.t\.|st)(?=\s|$)", re.I), "rows"),
+    (re.compile(r"bounds?\b", re.I), "bounds"),
+    (re.compile(r"(generals?|gen|integers?)\b", re.I), "general"),
+    (re.compile(r"(binary|binaries|bin)\b", re.I), "binary"),
+    (re.compile(r"(semi-continuous|semis?|sos)\b", re.I), "unsupported"),
+    (re.compile(r"end\b", re.I), "end"),
+]
+LP_OPERATORS = {"<=": -1, "=<": -1, "<": -1, "=": 0, ">=": 1, "=>": 1, ">": 1}
+LP_INFINITY = {"inf", "infinity"}
+
+
+def _lp_tokens(text):
+    tokens = [(LP_TOKEN_KINDS.get(token[0]), token) for token in LP_TOKEN.findall(text)]
+    for kind, token in tokens:
+        if kind is None or token == ".":
+            raise ValueError(f"unexpected character {token!r}"
+                             + (" (quadratic terms are not supported)" if token in "[]^*" else ""))
+    return tokens
+
+
+def _lp_number(tokens):
+    # [sign ...] number-or-infinity -> float, or None when the tokens are not a constant
+    sign, k = 1.0, 0
+    while k < len(tokens) and tokens[k][0] == "sign":
+        sign = -sign if tokens[k][1] == "-" else sign
+        k += 1
+    if k != len(tokens) - 1:
+        return None
+    kind, text = tokens[k]
+    if kind == "num":
+        return sign * float(text)
+    if kind == "name" and text.lower() in LP_INFINITY:
+        return sign * INF
+    return None
+
+
+def _split_label(tokens):
+    if len(tokens) >= 2 and tokens[0][0] == "name" and tokens[1][0] == "colon":
+        return tokens[0][1], tokens[2:]
+    return None, tokens
+
+
+def _split_ops(tokens):
+    parts, current, ops = [], [], []
+    for token in tokens:
+        if token[0] == "op":
+            parts.append(current)
+            ops.append(token[1])
+            current = []
+        else:
+            current.append(token)
+    parts.append(current)
+    return parts, ops
+
+
+class _LpBuilder:
+    """Accumulates variables, objective and rows while an LP file streams past."""
+
+    def __init__(self):
+        self.col_index, self.c, self.lb, self.ub = {}, array.array("d"), array.array("d"), array.array("d")
+        self.integer = array.array("b")
+        self.rows, self.cols, self.vals = array.array("q"), array.array("q"), array.array("d")
+        self.senses, self.rhs, self.con_names, self.row_index = array.array("b"), array.array("d"), [], set()
+
+    def column(self, name):
+        j = self.col_index.get(name)
+        if j is None:
+            if name.lower() in LP_INFINITY or name.lower() == "free":
+                raise ValueError(f"'{name}' cannot be used as a variable name")
+            j = self.col_index[name] = len(self.c)
+            self.c.append(0.0)
+            self.lb.append(0.0)
+            self.ub.append(INF)
+            self.integer.append(False)
+        return j
+
+    def terms(self, tokens, constants=False):
+        """Yields (column, coefficient) for a linear expression. Constants are dropped when
+        ``constants`` is true (objective offsets) and rejected otherwise."""
+        sign, coeff = 1.0, None
+        for kind, text in tokens:
+            if kind == "sign":
+                if coeff is not None and not constants:
+                    raise ValueError("constants belong on the right-hand side")
+                if coeff is not None:
+                    sign, coeff = 1.0, None
+                sign = -sign if text == "-" else sign
+            elif kind == "num":
+                if coeff is not None:
+                    raise ValueError(f"two numbers in a row near {text!r}")
+                coeff = float(text)
+            elif kind == "name":
+                yield self.column(text), sign * (1.0 if coeff is None else coeff)
+                sign, coeff = 1.0, None
+            else:
+                raise ValueError(f"unexpected {text!r} in an expression")
+        if coeff is not None and not constants:
+            raise ValueError("constants belong on the right-hand side")
+
+    def objective(self, tokens):
+        for j, value in self.terms(_split_label(tokens)[1], constants=True):
+            self.c[j] += value
+
+    def row(self, tokens):
+        name, tokens = _split_label(tokens)
+        parts, ops = _split_ops(tokens)
+        if len(ops) == 1:
+            low, expr, high = None, parts[0], _lp_number(parts[1])
+            if high is None:
+                raise ValueError("the right-hand side must be a constant")
+            bounds = [(LP_OPERATORS[ops[0]], high)]
+        elif len(ops) == 2 and LP_OPERATORS[ops[0]] == LP_OPERATORS[ops[1]] != 0:
+            # Ranged row: lo <= expr <= hi (or the mirrored >= form)
+            low, expr, high = _lp_number(parts[0]), parts[1], _lp_number(parts[2])
+            if low is None or high is None:
+                raise ValueError("ranged rows need constants on both sides")
+            flip = -LP_OPERATORS[ops[0]]
+            bounds = [(flip, low), (-flip, high)]
+        else:
+            raise ValueError("expected one comparison, or two for a ranged row")
+
+        name = name or f"c{len(self.rhs) + 1}"
+        terms = list(self.terms(expr))
+        for k, (row_sense, value) in enumerate(bounds):
+            i = len(self.rhs)
+            for j, coeff in terms:
+                self.rows.append(i)
+                self.cols.append(j)
+                self.vals.append(coeff)
+            self.senses.append(row_sense)
+            self.rhs.append(value)
+            self.con_names.append(name if k == 0 else f"{name}_range")
+
+    def bound(self, tokens):
+        if len(tokens) == 2 and tokens[0][0] == "name" and tokens[1][1].lower() == "free":
+            j = self.column(tokens[0][1])
+            self.lb[j], self.ub[j] = -INF, INF
+            return
+        parts, ops = _split_ops(tokens)
+        if len(ops) == 2:
+            # lo <= x <= hi
+            j, low, high = self._bound_column(parts[1]), _lp_number(parts[0]), _lp_number(parts[2])
+            if low is None or high is None:
+                raise ValueError("a double bound needs constants on both sides")
+            if LP_OPERATORS[ops[0]] == 1:
+                low, high = high, low
+            self.lb[j], self.ub[j] = low, high
+        elif len(ops) == 1:
+            value = _lp_number(parts[1])
+            op = LP_OPERATORS[ops[0]]
+            if value is None:
+                # constant on the left: "2 <= x" is "x >= 2"
+                value, j, op = _lp_number(parts[0]), self._bound_column(parts[1]), -op
+            else:
+                j = self._bound_column(parts[0])
+            if value is None:
+                raise ValueError("a bound needs a constant")
+            if op == 0:
+                self.lb[j] = self.ub[j] = value
+            elif op < 0:
+                self.ub[j] = value
+            else:
+                self.lb[j] = value
+        else:
+            raise ValueError("expected 'x free', 'x <op> value' or 'lo <= x <= hi'")
+
+    def _bound_column(self, tokens):
+        if len(tokens) != 1 or tokens[0][0] != "name":
+            raise ValueError("bounds apply to a single variable")
+        return self.column(tokens[0][1])
+
+
+def _lp_row_complete(tokens):
+    parts, ops = _split_ops(tokens)
+    if not ops or _lp_number(parts[-1]) is None:
+        return False
+    # "lo <= expr <= hi" is only complete after its second comparison
+    first = _split_label(parts[0])[1]
+    return len(ops) >= 2 or _lp_number(first) is None
+
+
+def read_lp_model(source, sense=None):
+    """Reads a CPLEX LP file; ``sense`` overrides the file's Maximize / Minimize."""
+    builder = _LpBuilder()
+    file_sense, section, pending, pending_line, pending_ops = None, None, [], 0, 0
+
+    with _open_text(source) as stream:
+        for number, line in enumerate(stream, 1):
+            line = line.split("\\", 1)[0]
+            text = line.strip()
+            if not text:
+                continue
+            try:
+                match, name = next(((m, n) for pattern, n in LP_SECTIONS if (m := pattern.match(text))), (None, None))
+                if match:
+                    if section in ("max", "min"):
+                        builder.objective(pending)
+                    elif pending:
+                        raise ValueError(f"incomplete statement starting on line {pending_line}")
+                    pending, section = [], name
+                    if name in ("max", "min"):
+                        file_sense = "Maximize" if name == "max" else "Minimize"
+                    elif name == "unsupported":
+                        raise ValueError(f"section '{match.group()}' is not supported")
+                    elif name == "end":
+                        break
+                    text = text[match.end():]
+
+                tokens = _lp_tokens(text)
+                if not tokens:
+                    continue
+                if section in ("max", "min"):
+                    pending.extend(tokens)
+                elif section == "rows":
+                    if not pending:
+                        pending_line, pending_ops = number, 0
+                    pending.extend(tokens)
+                    # Rows can wrap over many lines; only look for the end once a comparison appeared
+                    pending_ops += sum(kind == "op" for kind, _ in tokens)
+                    if pending_ops and _lp_row_complete(pending):
+                        builder.row(pending)
+                        pending = []
+                elif section == "bounds":
+                    builder.bound(tokens)
+                elif section in ("general", "binary"):
+                    for kind, var in tokens:
+                        if kind != "name":
+                            raise ValueError(f"expected variable names, got {var!r}")
+                        j = builder.column(var)
+                        builder.integer[j] = True
+                        if section == "binary":
+                            builder.lb[j], builder.ub[j] = max(builder.lb[j], 0.0), min(builder.ub[j], 1.0)
+                else:
+                    raise ValueError("expected Maximize or Minimize before the model")
+            except ValueError as e:
+                raise ValueError(f"Line {number}: {e}") from None
+
+    if section in ("max", "min"):
+        builder.objective(pending)
+    elif pending:
+        raise ValueError(f"Incomplete constraint starting on line {pending_line}")
+    if file_sense is None:
+        raise ValueError("No Maximize or Minimize section found")
+
+    b = builder
+    return _buffer_model(b.c, b.rows, b.cols, b.vals, b.senses, b.rhs, sense or file_sense,
+                         list(b.col_index), b.con_names, b.lb, b.ub, b.integer)
+
+
+# ---------- LP Writer ---------- #
+LP_NAME = re.compile(r"[A-Za-z_!\"#$%&()/,;?@'`{}|~][\w!\"#$%&()/,.;?@'`{}|~]*")
+LP_RESERVED = re.compile(r"(?i)(inf|infinity|free|st|s\.t\.|end|bounds?|[eE]\d.*)")
+LP_LINE_CHARS = 200
+
+
+def _lp_expression(pieces):
+    # Wraps long expressions; continuation lines start with whitespace
+    lines, current = [], ""
+    for piece in pieces:
+        if len(current) + len(piece) > LP_LINE_CHARS and current:
+            lines.append(current)
+            current = "  "
+        current += piece
+    lines.append(current)
+    return "\n".join(lines)
+
+
+def _lp_terms(columns, coefficients, var_names):
+    pieces = []
+    for j, value in zip(columns, coefficients):
+        sign = "-" if value < 0 else "+"
+        magnitude = "" if abs(value) == 1 else _number(abs(value)) + " "
+        pieces.append(f" {sign} {magnitude}{var_names[j]}")
+    if not pieces:
+        return " 0 " + var_names[0] if var_names else " 0"
+    return _lp_expression(pieces)
+
+
+def write_lp(model, target, name="LP"):
+    """Writes a CPLEX LP file, one row at a time."""
+    problem = name_problem(model, "lp")
+    if problem:
+        raise ValueError(problem)
+    var_names, con_names = model["var_names"], model["con_names"]
+    indptr, indices, data = model["A_indptr"], model["A_indices"], model["A_data"]
+
+    with _open_output(target) as out:
+        out.write(f"\\ Problem name: {name}\n\n{model['sense']}\n")
+        # Every column is listed, zeros included, so reading the file back keeps the column order
+        out.write(f" obj:{_lp_terms(range(len(var_names)), model['c'].tolist(), var_names)}\n")
+
+        out.write("Subject To\n")
+        lines = []
+        for j, (con, row_sense, value) in enumerate(zip(con_names, model["senses"].tolist(), model["rhs"].tolist())):
+            start, end = indptr[j], indptr[j + 1]
+            expression = _lp_terms(indices[start:end].tolist(), data[start:end].tolist(), var_names)
+            lines.append(f" {con}:{expression} {SENSE_SYMBOLS[row_sense]} {_number(value)}\n")
+            if len(lines) >= WRITE_BATCH:
+                out.write("".join(lines))
+                lines = []
+        out.write("".join(lines))
+
+        bounds = []
+        for var, low, high in zip(var_names, model["lb"].tolist(), model["ub"].tolist()):
+            if low == 0 and high == INF:
+                continue
+            if low == -INF and high == INF:
+                bounds.append(f" {var} free\n")
+            elif low == high:
+                bounds.append(f" {var} = {_number(low)}\n")
+            elif high == INF:
+                bounds.append(f" {var} >= {'-inf' if low == -INF else _number(low)}\n")
+            elif low == 0:
+                bounds.append(f" {var} <= {_number(high)}\n")
+            else:
+                bounds.append(f" {'-inf' if low == -INF else _number(low)} <= {var} <= {_number(high)}\n")
+        if bounds:
+            out.write("Bounds\n" + "".join(bounds))
+        integers = [var_names[j] for j in np.flatnonzero(integer_mask(model)).tolist()]
+        if integers:
+            out.write("General\n" + _lp_expression(f" {var}" for var in integers) + "\n")
+        out.write("End\n")
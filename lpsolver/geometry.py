@@ -0,0 +1,400 @@
+"""Exact feasible-region geometry for the 2D and 3D plots.
+
+Constraints and variable bounds are turned into half-spaces ``g·x <= h``. In 2D they are
+intersected exactly: sort by direction, keep the tightest of each parallel family, then a
+single deque sweep (O(m log m) overall). In 3D a box is clipped by each half-space in turn,
+which keeps every face labelled with the constraint it lies on. Unbounded regions are cut
+off far outside every constraint and flagged, so the plots can fit their axes to the part
+that matters.
+"""
+from collections import deque
+
+import numpy as np
+
+from lpsolver.model import dense_matrix
+
+# Region dimensions: a polygon, a segment (equality constraint), a single point, or nothing
+POLYGON, SEGMENT, POINT, EMPTY = 2, 1, 0, -1
+# Face tag of the cut-off box around unbounded 3D regions
+BOX = -1
+
+
+# ---------- Half-Spaces ---------- #
+def half_planes(model):
+    """Returns (G, h, E, f, labels): inequalities ``G x <= h`` including finite bounds,
+    equalities ``E x = f``, and a label per row of G followed by one per row of E."""
+    A, senses, rhs = dense_matrix(model), model["senses"], model["rhs"]
+    num_vars = A.shape[1]
+    eye = np.eye(num_vars)
+    lower, upper = np.isfinite(model["lb"]), np.isfinite(model["ub"])
+    G = np.vstack([A[senses == -1], -A[senses == 1], -eye[lower], eye[upper]])
+    h = np.r_[rhs[senses == -1], -rhs[senses == 1], -model["lb"][lower], model["ub"][upper]]
+
+    names, var_names = np.array(model["con_names"], dtype=object), model["var_names"]
+    labels = [*names[senses == -1], *names[senses == 1],
+              *(f"{var_names[i]} >= {model['lb'][i]:g}" for i in np.flatnonzero(lower)),
+              *(f"{var_names[i]} <= {model['ub'][i]:g}" for i in np.flatnonzero(upper)),
+              *names[senses == 0]]
+    return G, h, A[senses == 0], rhs[senses == 0], labels
+
+
+def _scale(G, h):
+    # Largest distance from the origin to any constraint line, so the cut-off square clears them all
+    norms = np.linalg.norm(G, axis=1)
+    nonzero = norms > 0
+    return max(1.0, float(np.abs(h[nonzero] / norms[nonzero]).max(initial=0.0)))
+
+
+def _box(num_vars, limit):
+    eye = np.eye(num_vars)
+    return np.vstack([eye, -eye]), np.full(2 * num_vars, limit)
+
+
+def _clip_line(p, d, G, h, eps):
+    # Interval of t for which p + t d satisfies G x <= h
+    rate, slack = G @ d, h - G @ p
+    if (slack[np.abs(rate) <= 1e-12] < -eps).any():
+        return None
+    rising, falling = rate > 1e-12, rate < -1e-12
+    high = (slack[rising] / rate[rising]).min(initial=np.inf)
+    low = (slack[falling] / rate[falling]).max(initial=-np.inf)
+    return (low, high) if low <= high + eps else None
+
+
+# ---------- 2D Polygon ---------- #
+def _coincident_pairs(G, h, eps):
+    # Opposite parallel inequalities whose lines coincide (x + y <= 4 with x + y >= 4) hold as an
+    # equality; returns those lines as rows of E x = f, so the region comes out as a segment or point
+    norms = np.hypot(G[:, 0], G[:, 1])
+    keep = norms > 1e-12
+    u, b = G[keep] / norms[keep, None], h[keep] / norms[keep]
+    # Orient every normal the same way, so u·x <= b and u·x >= b fall into one family
+    flipped = (u[:, 0] < -1e-12) | ((np.abs(u[:, 0]) <= 1e-12) & (u[:, 1] < 0))
+    u[flipped], b[flipped] = -u[flipped], -b[flipped]
+    _, first, family = np.unique(np.round(u, 9), axis=0, return_index=True, return_inverse=True)
+    family = family.reshape(-1)
+    upper, lower = np.full(len(first), np.inf), np.full(len(first), -np.inf)
+    np.minimum.at(upper, family[~flipped], b[~flipped])
+    np.maximum.at(lower, family[flipped], b[flipped])
+    lines = np.isfinite(upper) & (np.abs(upper - lower) <= eps)
+    return u[first[lines]], upper[lines]
+
+
+def _intersection(a, b, i, j):
+    det = a[i][0] * a[j][1] - a[i][1] * a[j][0]
+    return ((b[i] * a[j][1] - a[i][1] * b[j]) / det, (a[i][0] * b[j] - b[i] * a[j][0]) / det)
+
+
+def _outside(a, b, i, point, eps):
+    return a[i][0] * point[0] + a[i][1] * point[1] > b[i] + eps
+
+
+def _intersect_half_planes(G, h, eps):
+    norms = np.hypot(G[:, 0], G[:, 1])
+    degenerate = norms <= 1e-12
+    if (h[degenerate] < -eps).any():
+        return []
+    a, b = G[~degenerate] / norms[~degenerate, None], h[~degenerate] / norms[~degenerate]
+
+    # Sort by the direction of each boundary line; among parallel lines only the tightest matters
+    angle = np.arctan2(a[:, 0], -a[:, 1])
+    order = np.lexsort((b, angle))
+    keep = np.r_[True, np.diff(angle[order]) > 1e-12]
+    order = order[keep]
+    a, b = a[order].tolist(), b[order].tolist()
+
+    hull = deque()
+    for i in range(len(a)):
+        while len(hull) >= 2 and _outside(a, b, i, _intersection(a, b, hull[-1], hull[-2]), eps):
+            hull.pop()
+        while len(hull) >= 2 and _outside(a, b, i, _intersection(a, b, hull[0], hull[1]), eps):
+            hull.popleft()
+        if hull and abs(a[i][0] * a[hull[-1]][1] - a[i][1] * a[hull[-1]][0]) <= 1e-12:
+            # Anti-parallel neighbours: the strip between them has no interior
+            return []
+        hull.append(i)
+    while len(hull) >= 3 and _outside(a, b, hull[0], _intersection(a, b, hull[-1], hull[-2]), eps):
+        hull.pop()
+    while len(hull) >= 3 and _outside(a, b, hull[-1], _intersection(a, b, hull[0], hull[1]), eps):
+        hull.popleft()
+    if len(hull) < 3:
+        return []
+    hull = list(hull)
+    return [_intersection(a, b, hull[k], hull[(k + 1) % len(hull)]) for k in range(len(hull))]
+
+
+def feasible_polygon(model, limit=None):
+    """Exact feasible region of a two-variable model.
+
+    Returns a dict with ``vertices`` (counter-clockwise, shape (k, 2)), ``dimension``
+    (POLYGON, SEGMENT, POINT or EMPTY) and ``bounded``. Unbounded regions are cut at the
+    square ``|x| <= limit`` (by default far beyond every constraint line).
+    """
+    G, h, E, f, _ = half_planes(model)
+    if limit is None:
+        limit = 1e3 * _scale(np.vstack([G, E]), np.r_[h, f])
+    eps = 1e-9 * limit
+    lines, offsets = _coincident_pairs(G, h, eps)
+    E, f = np.vstack([E, lines]), np.r_[f, offsets]
+    box_G, box_h = _box(2, limit)
+    G, h = np.vstack([G, box_G]), np.r_[h, box_h]
+    region = {"vertices": np.empty((0, 2)), "dimension": EMPTY, "bounded": True, "limit": limit}
+
+    norms = np.linalg.norm(E, axis=1)
+    if (np.abs(f[norms <= 1e-12]) > eps).any():
+        return region
+    E, f, norms = E[norms > 1e-12], f[norms > 1e-12], norms[norms > 1e-12]
+    if len(E):
+        # Equalities: clip the first one's line against everything else (the rest count twice)
+        p, d = E[0] * f[0] / norms[0] ** 2, np.array([-E[0][1], E[0][0]]) / norms[0]
+        interval = _clip_line(p, d, np.vstack([G, E[1:], -E[1:]]), np.r_[h, f[1:], -f[1:]], eps)
+        if interval is None:
+            return region
+        vertices = np.array([p + t * d for t in interval])
+        dimension = POINT if interval[1] - interval[0] <= eps else SEGMENT
+        vertices = vertices[:1] if dimension == POINT else vertices
+    else:
+        vertices = np.array(_intersect_half_planes(G, h, eps)).reshape(-1, 2)
+        if len(vertices):
+            # Several lines through one corner give repeated vertices
+            step = np.abs(np.diff(np.vstack([vertices, vertices[:1]]), axis=0)).max(axis=1)
+            vertices = vertices[step > eps]
+        dimension = POLYGON if len(vertices) >= 3 else EMPTY
+        if dimension == EMPTY:
+            vertices = np.empty((0, 2))
+
+    region["vertices"], region["dimension"] = vertices, dimension
+    region["bounded"] = not (np.abs(vertices) >= limit * (1 - 1e-9)).any()
+    return region
+
+
+def plot_window(region, points=(), pad=0.1):
+    """Axis ranges ((x0, x1), (y0, y1), ...) around the region's finite vertices and ``points``.
+
+    Vertices on the cut-off boundary are left out; each direction in which the region runs
+    off to infinity gets extra room so it visibly continues past the frame.
+    """
+    vertices = region["vertices"]
+    num_dims = vertices.shape[1]
+    far = np.abs(vertices) >= region["limit"] * (1 - 1e-9)
+    points = np.vstack([vertices[~far.any(axis=1)], np.asarray(points, dtype=np.float64).reshape(-1, num_dims)])
+    if not len(points):
+        points = np.zeros((1, num_dims))
+    low, high = points.min(axis=0), points.max(axis=0)
+    span = np.where(high > low, high - low, np.maximum(np.abs(high), 1.0))
+    reach = span.max()
+    high = np.where((far & (vertices > 0)).any(axis=0), high + reach, high)
+    low = np.where((far & (vertices < 0)).any(axis=0), low - reach, low)
+    margin = np.where(high > low, high - low, span) * pad
+    return tuple(zip((low - margin).tolist(), (high + margin).tolist()))
+
+
+# ---------- Plot Payload ---------- #
+def clip_lines(G, h, window):
+    """Visible part of each line ``g·x = h`` inside the 2D ``window``.
+
+    Returns (rows, segments): the indices of lines crossing the window and their end points
+    as an array of shape (k, 2, 2). Lines with a zero normal are dropped.
+    """
+    (x0, x1), (y0, y1) = window
+    norms = np.hypot(G[:, 0], G[:, 1])
+    rows = np.flatnonzero(norms > 0)
+    a, b = G[rows] / norms[rows, None], h[rows] / norms[rows]
+    p, d = a * b[:, None], np.c_[-a[:, 1], a[:, 0]]
+
+    # Liang-Barsky: intersect the parameter ranges in which each coordinate stays inside
+    low, high = np.full(len(rows), -np.inf), np.full(len(rows), np.inf)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for axis, (start, end) in enumerate(((x0, x1), (y0, y1))):
+            moving = np.abs(d[:, axis]) > 1e-12
+            t0, t1 = (start - p[:, axis]) / d[:, axis], (end - p[:, axis]) / d[:, axis]
+            low = np.where(moving, np.maximum(low, np.minimum(t0, t1)), low)
+            high = np.where(moving, np.minimum(high, np.maximum(t0, t1)), high)
+            outside = ~moving & ((p[:, axis] < start) | (p[:, axis] > end))
+            high[outside] = -np.inf
+    visible = low < high
+    segments = p[visible, None, :] + np.stack([low[visible], high[visible]], axis=1)[:, :, None] * d[visible, None, :]
+    return rows[visible], segments
+
+
+def thin_path(x, y, window, resolution=2000):
+    """Drops points that land in the same cell as their predecessor on a ``resolution``
+    grid over the visible ``window``; NaN gaps and the end points are always kept."""
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    if len(x) <= 2:
+        return x, y
+    (x0, x1), (y0, y1) = window
+    cells = np.c_[np.floor((x - x0) / ((x1 - x0) / resolution)), np.floor((y - y0) / ((y1 - y0) / resolution))]
+    keep = np.r_[True, (cells[1:] != cells[:-1]).any(axis=1) | np.isnan(cells[1:]).any(axis=1)]
+    keep[-1] = True
+    return x[keep], y[keep]
+
+
+# ---------- 3D Polytope ---------- #
+def _cube_faces(low, high):
+    corners = np.array([[x, y, z] for z in (low[2], high[2]) for y in (low[1], high[1]) for x in (low[0], high[0])])
+    quads = [(0, 2, 6, 4), (1, 3, 7, 5), (0, 1, 5, 4), (2, 3, 7, 6), (0, 1, 3, 2), (4, 5, 7, 6)]
+    return [(BOX, corners[list(quad)]) for quad in quads]
+
+
+def _clip_face(points, s, eps):
+    # Sutherland-Hodgman for one convex face against s <= 0; also returns the new corners on the plane
+    kept, crossings = [], []
+    for i in range(len(points)):
+        j = (i + 1) % len(points)
+        if s[i] <= eps:
+            kept.append(points[i])
+        if (s[i] < -eps and s[j] > eps) or (s[i] > eps and s[j] < -eps):
+            point = points[i] + (points[j] - points[i]) * (s[i] / (s[i] - s[j]))
+            kept.append(point)
+            crossings.append(point)
+    return kept, crossings
+
+
+def _order_on_plane(points, normal, eps):
+    # Corners of the new face, sorted by angle around their centroid within the cutting plane
+    points = np.array(points)
+    u = np.cross(normal, np.eye(3)[np.argmin(np.abs(normal))])
+    v = np.cross(normal, u)
+    offsets = points - points.mean(axis=0)
+    points = points[np.argsort(np.arctan2(offsets @ v, offsets @ u))]
+    step = np.abs(np.diff(np.vstack([points, points[:1]]), axis=0)).max(axis=1)
+    return points[step > eps]
+
+
+def _face_area(points):
+    return 0.5 * np.linalg.norm(np.cross(points[1:-1] - points[0], points[2:] - points[0]).sum(axis=0))
+
+
+def _stack(faces):
+    return np.vstack([points for _, points in faces]), np.cumsum([0] + [len(points) for _, points in faces[:-1]])
+
+
+def _clip_polyhedron(faces, vertices, offsets, g, h, tag, eps):
+    s = vertices @ g - h
+    highest, lowest = np.maximum.reduceat(s, offsets), np.minimum.reduceat(s, offsets)
+    ends = np.r_[offsets[1:], len(s)]
+    cap = [vertices[np.abs(s) <= eps]]
+    clipped = []
+    for k, (face_tag, points) in enumerate(faces):
+        if highest[k] <= eps:
+            clipped.append((face_tag, points))
+            continue
+        kept, crossings = _clip_face(points, s[offsets[k]:ends[k]], eps)
+        cap.append(np.reshape(crossings, (-1, 3)))
+        if len(kept) >= 3:
+            clipped.append((face_tag, np.array(kept)))
+
+    # A face already lying in the cutting plane (the other half of an equality) needs no cap
+    flush = ((highest <= eps) & (lowest >= -eps)).any()
+    cap = np.vstack(cap)
+    if not flush and len(cap) >= 3:
+        cap = _order_on_plane(cap, g, eps)
+        if len(cap) >= 3:
+            clipped.append((tag, cap))
+    return clipped
+
+
+def _polyhedron(G, h, tags, low, high, eps):
+    faces = _cube_faces(low, high)
+    vertices, offsets = _stack(faces)
+    for g, b, tag in zip(G, h, tags):
+        # Most constraints of a large model miss the current polytope entirely
+        if (vertices @ g).max() - b <= eps:
+            continue
+        faces = _clip_polyhedron(faces, vertices, offsets, g, b, tag, eps)
+        if not faces:
+            return []
+        vertices, offsets = _stack(faces)
+    return [(tag, points) for tag, points in faces if _face_area(points) > eps * eps]
+
+
+def _unique_vertices(faces, eps):
+    if not faces:
+        return np.empty((0, 3)), np.empty(0, dtype=np.int64)
+    points = np.vstack([points for _, points in faces])
+    _, first, inverse = np.unique(np.round(points / (10 * eps)), axis=0, return_index=True, return_inverse=True)
+    return points[first], inverse.ravel()
+
+
+def feasible_polytope(model, x=None, max_vertices=None):
+    """Exact feasible region of a three-variable model as convex faces.
+
+    Returns a dict with ``faces`` as (tag, corners) pairs, where tags index ``labels`` (one
+    per constraint or bound) and BOX marks the cut-off box of an unbounded region, plus
+    ``vertices``, ``bounded`` and the axis ``window``. Given the optimum ``x``, ``binding``
+    holds the tags of constraints tight at ``x`` and ``optimal`` flags the faces on which the
+    objective equals its optimum. Past ``max_vertices`` vertices only the largest faces and
+    the binding constraints are kept: a coarser convex outer approximation for display.
+    """
+    G, h, E, f, labels = half_planes(model)
+    num_ineq = len(G)
+    tags = np.r_[np.arange(num_ineq), np.tile(num_ineq + np.arange(len(E)), 2)].astype(np.int64)
+    G, h = np.vstack([G, E, -E]), np.r_[h, f, -f]
+    limit = 1e3 * _scale(G, h)
+    eps = 1e-9 * limit
+
+    faces = _polyhedron(G, h, tags, np.full(3, -limit), np.full(3, limit), eps)
+    vertices, _ = _unique_vertices(faces, eps)
+    region = {"vertices": vertices, "limit": limit, "labels": labels,
+              "bounded": not (np.abs(vertices) >= limit * (1 - 1e-9)).any()}
+    window = plot_window(region, [] if x is None else [x[:3]])
+    low, high = np.array(window).T
+    if not region["bounded"]:
+        faces = _polyhedron(G, h, tags, low, high, eps)
+
+    binding = set()
+    if x is not None:
+        x = np.asarray(x[:3], dtype=np.float64)
+        binding = set(tags[np.abs(G @ x - h) <= 1e-6 * (1.0 + np.abs(h))].tolist())
+
+    region["total_faces"] = len(faces)
+    vertices, _ = _unique_vertices(faces, eps)
+    if max_vertices and len(vertices) > max_vertices:
+        # Rank constraints by face area and keep as many as the vertex budget allows
+        area = {}
+        for tag, points in faces:
+            if tag != BOX and tag not in binding:
+                area[tag] = area.get(tag, 0.0) + _face_area(points)
+        ranked = sorted(area, key=area.get, reverse=True)
+        best, lo, hi = None, 0, len(ranked)
+        while lo <= hi:
+            count = (lo + hi) // 2
+            rows = np.isin(tags, list(binding) + ranked[:count])
+            candidate = _polyhedron(G[rows], h[rows], tags[rows], low, high, eps)
+            if len(_unique_vertices(candidate, eps)[0]) <= max_vertices:
+                best, lo = candidate, count + 1
+            else:
+                hi = count - 1
+        if best is not None:
+            faces = best
+            vertices, _ = _unique_vertices(faces, eps)
+
+    region.update(faces=faces, vertices=vertices, window=window, binding=binding,
+                  decimated=len(faces) < region["total_faces"])
+    region["optimal"] = [False] * len(faces)
+    if x is not None:
+        c = np.asarray(model["c"], dtype=np.float64)[:3]
+        best_value = c @ x
+        tol = 1e-6 * (1.0 + abs(best_value))
+        region["optimal"] = [bool(np.abs(points @ c - best_value).max() <= tol) and c.any() for _, points in faces]
+    return region
+
+
+def polytope_mesh(region):
+    """Triangulates the region's faces for a mesh plot.
+
+    Returns (vertices, triangles, triangle_faces, edges): corner coordinates, index triples,
+    the face each triangle came from, and the unique face edges as index pairs.
+    """
+    faces = region["faces"]
+    vertices, inverse = _unique_vertices(faces, 1e-9 * region["limit"])
+    triangles, triangle_faces, edges, start = [], [], set(), 0
+    for k, (_, points) in enumerate(faces):
+        index = inverse[start:start + len(points)].tolist()
+        start += len(points)
+        triangles.extend((index[0], index[i], index[i + 1]) for i in range(1, len(index) - 1))
+        triangle_faces.extend([k] * (len(index) - 2))
+        edges.update(tuple(sorted((index[i], index[(i + 1) % len(index)]))) for i in range(len(index)))
+    return (vertices, np.array(triangles, dtype=np.int64).reshape(-1, 3), np.array(triangle_faces, dtype=np.int64),
+            np.array(sorted(edge for edge in edges if edge[0] != edge[1]), dtype=np.int64).reshape(-1, 2))
@@ -0,0 +1,125 @@
+"""Bounded per-session history of solved problems, for switching between and diffing solutions.
+
+Entries hold the array model and the result dict (NumPy arrays and plain values, never
+PuLP objects), keyed by problem hash. Re-solving a problem replaces its entry, and the
+oldest entries are dropped beyond a count or byte budget.
+"""
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from lpsolver.cache import ENTRY_OVERHEAD_BYTES
+from lpsolver.model import model_shape
+
+
+def entry_nbytes(model, result):
+    arrays = [value for value in (*model.values(), *result.values()) if isinstance(value, np.ndarray)]
+    names = sum(len(name) for name in (*model["var_names"], *model["con_names"]))
+    return ENTRY_OVERHEAD_BYTES + sum(array.nbytes for array in arrays) + names
+
+
+class SolutionHistory:
+    """Most recent first. The newest entry is always kept, even when it alone is over budget."""
+
+    def __init__(self, max_entries=10, max_bytes=64 * 1024 ** 2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.count = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def add(self, key, model, result, label=None):
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)["nbytes"]
+        self.count += 1
+        entry = {
+            "key": key,
+            "number": self.count,
+            "label": label,
+            "solved_at": time.time(),
+            "model": model,
+            "result": result,
+            "nbytes": entry_nbytes(model, result),
+        }
+        self._entries[key] = entry
+        self.current_bytes += entry["nbytes"]
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted["nbytes"]
+        return entry
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def entries(self):
+        return list(reversed(self._entries.values()))
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+
+def describe(entry):
+    """One-line summary for pickers: number, time, size, solver, status and objective."""
+    rows, cols = model_shape(entry["model"])
+    result = entry["result"]
+    objective = "-" if result["objective"] is None else f"{result['objective']:.6g}"
+    text = (f"#{entry['number']} • {time.strftime('%H:%M:%S', time.localtime(entry['solved_at']))} • "
+            f"{entry['model']['sense']} {rows}×{cols} • {result['solver']} • {result['status']} • objective {objective}")
+    return f"{entry['label']} • {text}" if entry.get("label") else text
+
+
+def _values(names, values):
+    return dict(zip(names, np.asarray(values, dtype=np.float64).tolist()))
+
+
+def _compare(name_column, before, after):
+    rows = []
+    for name in list(before) + [name for name in after if name not in before]:
+        a, b = before.get(name), after.get(name)
+        delta = None if a is None or b is None else b - a
+        rows.append({name_column: name, "A": a, "B": b, "Δ (B - A)": delta})
+    return rows
+
+
+def diff_solutions(entry_a, entry_b, tol=1e-9):
+    """Compares two history entries by name. Returns (summary, variables, constraints): a column
+    dict with one row per solution, and row lists of the variables and constraint activities
+    (row values at each solution) that differ by more than ``tol`` or exist on one side only."""
+    a, b = entry_a["result"], entry_b["result"]
+    objective_delta = None if a["objective"] is None or b["objective"] is None else b["objective"] - a["objective"]
+    summary = {
+        "": ["A", "B"],
+        "Solution": [f"#{entry_a['number']}", f"#{entry_b['number']}"],
+        "Status": [a["status"], b["status"]],
+        "Solver": [a["solver"], b["solver"]],
+        "Objective": [a["objective"], b["objective"]],
+        "Δ Objective (B - A)": [None, objective_delta],
+    }
+
+    variables = _compare("Variable", _values(entry_a["model"]["var_names"], a["x"]),
+                         _values(entry_b["model"]["var_names"], b["x"]))
+    constraints = _compare("Constraint", _activities(entry_a), _activities(entry_b))
+    return (summary, [row for row in variables if _changed(row, tol)],
+            [row for row in constraints if _changed(row, tol)])
+
+
+def _changed(row, tol):
+    # Missing on one side, or different; NaN (no solution values) counts as different
+    delta = row["Δ (B - A)"]
+    return delta is None or not abs(delta) <= tol
+
+
+def _activities(entry):
+    model, x = entry["model"], np.asarray(entry["result"]["x"], dtype=np.float64)
+    num_constraints = len(model["rhs"])
+    rows = np.repeat(np.arange(num_constraints), np.diff(model["A_indptr"]))
+    activity = np.bincount(rows, weights=model["A_data"] * x[model["A_indices"]], minlength=num_constraints)
+    return _values(model["con_names"], activity)
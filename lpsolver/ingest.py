@@ -0,0 +1,185 @@
+"""Bulk import of array models from CSV, Parquet, NumPy, MPS and LP files.
+
+Tabular files (CSV / Parquet) hold one constraint per row::
+
+    name, x1, x2, ..., xn, sense, rhs
+    objective, 3, 5, ..., 1, ,
+    Constraint_1, 1, 0, ..., 2, <=, 40
+
+Every column other than ``name``, ``sense`` and ``rhs`` is a decision variable and its
+header becomes the variable name. The row named ``objective`` holds the objective
+coefficients. Files are read in chunks and only the nonzero coefficients are kept, so
+memory grows with the nonzero count rather than rows x columns.
+
+``.npz`` archives store the array model directly (see ``save_model_npz``); the constraint
+matrix is either a dense ``A`` or the CSR triple ``A_data`` / ``A_indices`` / ``A_indptr``.
+MPS and CPLEX LP files, optionally gzipped, are handled by ``lpsolver.formats``.
+"""
+import os
+
+import numpy as np
+
+from lpsolver.formats import read_lp_model, read_mps_model, write_lp, write_mps
+from lpsolver.model import csr_from_coo, integer_mask, make_model, model_shape
+
+CHUNK_ROWS = 50_000
+RESERVED_COLUMNS = ("name", "sense", "rhs")
+OBJECTIVE_ROW = "objective"
+
+
+# ---------- Tabular Files ---------- #
+def _model_from_chunks(chunks, sense):
+    var_names = None
+    objective = None
+    rows, cols, vals = [], [], []
+    senses, rhs, con_names = [], [], []
+
+    for chunk in chunks:
+        if var_names is None:
+            columns = {str(col).strip().lower(): col for col in chunk.columns}
+            missing = [col for col in ("sense", "rhs") if col not in columns]
+            if missing:
+                raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+            name_col, sense_col, rhs_col = columns.get("name"), columns["sense"], columns["rhs"]
+            var_cols = [col for col in chunk.columns if str(col).strip().lower() not in RESERVED_COLUMNS]
+            if not var_cols:
+                raise ValueError("No variable columns found")
+            var_names = [str(col).strip() for col in var_cols]
+
+        names = chunk[name_col].astype(str).str.strip() if name_col is not None else None
+        block = chunk[var_cols].to_numpy(dtype=np.float64, na_value=0.0)
+
+        is_objective = (names.str.lower() == OBJECTIVE_ROW).to_numpy() if names is not None else np.zeros(len(block), bool)
+        if is_objective.any():
+            if objective is not None or is_objective.sum() > 1:
+                raise ValueError("The file contains more than one objective row")
+            objective = block[is_objective][0]
+            block = block[~is_objective]
+
+        # Only nonzero coefficients are kept, with row numbers offset by the rows already read
+        r, c = np.nonzero(block)
+        rows.append(r + len(rhs))
+        cols.append(c)
+        vals.append(block[r, c])
+
+        keep = ~is_objective
+        senses.extend(chunk[sense_col].to_numpy()[keep].tolist())
+        rhs.extend(chunk[rhs_col].to_numpy(dtype=np.float64)[keep].tolist())
+        if names is not None:
+            con_names.extend(names.to_numpy()[keep].tolist())
+
+    if var_names is None:
+        raise ValueError("The file is empty")
+    if objective is None:
+        raise ValueError(f"No '{OBJECTIVE_ROW}' row found")
+    if not con_names:
+        con_names = None
+
+    A = csr_from_coo(np.concatenate(rows), np.concatenate(cols), np.concatenate(vals),
+                     (len(rhs), len(var_names)))
+    return make_model(objective, A, senses, rhs, sense or "Maximize", var_names=var_names, con_names=con_names)
+
+
+def read_csv_model(source, sense="Maximize", chunk_rows=CHUNK_ROWS):
+    import pandas as pd
+
+    with pd.read_csv(source, chunksize=chunk_rows, skipinitialspace=True) as reader:
+        return _model_from_chunks(reader, sense)
+
+
+def read_parquet_model(source, sense="Maximize", chunk_rows=CHUNK_ROWS):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files requires pyarrow (pip install pyarrow)") from None
+
+    parquet_file = pq.ParquetFile(source)
+    return _model_from_chunks((batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunk_rows)), sense)
+
+
+# ---------- NumPy Archives ---------- #
+def read_npz_model(source, sense=None):
+    with np.load(source, allow_pickle=False) as archive:
+        arrays = {key: archive[key] for key in archive.files}
+
+    if "A" in arrays:
+        A = arrays["A"]
+    elif {"A_data", "A_indices", "A_indptr"} <= arrays.keys():
+        A = (arrays["A_data"], arrays["A_indices"], arrays["A_indptr"])
+    else:
+        raise ValueError("Archive must contain 'A' or 'A_data', 'A_indices' and 'A_indptr'")
+
+    rhs = arrays.get("rhs", arrays.get("b"))
+    if "c" not in arrays or rhs is None or "senses" not in arrays:
+        raise ValueError("Archive must contain 'c', 'rhs' (or 'b') and 'senses'")
+
+    # An explicit sense from the caller wins over the one stored in the archive
+    sense = sense or str(arrays.get("sense", "Maximize"))
+    return make_model(arrays["c"], A, arrays["senses"], rhs, sense,
+                      var_names=arrays["var_names"].tolist() if "var_names" in arrays else None,
+                      con_names=arrays["con_names"].tolist() if "con_names" in arrays else None,
+                      lb=arrays.get("lb"), ub=arrays.get("ub"), integer=arrays.get("integer"))
+
+
+def save_model_npz(model, target):
+    np.savez_compressed(target, **{key: np.asarray(value) for key, value in model.items()})
+
+
+# ---------- Dispatch & Summary ---------- #
+READERS = {
+    ".csv": read_csv_model,
+    ".parquet": read_parquet_model,
+    ".npz": read_npz_model,
+    ".mps": read_mps_model,
+    ".lp": read_lp_model,
+}
+WRITERS = {
+    ".npz": save_model_npz,
+    ".mps": write_mps,
+    ".lp": write_lp,
+}
+
+
+def _extension(filename):
+    # "model.mps.gz" -> ".mps"; the MPS / LP readers detect gzip on their own
+    root, extension = os.path.splitext(filename.lower())
+    return os.path.splitext(root)[1] if extension == ".gz" else extension
+
+
+def load_model(source, filename=None, sense=None):
+    """Reads a model file by extension. ``sense`` overrides the objective sense the file declares
+    (MPS and LP files default to Minimize, tabular files to Maximize)."""
+    filename = filename or getattr(source, "name", None) or str(source)
+    extension = _extension(filename)
+    if extension not in READERS:
+        raise ValueError(f"Unsupported file type '{extension}' (expected one of {', '.join(READERS)})")
+    return READERS[extension](source, sense=sense)
+
+
+def save_model(model, target, filename=None):
+    filename = filename or getattr(target, "name", None) or str(target)
+    extension = _extension(filename)
+    if extension not in WRITERS:
+        raise ValueError(f"Cannot write '{extension}' files (expected one of {', '.join(WRITERS)})")
+    WRITERS[extension](model, target)
+
+
+def model_summary(model):
+    num_constraints, num_vars = model_shape(model)
+    nnz = len(model["A_data"])
+    abs_coeffs = np.abs(model["A_data"])
+
+    def value_range(values):
+        return (float(values.min()), float(values.max())) if len(values) else (0.0, 0.0)
+
+    return {
+        "variables": num_vars,
+        "constraints": num_constraints,
+        "nonzeros": nnz,
+        "density": nnz / (num_vars * num_constraints) if num_vars and num_constraints else 0.0,
+        "matrix_range": value_range(abs_coeffs),
+        "objective_range": value_range(model["c"]),
+        "rhs_range": value_range(model["rhs"]),
+        "senses": {symbol: int((model["senses"] == code).sum()) for code, symbol in ((-1, "≤"), (0, "="), (1, "≥"))},
+        "integers": int(integer_mask(model).sum()),
+    }
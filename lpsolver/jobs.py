@@ -0,0 +1,238 @@
+"""Background solve jobs: one child process per solve, with live progress, a time limit and cancellation.
+
+The child leads its own process group, so cancelling (or hitting the hard time limit) kills
+CBC together with the Python process driving it. Progress comes from CBC's log, which the
+parent tails, or from a small shared array the NumPy simplex updates every few pivots.
+Results, and the updated warm-start basis for simplex jobs, come back over a pipe.
+"""
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import time
+import types
+import weakref
+
+RUNNING, DONE, FAILED, CANCELLED, TIMED_OUT = "running", "done", "failed", "cancelled", "timed_out"
+
+# CBC stops itself at the time limit and still reports its best point; a job that overruns
+# the limit by this much is killed instead
+KILL_GRACE_S = 2.0
+# Modules the fork server imports once, so each job starts without paying for them
+PRELOAD = ["lpsolver.solve", "pulp"]
+# CBC block-buffers its log when it writes to a file; coreutils' stdbuf preload, where present,
+# makes it line buffered so the parent sees progress while CBC runs
+STDBUF_LIBS = ("/usr/libexec/coreutils/libstdbuf.so", "/usr/lib/coreutils/libstdbuf.so",
+               "/usr/local/libexec/coreutils/libstdbuf.so")
+
+_context = None
+
+
+def _main_imports():
+    # Every job re-runs the parent's main script (CPython's fork server never preloads it, despite
+    # asking to); with the modules it imports preloaded that is cheap, e.g. for Streamlit's launcher
+    main = sys.modules.get("__main__")
+    if main is None or getattr(main, "__spec__", None) is not None:
+        return []
+    names = {value.__name__ if isinstance(value, types.ModuleType) else getattr(value, "__module__", None)
+             for value in vars(main).values()}
+    return sorted(name for name in names if isinstance(name, str) and name != "__main__" and name in sys.modules)
+
+
+def job_context():
+    # A fork server forks jobs from a clean single-threaded process with the solver already
+    # imported; where there is none (Windows), jobs are spawned like the batch workers
+    global _context
+    if _context is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            _context = multiprocessing.get_context("forkserver")
+            _context.set_forkserver_preload(PRELOAD + _main_imports())
+        else:
+            _context = multiprocessing.get_context("spawn")
+    return _context
+
+
+def start_job_server():
+    """Starts the fork server ahead of the first job; it imports PRELOAD in the background."""
+    if job_context().get_start_method() == "forkserver":
+        from multiprocessing import forkserver
+
+        forkserver.ensure_running()
+
+
+def _run(conn, model, options, warm_start, log_path, progress):
+    if hasattr(os, "setsid"):
+        os.setsid()
+    from lpsolver.solve import run_solve
+
+    def report(solver):
+        progress[0] = solver.iterations
+        progress[1] = float(solver.c @ solver.x[:solver.n])
+
+    try:
+        backend = options.get("backend", "CBC")
+        if backend == "CBC":
+            options = dict(options, log_path=log_path)
+            _line_buffer_subprocesses()
+        elif backend == "NumPy Simplex":
+            options = dict(options, progress=report)
+        result = run_solve(model, options, warm_start)
+        if backend != "NumPy Simplex":
+            warm_start = None
+        conn.send((DONE, result, warm_start))
+    except Exception as error:
+        conn.send((FAILED, f"{type(error).__name__}: {error}", None))
+    finally:
+        conn.close()
+
+
+def wait_any(jobs, timeout=None):
+    """Blocks until one of the running ``jobs`` has sent its outcome or ``timeout`` seconds pass."""
+    from multiprocessing.connection import wait
+
+    connections = [job._conn for job in jobs if job.state == RUNNING]
+    if connections:
+        wait(connections, timeout)
+
+
+def _line_buffer_subprocesses():
+    library = next((path for path in STDBUF_LIBS if os.path.exists(path)), None)
+    if library is not None:
+        preload = os.environ.get("LD_PRELOAD")
+        os.environ["LD_PRELOAD"] = f"{preload} {library}" if preload else library
+        os.environ["_STDBUF_O"] = "L"
+
+
+def _kill(process):
+    if process.pid is None or process.exitcode is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        # No process groups on this platform, or the child has not called setsid() yet
+        process.kill()
+
+
+def _cleanup(process, log_path):
+    _kill(process)
+    try:
+        os.remove(log_path)
+    except OSError:
+        pass
+
+
+class SolveJob:
+    """Solves ``model`` in a child process. Call :meth:`poll` to advance it; once it is no
+    longer RUNNING, ``result`` (DONE) or ``error`` (FAILED, CANCELLED, TIMED_OUT) is set.
+
+    ``options["time_limit"]`` (seconds) is passed to the solver and enforced by killing the
+    job ``KILL_GRACE_S`` later. A ``warm_start`` session is sent along for simplex jobs and
+    updated in place from the child's copy when the job finishes.
+    """
+
+    def __init__(self, model, options=None, warm_start=None):
+        self.options = dict(options or {})
+        self.time_limit = self.options.get("time_limit") or None
+        self.model = model
+        self.warm_start = warm_start
+        self.state = RUNNING
+        self.result = None
+        self.error = None
+        self.started = time.perf_counter()
+        self.finished = None
+
+        context = job_context()
+        fd, self.log_path = tempfile.mkstemp(prefix="lp-solver-job-", suffix=".log")
+        os.close(fd)
+        self._log_offset = 0
+        self._progress = {}
+        self._shared = context.Array("d", [math.nan, math.nan], lock=False)
+        self._conn, child_conn = context.Pipe(duplex=False)
+        self._process = context.Process(target=_run, daemon=True, name="lp-solver-job",
+                                        args=(child_conn, model, self.options, warm_start, self.log_path, self._shared))
+        self._process.start()
+        child_conn.close()
+        # An abandoned job (e.g. its browser session closed) must not leave a solver running
+        self._finalizer = weakref.finalize(self, _cleanup, self._process, self.log_path)
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def deadline(self):
+        return None if self.time_limit is None else self.time_limit + KILL_GRACE_S
+
+    def poll(self):
+        if self.state != RUNNING:
+            return self.state
+        # Read before checking liveness: a child with a large result blocks in send() until it is read
+        if self._conn.poll():
+            try:
+                state, payload, warm_start = self._conn.recv()
+            except EOFError:
+                state, payload, warm_start = FAILED, "The solver process exited without a result", None
+            if state == DONE:
+                self.result = payload
+                if warm_start is not None and self.warm_start is not None:
+                    self.warm_start.__dict__.update(warm_start.__dict__)
+            else:
+                self.error = payload
+            self._finish(state)
+        elif not self._process.is_alive():
+            self._finish(FAILED, f"The solver process exited with code {self._process.exitcode}")
+        elif self.deadline is not None and self.elapsed > self.deadline:
+            self._finish(TIMED_OUT, f"No result within the {self.time_limit:g}s time limit")
+        return self.state
+
+    def wait(self, timeout=None, interval=0.1):
+        """Waits until the job finishes or ``timeout`` seconds pass; returns the state."""
+        end = None if timeout is None else time.perf_counter() + timeout
+        while self.poll() == RUNNING:
+            remaining = interval if end is None else min(interval, end - time.perf_counter())
+            if remaining <= 0:
+                break
+            # Wakes up as soon as the result arrives; the interval bounds liveness and deadline checks
+            self._conn.poll(remaining)
+        return self.state
+
+    def cancel(self):
+        if self.poll() == RUNNING:
+            self._finish(CANCELLED, "Cancelled")
+        return self.state
+
+    def progress(self):
+        """Elapsed seconds plus whatever the solver has reported so far: ``iterations``,
+        ``objective`` (current point) and ``bound`` (on the optimum), and for a MIP the
+        ``incumbent`` (best integer solution) and explored ``nodes``."""
+        if self.state == RUNNING:
+            iterations, objective = self._shared[0], self._shared[1]
+            if not math.isnan(iterations):
+                self._progress.update(iterations=int(iterations), objective=objective)
+            self._progress.update(self._read_log())
+        return dict(self._progress, elapsed=self.elapsed)
+
+    def _read_log(self):
+        from lpsolver.solve import cbc_progress
+
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except OSError:
+            return {}
+        # Only complete lines are consumed; a partial last line is read again next time
+        complete = data[:data.rfind(b"\n") + 1]
+        self._log_offset += len(complete)
+        return cbc_progress(complete.decode(errors="replace"), maximize=self.model["sense"] == "Maximize")
+
+    def _finish(self, state, error=None):
+        self.state = state
+        self.finished = time.perf_counter()
+        if error is not None:
+            self.error = error
+        self._finalizer()
+        self._process.join(timeout=1.0)
+        self._conn.close()
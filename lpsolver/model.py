@@ -0,0 +1,200 @@
+"""Array representation of an LP (or MIP) and the bulk PuLP model builder."""
+import numpy as np
+
+# Constraint senses use PuLP's own codes (LpConstraintLE / EQ / GE)
+SENSE_CODES = {"<=": -1, "≤": -1, "<": -1, "L": -1,
+               "=": 0, "==": 0, "E": 0,
+               ">=": 1, "≥": 1, ">": 1, "G": 1}
+SENSE_SYMBOLS = {-1: "<=", 0: "=", 1: ">="}
+
+
+# ---------- Sparse Matrix Helpers ---------- #
+def csr_from_coo(rows, cols, vals, shape):
+    rows = np.asarray(rows, dtype=np.int64).ravel()
+    cols = np.asarray(cols, dtype=np.int64).ravel()
+    vals = np.asarray(vals, dtype=np.float64).ravel()
+    num_rows, num_cols = shape
+
+    if len(rows) and (rows.min() < 0 or rows.max() >= num_rows or cols.min() < 0 or cols.max() >= num_cols):
+        raise ValueError("COO indices fall outside the matrix shape")
+
+    # Sort by (row, col) and sum duplicate entries
+    order = np.lexsort((cols, rows))
+    rows, cols, vals = rows[order], cols[order], vals[order]
+    if len(rows):
+        starts = np.flatnonzero(np.r_[True, (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])])
+        vals = np.add.reduceat(vals, starts)
+        rows, cols = rows[starts], cols[starts]
+
+    # Skip zero coefficients entirely
+    keep = vals != 0
+    rows, cols, vals = rows[keep], cols[keep], vals[keep]
+
+    indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_rows), out=indptr[1:])
+    return vals, cols, indptr
+
+
+def csr_from_dense(A):
+    A = np.atleast_2d(np.asarray(A, dtype=np.float64))
+    rows, cols = np.nonzero(A)
+    return csr_from_coo(rows, cols, A[rows, cols], A.shape)
+
+
+def as_csr(A, num_cols=None):
+    # scipy.sparse matrices (CSR, CSC, COO, ...) are accepted without importing scipy
+    if hasattr(A, "tocoo"):
+        coo = A.tocoo()
+        return csr_from_coo(coo.row, coo.col, coo.data, coo.shape)
+    # (data, indices, indptr) CSR triple
+    if isinstance(A, tuple) and len(A) == 3:
+        data, indices, indptr = (np.asarray(a) for a in A)
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        if num_cols is None:
+            num_cols = int(indices.max(initial=-1)) + 1
+        return csr_from_coo(rows, indices, data, (len(indptr) - 1, num_cols))
+    return csr_from_dense(A)
+
+
+# ---------- Array Model ---------- #
+def sense_codes(senses):
+    senses = np.asarray(senses).ravel()
+    if senses.dtype.kind in "USO":
+        try:
+            senses = np.array([SENSE_CODES[str(s).strip().upper()] for s in senses], dtype=np.int8)
+        except KeyError as e:
+            raise ValueError(f"Unknown constraint sense {e.args[0]!r}") from None
+    return senses.astype(np.int8)
+
+
+def make_model(c, A, senses, rhs, sense="Maximize", var_names=None, con_names=None, lb=None, ub=None,
+               integer=None):
+    c = np.asarray(c, dtype=np.float64).ravel()
+    num_vars = len(c)
+    data, indices, indptr = as_csr(A, num_vars)
+    num_constraints = len(indptr) - 1
+
+    senses = sense_codes(senses)
+    rhs = np.asarray(rhs, dtype=np.float64).ravel()
+    if len(senses) != num_constraints or len(rhs) != num_constraints:
+        raise ValueError(f"Expected {num_constraints} senses and right-hand sides, "
+                         f"got {len(senses)} and {len(rhs)}")
+    if num_constraints and not np.isin(senses, (-1, 0, 1)).all():
+        raise ValueError("Constraint senses must be '<=', '=' or '>='")
+    if len(indices) and indices.max() >= num_vars:
+        raise ValueError("Constraint matrix has more columns than the objective vector")
+
+    lb = np.zeros(num_vars) if lb is None else np.broadcast_to(np.asarray(lb, dtype=np.float64), (num_vars,)).copy()
+    ub = np.full(num_vars, np.inf) if ub is None else np.broadcast_to(np.asarray(ub, dtype=np.float64), (num_vars,)).copy()
+    integer = (np.zeros(num_vars, dtype=bool) if integer is None
+               else np.broadcast_to(np.asarray(integer, dtype=bool), (num_vars,)).copy())
+
+    return {
+        "sense": sense,
+        "c": c,
+        "A_data": data,
+        "A_indices": indices,
+        "A_indptr": indptr,
+        "senses": senses,
+        "rhs": rhs,
+        "lb": lb,
+        "ub": ub,
+        "integer": integer,
+        "var_names": list(var_names) if var_names is not None else [f"x{i + 1}" for i in range(num_vars)],
+        "con_names": list(con_names) if con_names is not None else [f"Constraint_{j + 1}" for j in range(num_constraints)],
+    }
+
+
+def model_from_constraints(num_vars, obj_coeffs, constraints, problem_type, variable_names=None,
+                           lb=None, ub=None, integer=None):
+    # Converts the (name, coeffs, ineq, rhs) tuples collected by the UI into an array model
+    names = [name for name, _, _, _ in constraints]
+    A = np.array([coeffs[:num_vars] for _, coeffs, _, _ in constraints], dtype=np.float64).reshape(len(constraints), num_vars)
+    senses = [ineq for _, _, ineq, _ in constraints]
+    rhs = [rhs for _, _, _, rhs in constraints]
+    return make_model(obj_coeffs[:num_vars], A, senses, rhs, problem_type,
+                      var_names=variable_names, con_names=names, lb=lb, ub=ub, integer=integer)
+
+
+def model_to_constraints(model):
+    # Inverse of model_from_constraints
+    A = dense_matrix(model)
+    return [(name, A[j].tolist(), SENSE_SYMBOLS[sense], rhs)
+            for j, (name, sense, rhs) in enumerate(zip(model["con_names"], model["senses"].tolist(), model["rhs"].tolist()))]
+
+
+def select_rows(model, rows):
+    """``model`` with only the constraints ``rows`` (indices, in the order given)."""
+    rows = np.asarray(rows, dtype=np.int64)
+    starts, ends = model["A_indptr"][rows], model["A_indptr"][rows + 1]
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(ends - starts, out=indptr[1:])
+    entries = np.repeat(starts - indptr[:-1], np.diff(indptr)) + np.arange(indptr[-1])
+    return dict(model, A_data=model["A_data"][entries], A_indices=model["A_indices"][entries], A_indptr=indptr,
+                senses=model["senses"][rows], rhs=model["rhs"][rows],
+                con_names=[model["con_names"][j] for j in rows.tolist()])
+
+
+def format_constraint(model, j):
+    names, start, end = model["var_names"], model["A_indptr"][j], model["A_indptr"][j + 1]
+    terms = []
+    for i, coeff in zip(model["A_indices"][start:end].tolist(), model["A_data"][start:end].tolist()):
+        sign = "-" if coeff < 0 else "+"
+        magnitude = "" if abs(coeff) == 1 else f"{abs(coeff):g}*"
+        terms.append(f"{sign} {magnitude}{names[i]}")
+    lhs = " ".join(terms).lstrip("+ ") if terms else "0"
+    if lhs.startswith("- "):
+        lhs = "-" + lhs[2:]
+    return f"{lhs} {SENSE_SYMBOLS[int(model['senses'][j])]} {model['rhs'][j]:g}"
+
+
+def integer_mask(model):
+    # Hand-built model dicts without the key are all continuous
+    integer = model.get("integer")
+    return np.zeros(len(model["c"]), dtype=bool) if integer is None else integer
+
+
+def is_mip(model):
+    return bool(integer_mask(model).any())
+
+
+def model_shape(model):
+    return len(model["A_indptr"]) - 1, len(model["c"])
+
+
+def dense_matrix(model):
+    num_constraints, num_vars = model_shape(model)
+    A = np.zeros((num_constraints, num_vars))
+    rows = np.repeat(np.arange(num_constraints), np.diff(model["A_indptr"]))
+    A[rows, model["A_indices"]] = model["A_data"]
+    return A
+
+
+# ---------- PuLP Builder ---------- #
+def build_pulp_problem(model, name="LP"):
+    from pulp import (LpAffineExpression, LpConstraint, LpContinuous, LpInteger, LpMaximize, LpMinimize,
+                      LpProblem, LpVariable)
+
+    prob = LpProblem(name, LpMaximize if model["sense"] == "Maximize" else LpMinimize)
+    lb, ub, integer = model["lb"].tolist(), model["ub"].tolist(), integer_mask(model).tolist()
+    vars_lp = [LpVariable(f"x{i + 1}",
+                          lowBound=lb[i] if lb[i] != -np.inf else None,
+                          upBound=ub[i] if ub[i] != np.inf else None,
+                          cat=LpInteger if integer[i] else LpContinuous)
+               for i in range(len(model["c"]))]
+
+    # Every variable appears in the objective (zeros included) so PuLP keeps track of all columns
+    prob.setObjective(LpAffineExpression(zip(vars_lp, model["c"].tolist())))
+
+    # One affine expression per row straight from the CSR slices, no per-term Python arithmetic
+    var_array = np.empty(len(vars_lp), dtype=object)
+    var_array[:] = vars_lp
+    data, indices, indptr = model["A_data"].tolist(), model["A_indices"], model["A_indptr"].tolist()
+    senses, rhs, names = model["senses"].tolist(), model["rhs"].tolist(), model["con_names"]
+
+    for j in range(len(senses)):
+        start, end = indptr[j], indptr[j + 1]
+        expr = LpAffineExpression(zip(var_array[indices[start:end]].tolist(), data[start:end]))
+        prob.addConstraint(LpConstraint(expr, senses[j], names[j], rhs[j]))
+
+    return prob, vars_lp
@@ -0,0 +1,110 @@
+"""Parametric analysis: the optimal objective as one right-hand side or objective coefficient varies.
+
+The optimal-value function is piecewise linear in either parameter. One simplex solve at the
+start value gives an optimal basis; the sweep then follows it in both directions and only
+pivots where the basis stops being optimal, so the exact breakpoints cost a handful of
+pivots rather than a solve per grid point.
+"""
+import time
+
+import numpy as np
+
+from lpsolver.simplex import OPTIMAL, STATUS_NAMES, UNDEFINED, SimplexSolver
+
+PARAMETERS = {"rhs": "Right-hand side", "objective": "Objective coefficient"}
+
+
+def _parameter_index(model, kind, name):
+    if kind not in PARAMETERS:
+        raise ValueError(f"Unknown parameter kind '{kind}' (expected one of {', '.join(PARAMETERS)})")
+    names = model["con_names"] if kind == "rhs" else model["var_names"]
+    if name not in names:
+        raise ValueError(f"No {'constraint' if kind == 'rhs' else 'variable'} named '{name}'")
+    return list(names).index(name)
+
+
+def parameter_value(model, kind, name):
+    index = _parameter_index(model, kind, name)
+    return float((model["rhs"] if kind == "rhs" else model["c"])[index])
+
+
+def _follow(solver, kind, index, length):
+    if length == 0:
+        return [solver._breakpoint(0.0)], OPTIMAL
+    if kind == "rhs":
+        return solver.parametric_rhs(index, length)
+    return solver.parametric_cost(index, length)
+
+
+def parametric_sweep(model, kind, name, low, high, max_iter=None):
+    """Traces the optimal objective while the right-hand side of constraint ``name``
+    (``kind="rhs"``) or the objective coefficient of variable ``name`` (``kind="objective"``)
+    moves over [low, high].
+
+    Returns a dict with the breakpoints (``values``, ``objective``, ``x`` rows), the slope of
+    each segment, and the status past either end: "Infeasible" or "Unbounded" when the
+    problem has no optimum beyond the last breakpoint on that side.
+    """
+    index = _parameter_index(model, kind, name)
+    if not low <= high:
+        raise ValueError("The sweep range needs low <= high")
+    start_time = time.perf_counter()
+
+    # Solve once at the current value (clipped into the range) and follow the basis both ways
+    start = min(max(parameter_value(model, kind, name), low), high)
+    key = "rhs" if kind == "rhs" else "c"
+    values = np.array(model[key], dtype=np.float64)
+    values[index] = start
+    start_model = dict(model, **{key: values})
+
+    solver = SimplexSolver(start_model, max_iter=max_iter)
+    status = solver.solve()
+    sweep = {"kind": kind, "name": name, "low": low, "high": high, "start": start,
+             "status": STATUS_NAMES[status], "status_below": STATUS_NAMES[status],
+             "status_above": STATUS_NAMES[status], "pivots": 0,
+             "values": np.empty(0), "objective": np.empty(0), "slopes": np.empty(0),
+             "x": np.empty((0, len(model["c"])))}
+    if status != OPTIMAL:
+        sweep["solve_time"] = time.perf_counter() - start_time
+        return sweep
+
+    downward = SimplexSolver(start_model, max_iter=max_iter)
+    state = solver.basis_state()
+    if state is not None:
+        downward.load_basis(state)
+    elif downward.solve() != OPTIMAL:
+        downward = None
+    cold_iterations = solver.iterations
+
+    above, status_above = _follow(solver, kind, index, high - start)
+    if downward is None:
+        below, status_below = above[:1], UNDEFINED
+    else:
+        below, status_below = _follow(downward, kind, index, low - start)
+    sweep["status_below"], sweep["status_above"] = STATUS_NAMES[status_below], STATUS_NAMES[status_above]
+    sweep["pivots"] = solver.iterations - cold_iterations + (downward.iterations if downward is not None else 0)
+
+    if kind == "objective":
+        # x jumps at objective breakpoints; every row carries the solution of the segment to its right
+        above = [(offset, objective, x) for (offset, objective, _), (_, _, x) in zip(above, above[1:] + above[-1:])]
+
+    # Degenerate pivots repeat a breakpoint; keep the last point per parameter value
+    points = below[::-1] + above[1:]
+    values = start + np.array([offset for offset, _, _ in points])
+    keep = np.r_[np.abs(np.diff(values)) > 1e-12 * max(1.0, np.abs(values).max()), True]
+    sweep["values"] = values[keep]
+    sweep["objective"] = np.array([objective for _, objective, _ in points])[keep]
+    sweep["x"] = np.array([x for _, _, x in points])[keep]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sweep["slopes"] = np.diff(sweep["objective"]) / np.diff(sweep["values"])
+    sweep["solve_time"] = time.perf_counter() - start_time
+    return sweep
+
+
+def sweep_table(model, sweep):
+    """One row per breakpoint: parameter value, objective, slope of the next segment and x."""
+    label = f"{'RHS' if sweep['kind'] == 'rhs' else 'Coeff.'} of {sweep['name']}"
+    slopes = np.r_[sweep["slopes"], np.nan]
+    return [{label: float(value), "Objective": float(objective), "Slope": float(slope),
+             **dict(zip(model["var_names"], x.tolist()))}
+            for value, objective, slope, x in zip(sweep["values"], sweep["objective"], slopes, sweep["x"])]
@@ -0,0 +1,255 @@
+"""Solver portfolio: racing several backend configurations and learning which is fastest.
+
+A configuration is a backend plus one of its presets ("CBC · Dual Simplex"). A RaceJob runs
+one SolveJob per configuration on the same model; the first to prove an answer (optimal,
+infeasible or unbounded) wins and the others are cancelled. TimingHistory keeps recent solve
+times per configuration and problem shape, so the fastest configuration for a new problem
+can be picked from the ones that did best on problems like it.
+"""
+import json
+import math
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+from lpsolver.jobs import CANCELLED, DONE, FAILED, RUNNING, TIMED_OUT, SolveJob, wait_any
+from lpsolver.model import is_mip, model_shape
+from lpsolver.profiling import write_text_atomic
+from lpsolver.solve import DEFAULT_PRESET, FEASIBLE, LP_ONLY_BACKENDS, PRESETS
+
+# Outcomes a racer can stop the race with: later finishers could only confirm them
+CONCLUSIVE_STATUSES = ("Optimal", "Infeasible", "Unbounded")
+CONFIG_SEPARATOR = " · "
+
+
+# ---------- Configurations ---------- #
+def config_label(backend, preset=None):
+    return f"{backend}{CONFIG_SEPARATOR}{preset or DEFAULT_PRESET}"
+
+
+def parse_config(label):
+    backend, _, preset = label.partition(CONFIG_SEPARATOR)
+    return backend, preset or DEFAULT_PRESET
+
+
+def configurations(backends, mip=False):
+    """Every (backend, preset) pair of ``backends``; for a MIP only those with branch and bound."""
+    return [(backend, preset) for backend in backends if not (mip and backend in LP_ONLY_BACKENDS)
+            for preset in PRESETS[backend]]
+
+
+def config_options(options, backend, preset=None):
+    """``options`` set to one configuration; the default preset is left out so cache keys stay as before."""
+    options = {key: value for key, value in options.items() if key not in ("race", "preset")}
+    options["backend"] = backend
+    if preset and preset != DEFAULT_PRESET:
+        options["preset"] = preset
+    return options
+
+
+def shape_bucket(model):
+    """LP or MIP, with the row and column counts rounded up to powers of ten: "LP 10^2x10^3"."""
+    rows, cols = model_shape(model)
+    kind = "MIP" if is_mip(model) else "LP"
+    return f"{kind} 10^{math.ceil(math.log10(max(rows, 1)))}x10^{math.ceil(math.log10(max(cols, 1)))}"
+
+
+# ---------- Racing ---------- #
+class _Racer:
+    def __init__(self, backend, preset, job):
+        self.backend = backend
+        self.preset = preset or DEFAULT_PRESET
+        self.label = config_label(backend, preset)
+        self.job = job
+
+
+def _finished_at(racer):
+    # Racers that finished between two polls are told apart by their own solve times
+    job = racer.job
+    if job.state != DONE:
+        return job.finished
+    return min(job.finished, job.started + job.result["solve_time"] + (job.result.get("build_time") or 0.0))
+
+
+class RaceJob:
+    """Solves ``model`` with every configuration in ``options["race"]`` (a list of [backend,
+    preset] pairs) at once. Has SolveJob's interface; its ``result`` is the winner's, with a
+    ``race`` list of every racer's outcome in finishing order.
+
+    Without a conclusive answer the best finished result is used: a MIP's best feasible
+    solution, then any point found at the time limit. The race fails only when every racer did.
+    """
+
+    def __init__(self, model, options=None, warm_start=None):
+        self.options = dict(options or {})
+        self.time_limit = self.options.get("time_limit") or None
+        self.model = model
+        self.warm_start = warm_start
+        self.state = RUNNING
+        self.result = None
+        self.error = None
+        self.started = time.perf_counter()
+        self.finished = None
+        self.racers = []
+        for backend, preset in self.options["race"]:
+            # Only one simplex racer can update the session's warm-start basis
+            warm = warm_start if backend == "NumPy Simplex" and not any(
+                racer.job.warm_start is not None for racer in self.racers) else None
+            job = SolveJob(model, config_options(self.options, backend, preset), warm_start=warm)
+            self.racers.append(_Racer(backend, preset, job))
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def poll(self):
+        if self.state != RUNNING:
+            return self.state
+        for racer in self.racers:
+            racer.job.poll()
+        finished = sorted((racer for racer in self.racers if racer.job.state != RUNNING), key=_finished_at)
+        done = [racer for racer in finished if racer.job.state == DONE]
+        winner = next((racer for racer in done if racer.job.result["status"] in CONCLUSIVE_STATUSES), None)
+        if winner is None and len(finished) < len(self.racers):
+            return self.state
+        for racer in self.racers:
+            racer.job.cancel()
+        if winner is None and done:
+            winner = min(done, key=lambda racer: self._rank(racer.job.result))
+        if winner is None:
+            timed_out = any(racer.job.state == TIMED_OUT for racer in self.racers)
+            errors = "; ".join(f"{racer.label}: {racer.job.error}" for racer in self.racers)
+            self._finish(TIMED_OUT if timed_out else FAILED, f"Every solver failed ({errors})")
+        else:
+            self.result = dict(winner.job.result, race=self.standings(winner))
+            self._finish(DONE)
+        return self.state
+
+    def _rank(self, result):
+        # Feasible MIP solutions first, best objective first, then anything with a point
+        objective = result.get("objective")
+        if objective is None or math.isnan(objective):
+            objective = math.inf
+        elif self.model["sense"] == "Maximize":
+            objective = -objective
+        return result["status"] != FEASIBLE, objective
+
+    def standings(self, winner=None):
+        """Every racer's outcome so far, finished ones first in finishing order."""
+        order = sorted(self.racers, key=lambda racer: math.inf if racer.job.state == RUNNING else _finished_at(racer))
+        return [{
+            "config": racer.label,
+            "backend": racer.backend,
+            "preset": racer.preset,
+            "state": racer.job.state,
+            "status": racer.job.result["status"] if racer.job.state == DONE else None,
+            "objective": racer.job.result["objective"] if racer.job.state == DONE else None,
+            "seconds": racer.job.result["solve_time"] if racer.job.state == DONE else racer.job.elapsed,
+            "winner": racer is winner,
+        } for racer in order]
+
+    def wait(self, timeout=None, interval=0.1):
+        end = None if timeout is None else time.perf_counter() + timeout
+        while self.poll() == RUNNING:
+            remaining = interval if end is None else min(interval, end - time.perf_counter())
+            if remaining <= 0:
+                break
+            wait_any([racer.job for racer in self.racers], remaining)
+        return self.state
+
+    def cancel(self):
+        if self.poll() == RUNNING:
+            for racer in self.racers:
+                racer.job.cancel()
+            self._finish(CANCELLED, "Cancelled")
+        return self.state
+
+    def progress(self):
+        """Elapsed seconds, plus ``racers``: each configuration's state and SolveJob progress."""
+        return {"elapsed": self.elapsed,
+                "racers": [dict(racer.job.progress(), config=racer.label, state=racer.job.state)
+                           for racer in self.racers]}
+
+    def _finish(self, state, error=None):
+        self.state = state
+        self.finished = time.perf_counter()
+        if error is not None:
+            self.error = error
+
+
+def start_job(model, options=None, warm_start=None):
+    """A RaceJob when ``options`` name several configurations to race, else a SolveJob."""
+    if (options or {}).get("race"):
+        return RaceJob(model, options, warm_start=warm_start)
+    return SolveJob(model, options, warm_start=warm_start)
+
+
+# ---------- Timing History ---------- #
+class TimingHistory:
+    """Thread-safe recent solve times per (shape bucket, configuration), with race wins and
+    entries; saved as JSON to ``path`` after every update when one is given."""
+
+    def __init__(self, path=None, max_samples=20):
+        self.path = path
+        self.max_samples = max_samples
+        self._stats = {}  # (bucket, config) -> {"seconds": deque, "wins": int, "races": int}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for row in json.load(f):
+                    stats = self._entry(row["bucket"], row["config"])
+                    stats["seconds"].extend(row["seconds"])
+                    stats["wins"], stats["races"] = row["wins"], row["races"]
+
+    def _entry(self, bucket, config):
+        return self._stats.setdefault((bucket, config), {"seconds": deque(maxlen=self.max_samples),
+                                                         "wins": 0, "races": 0})
+
+    def record(self, model, options, result):
+        """Adds a fresh result's times: every finished racer's for a race, else the solver's own
+        (a warm-started simplex time says little about the configuration, so it is skipped)."""
+        if result.get("cached") or result.get("warm_start"):
+            return
+        bucket = shape_bucket(model)
+        with self._lock:
+            if "race" in result:
+                for racer in result["race"]:
+                    stats = self._entry(bucket, racer["config"])
+                    stats["races"] += 1
+                    stats["wins"] += racer["winner"]
+                    if racer["status"] in CONCLUSIVE_STATUSES:
+                        stats["seconds"].append(racer["seconds"])
+            elif result["status"] in CONCLUSIVE_STATUSES:
+                config = config_label(options.get("backend", "CBC"), options.get("preset"))
+                self._entry(bucket, config)["seconds"].append(result["solve_time"])
+            else:
+                return
+            self._save()
+
+    def recommend(self, model, candidates):
+        """The (backend, preset) among ``candidates`` with the lowest median time on problems of
+        this shape, or None when none of them has been timed on one yet."""
+        bucket = shape_bucket(model)
+        with self._lock:
+            timed = [(statistics.median(self._stats[bucket, config_label(*candidate)]["seconds"]), candidate)
+                     for candidate in candidates
+                     if self._stats.get((bucket, config_label(*candidate)), {}).get("seconds")]
+        return min(timed)[1] if timed else None
+
+    def table(self):
+        """One row per (shape bucket, configuration), fastest median first within each bucket."""
+        with self._lock:
+            rows = [{"bucket": bucket, "config": config, "solves": len(stats["seconds"]),
+                     "median_s": statistics.median(stats["seconds"]) if stats["seconds"] else None,
+                     "races": stats["races"], "wins": stats["wins"]}
+                    for (bucket, config), stats in self._stats.items()]
+        return sorted(rows, key=lambda row: (row["bucket"], row["median_s"] is None, row["median_s"] or 0.0))
+
+    def _save(self):
+        if self.path:
+            rows = [{"bucket": bucket, "config": config, "seconds": list(stats["seconds"]),
+                     "wins": stats["wins"], "races": stats["races"]}
+                    for (bucket, config), stats in self._stats.items()]
+            write_text_atomic(self.path, json.dumps(rows))
@@ -0,0 +1,464 @@
+"""Presolve and scaling of an array model ahead of the solver, and the postsolve that undoes them.
+
+Reductions, repeated until none applies:
+
+* empty rows are checked and dropped;
+* singleton rows become bounds on their variable (rounded for integer variables);
+* duplicate rows (equal up to a factor) keep only the tightest copy;
+* rows that no combination of the variable bounds can violate are dropped;
+* fixed variables are substituted into the right-hand sides, and variables left in no row
+  are set to whichever bound their objective coefficient favours.
+
+The reduced model is then scaled by geometric means of its row and column coefficients
+(powers of two, so scaling itself adds no rounding error; integer columns are not scaled).
+Postsolve maps the solver's values, duals, reduced costs and ranges back to the original
+model. The ranges of dropped rows that still bind, through the bound they became, are read
+off the basis of the original model.
+"""
+import time
+
+import numpy as np
+
+from lpsolver.model import integer_mask, make_model, model_shape
+
+KEPT, EMPTY, SINGLETON, DUPLICATE, REDUNDANT = 0, 1, 2, 3, 4
+ROW_REDUCTIONS = {EMPTY: "empty", SINGLETON: "singleton", DUPLICATE: "duplicate", REDUNDANT: "redundant"}
+FIXED, FREE_COLUMN = 1, 2
+COLUMN_REDUCTIONS = {FIXED: "fixed", FREE_COLUMN: "empty"}
+# Feasibility tolerance of the reductions, relative to the size of the right-hand side or bound
+TOLERANCE = 1e-9
+# Dual feasibility tolerance when checking the postsolved duals
+DUAL_TOLERANCE = 1e-7
+SCALING_PASSES = 8
+
+
+def coefficient_spread(values):
+    """Largest over smallest absolute nonzero coefficient; 1.0 for an empty matrix."""
+    values = np.abs(np.asarray(values))
+    return float(values.max() / values.min()) if len(values) else 1.0
+
+
+def geometric_scaling(rows, cols, vals, shape, fixed_columns, passes=SCALING_PASSES):
+    """Row and column factors (powers of two) bringing each row's and column's coefficients
+    around 1; ``fixed_columns`` keep a factor of 1."""
+    num_rows, num_cols = shape
+    r, s = np.ones(num_rows), np.ones(num_cols)
+    magnitude = np.abs(vals)
+    for _ in range(passes):
+        for factors, index, other, size in ((r, rows, s[cols], num_rows), (s, cols, r[rows], num_cols)):
+            a = magnitude * other * factors[index]
+            high, low = np.zeros(size), np.full(size, np.inf)
+            np.maximum.at(high, index, a)
+            np.minimum.at(low, index, a)
+            present = high > 0
+            factors[present] /= np.sqrt(high[present] * low[present])
+        s[fixed_columns] = 1.0
+    return np.exp2(np.round(np.log2(r))), np.exp2(np.round(np.log2(s)))
+
+
+class Presolve:
+    """The reductions of one model. ``model`` is the reduced (and scaled) model for the solver,
+    or None when presolve alone decided the problem: ``status`` is then "Optimal" (every
+    variable fixed), "Infeasible" or "Unbounded". ``report`` counts what was removed."""
+
+    def __init__(self, model, scale=True, max_passes=20):
+        start = time.perf_counter()
+        self.original = model
+        self.maximize = model["sense"] == "Maximize"
+        num_rows, num_cols = model_shape(model)
+        self.rows = np.repeat(np.arange(num_rows), np.diff(model["A_indptr"]))
+        self.cols = np.asarray(model["A_indices"], dtype=np.int64)
+        self.vals = np.asarray(model["A_data"], dtype=np.float64)
+        self.senses = np.asarray(model["senses"])
+        self.integer = integer_mask(model)
+        self.lb = np.asarray(model["lb"], dtype=np.float64).copy()
+        self.ub = np.asarray(model["ub"], dtype=np.float64).copy()
+        self.rhs = np.asarray(model["rhs"], dtype=np.float64).copy()
+        self.row_kind = np.zeros(num_rows, dtype=np.int8)
+        self.col_kind = np.zeros(num_cols, dtype=np.int8)
+        self.value = np.full(num_cols, np.nan)  # values of removed columns
+        self.lb_row = np.full(num_cols, -1)  # singleton row that set each tightened bound
+        self.ub_row = np.full(num_cols, -1)
+        self.singleton = np.zeros(num_rows)  # coefficient of each singleton row
+        self.twin = np.full(num_rows, -1)  # kept copy of each duplicate row, and the factor between them
+        self.twin_factor = np.ones(num_rows)
+        self.offset = 0.0
+        self.tightened = 0
+        self.status = None
+        self.reason = None
+        self.model = None
+        self.row_scale = self.col_scale = None
+
+        self.lb[self.integer] = np.ceil(self.lb[self.integer] - TOLERANCE)
+        self.ub[self.integer] = np.floor(self.ub[self.integer] + TOLERANCE)
+        passes = 0
+        while self.status is None and passes < max_passes:
+            passes += 1
+            if not self._reduce():
+                break
+        if self.status is None:
+            self._build(scale)
+        self.report = self._report(passes, time.perf_counter() - start)
+
+    # ---------- Reductions ---------- #
+    def _infeasible(self, reason):
+        self.status, self.reason = "Infeasible", reason
+
+    def _tolerance(self, values):
+        return TOLERANCE * np.maximum(1.0, np.abs(values))
+
+    def _active(self):
+        return (self.row_kind[self.rows] == KEPT) & (self.col_kind[self.cols] == KEPT)
+
+    def _reduce(self):
+        changed = False
+        names = self.original["var_names"]
+        crossed = (self.col_kind == KEPT) & (self.lb > self.ub + self._tolerance(self.ub))
+        if crossed.any():
+            self._infeasible(f"{names[np.flatnonzero(crossed)[0]]} has a lower bound above its upper bound")
+            return False
+        width = self.ub - self.lb
+        fixed = (self.col_kind == KEPT) & np.isfinite(width) & (width <= self._tolerance(self.ub))
+        if fixed.any():
+            self._fix(fixed, self.lb[fixed], FIXED)
+            changed = True
+
+        for step in (self._empty_rows, self._singleton_rows, self._redundant_rows, self._duplicate_rows,
+                     self._empty_columns):
+            if self.status is not None:
+                return False
+            changed |= step()
+        return changed
+
+    def _fix(self, mask, values, kind):
+        self.value[mask] = values
+        self.col_kind[mask] = kind
+        self.offset += float(self.original["c"][mask] @ values)
+        entries = mask[self.cols] & (self.row_kind[self.rows] == KEPT)
+        np.subtract.at(self.rhs, self.rows[entries], self.vals[entries] * self.value[self.cols[entries]])
+
+    def _row_counts(self):
+        active = self._active()
+        return np.bincount(self.rows[active], minlength=len(self.rhs)), active
+
+    def _empty_rows(self):
+        counts, _ = self._row_counts()
+        empty = (self.row_kind == KEPT) & (counts == 0)
+        if not empty.any():
+            return False
+        rhs, senses, tol = self.rhs[empty], self.senses[empty], self._tolerance(self.rhs[empty])
+        violated = np.where(senses < 0, rhs < -tol, np.where(senses > 0, rhs > tol, np.abs(rhs) > tol))
+        if violated.any():
+            self._infeasible(f"{self.original['con_names'][np.flatnonzero(empty)[violated][0]]} "
+                             f"cannot hold once its variables are fixed")
+            return False
+        self.row_kind[empty] = EMPTY
+        return True
+
+    def _singleton_rows(self):
+        counts, active = self._row_counts()
+        entries = np.flatnonzero(active & (counts[self.rows] == 1) & (self.row_kind[self.rows] == KEPT))
+        for e in entries:
+            i, j, a = self.rows[e], self.cols[e], self.vals[e]
+            bound, sense = self.rhs[i] / a, int(self.senses[i]) * (1 if a > 0 else -1)
+            if self.integer[j]:
+                if sense == 0 and abs(bound - round(bound)) > TOLERANCE * max(1.0, abs(bound)):
+                    self._infeasible(f"{self.original['con_names'][i]} fixes integer "
+                                     f"{self.original['var_names'][j]} to {bound:g}")
+                    return False
+                upper, lower = np.floor(bound + TOLERANCE), np.ceil(bound - TOLERANCE)
+            else:
+                upper = lower = bound
+            if sense <= 0 and upper < self.ub[j]:
+                self.ub[j], self.ub_row[j] = upper, i
+                self.tightened += 1
+            if sense >= 0 and lower > self.lb[j]:
+                self.lb[j], self.lb_row[j] = lower, i
+                self.tightened += 1
+            self.row_kind[i], self.singleton[i] = SINGLETON, a
+            if self.lb[j] > self.ub[j] + self._tolerance(self.ub[j]):
+                self._infeasible(f"{self.original['con_names'][i]} leaves {self.original['var_names'][j]} no values")
+                return False
+        return len(entries) > 0
+
+    def _activity_bounds(self, active):
+        # Smallest and largest row activity the variable bounds allow (infinite terms stay infinite)
+        rows, a = self.rows[active], self.vals[active]
+        lb, ub = self.lb[self.cols[active]], self.ub[self.cols[active]]
+        low, high = np.zeros(len(self.rhs)), np.zeros(len(self.rhs))
+        np.add.at(low, rows, np.where(a > 0, a * lb, a * ub))
+        np.add.at(high, rows, np.where(a > 0, a * ub, a * lb))
+        return low, high
+
+    def _redundant_rows(self):
+        _, active = self._row_counts()
+        low, high = self._activity_bounds(active)
+        kept, rhs, tol = self.row_kind == KEPT, self.rhs, self._tolerance(self.rhs)
+        violated = kept & (((self.senses <= 0) & (low > rhs + tol)) | ((self.senses >= 0) & (high < rhs - tol)))
+        if violated.any():
+            self._infeasible(f"{self.original['con_names'][np.flatnonzero(violated)[0]]} "
+                             f"cannot hold within the variable bounds")
+            return False
+        redundant = kept & (((self.senses < 0) & (high <= rhs + tol)) | ((self.senses > 0) & (low >= rhs - tol)))
+        self.row_kind[redundant] = REDUNDANT
+        return bool(redundant.any())
+
+    def _duplicate_rows(self):
+        # Rows are compared scaled so their first coefficient is 1; a negative factor flips the sense
+        _, active = self._row_counts()
+        rows, cols, vals = self.rows[active], self.cols[active], self.vals[active]
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]]) if len(rows) else np.array([], dtype=np.int64)
+        groups = {}
+        for begin, end in zip(starts, np.r_[starts[1:], len(rows)].astype(np.int64)):
+            if end - begin < 2:
+                continue
+            i, first = rows[begin], vals[begin]
+            key = (cols[begin:end].tobytes(), np.round(vals[begin:end] / first, 12).tobytes())
+            groups.setdefault(key, []).append((i, first))
+        changed = False
+        for members in groups.values():
+            if len(members) > 1:
+                changed |= self._merge_duplicates(members)
+                if self.status is not None:
+                    return False
+        return changed
+
+    def _merge_duplicates(self, members):
+        # Normalized rows: sense and right-hand side of (row / first coefficient)
+        normal = [(i, int(self.senses[i]) * (1 if f > 0 else -1), self.rhs[i] / f, f) for i, f in members]
+        equal = [row for row in normal if row[1] == 0]
+        upper = min((row for row in normal if row[1] < 0), key=lambda row: row[2], default=None)
+        lower = max((row for row in normal if row[1] > 0), key=lambda row: row[2], default=None)
+        keep = [equal[0]] if equal else [row for row in (upper, lower) if row is not None]
+        value_low = equal[0][2] if equal else (lower[2] if lower else -np.inf)
+        value_high = equal[0][2] if equal else (upper[2] if upper else np.inf)
+        for i, sense, rhs, f in normal:
+            tol = TOLERANCE * max(1.0, abs(rhs))
+            if (sense <= 0 and value_low > rhs + tol) or (sense >= 0 and value_high < rhs - tol):
+                self._infeasible(f"{self.original['con_names'][i]} contradicts a copy of itself")
+                return False
+        removed = False
+        for i, sense, rhs, f in normal:
+            if any(i == row[0] for row in keep):
+                continue
+            twin = next(row for row in keep if row[1] == 0 or row[1] == sense) if sense != 0 else keep[0]
+            self.row_kind[i], self.twin[i], self.twin_factor[i] = DUPLICATE, twin[0], f / twin[3]
+            removed = True
+        return removed
+
+    def _empty_columns(self):
+        active = self._active()
+        counts = np.bincount(self.cols[active], minlength=len(self.lb))
+        empty = (self.col_kind == KEPT) & (counts == 0)
+        if not empty.any():
+            return False
+        # Each goes to the bound its cost favours; one that could improve without limit stays for the solver
+        cost = self.original["c"] * (-1.0 if self.maximize else 1.0)
+        value = np.where(cost > 0, self.lb, np.where(cost < 0, self.ub, np.clip(0.0, self.lb, self.ub)))
+        decided = empty & np.isfinite(value)
+        if (empty & ~decided).any() and not (self.row_kind == KEPT).any():
+            self.status = "Unbounded"
+            self.reason = f"{self.original['var_names'][np.flatnonzero(empty & ~decided)[0]]} can improve without limit"
+            return False
+        if not decided.any():
+            return False
+        self._fix(decided, value[decided], FREE_COLUMN)
+        return True
+
+    # ---------- Reduced Model ---------- #
+    def _build(self, scale):
+        self.kept_rows = np.flatnonzero(self.row_kind == KEPT)
+        self.kept_cols = np.flatnonzero(self.col_kind == KEPT)
+        if not len(self.kept_rows):
+            if len(self.kept_cols):
+                # Left only with columns whose cost pulls them nowhere finite
+                self.status, self.reason = "Unbounded", "A variable can improve without limit"
+            else:
+                self.status = "Optimal"
+            return
+        active = self._active()
+        row_pos = np.cumsum(self.row_kind == KEPT) - 1
+        col_pos = np.cumsum(self.col_kind == KEPT) - 1
+        rows, cols, vals = row_pos[self.rows[active]], col_pos[self.cols[active]], self.vals[active]
+        shape = (len(self.kept_rows), len(self.kept_cols))
+        integer = self.integer[self.kept_cols]
+        self.spread_before = coefficient_spread(vals)
+        self.row_scale, self.col_scale = np.ones(shape[0]), np.ones(shape[1])
+        self.spread_after = self.spread_before
+        if scale:
+            r, s = geometric_scaling(rows, cols, vals, shape, integer)
+            spread = coefficient_spread(vals * r[rows] * s[cols])
+            # Rounding to powers of two can leave a well-scaled matrix slightly worse: keep it then
+            if spread < self.spread_before:
+                self.row_scale, self.col_scale, self.spread_after = r, s, spread
+        r, s = self.row_scale, self.col_scale
+        vals = vals * r[rows] * s[cols]
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        self.model = make_model(
+            self.original["c"][self.kept_cols] * s, (vals, cols, indptr), self.senses[self.kept_rows],
+            self.rhs[self.kept_rows] * r, self.original["sense"],
+            var_names=[self.original["var_names"][j] for j in self.kept_cols],
+            con_names=[self.original["con_names"][i] for i in self.kept_rows],
+            lb=self.lb[self.kept_cols] / s, ub=self.ub[self.kept_cols] / s, integer=integer)
+
+    def _report(self, passes, seconds):
+        num_rows, num_cols = model_shape(self.original)
+        rows_after, cols_after = model_shape(self.model) if self.model is not None else (0, 0)
+        return {
+            "rows": num_rows,
+            "columns": num_cols,
+            "rows_after": rows_after,
+            "columns_after": cols_after,
+            "removed_rows": {name: int((self.row_kind == kind).sum()) for kind, name in ROW_REDUCTIONS.items()},
+            "removed_columns": {name: int((self.col_kind == kind).sum()) for kind, name in COLUMN_REDUCTIONS.items()},
+            "bounds_tightened": self.tightened,
+            "passes": passes,
+            "spread_before": getattr(self, "spread_before", coefficient_spread(self.vals)),
+            "spread_after": getattr(self, "spread_after", None),
+            "scaled": self.row_scale is not None and bool((self.row_scale != 1).any() or (self.col_scale != 1).any()),
+            "status": self.status,
+            "reason": self.reason,
+            "presolve_time": seconds,
+        }
+
+    # ---------- Postsolve ---------- #
+    def decided_result(self, solver, sensitivity=False):
+        """The result when presolve alone decided the problem (``status`` is set)."""
+        codes = {"Optimal": 1, "Infeasible": -1, "Unbounded": -2}
+        if self.status != "Optimal":
+            num_cols = len(self.lb)
+            return {"status": self.status, "status_code": codes[self.status], "x": np.full(num_cols, np.nan),
+                    "objective": None, "solver": solver, "solve_time": 0.0, "iterations": 0,
+                    "presolve": self.report}
+        self.kept_rows = self.kept_cols = np.array([], dtype=np.int64)
+        self.row_scale = self.col_scale = np.ones(0)
+        empty = {"status": "Optimal", "status_code": 1, "x": np.zeros(0), "objective": 0.0, "solver": solver,
+                 "solve_time": 0.0, "iterations": 0, "duals": np.zeros(0), "reduced_costs": np.zeros(0),
+                 "slacks": np.zeros(0), "obj_lower": np.zeros(0), "obj_upper": np.zeros(0),
+                 "rhs_lower": np.zeros(0), "rhs_upper": np.zeros(0)}
+        if integer_mask(self.original).any():
+            empty.update(bound=0.0, gap=0.0, nodes=0)
+        return self.postsolve(empty, sensitivity=sensitivity)
+
+    def postsolve(self, result, sensitivity=None):
+        """``result`` of the reduced model, mapped back to the original one. Duals, reduced costs,
+        slacks and ranges are mapped when the result has them (or ``sensitivity`` asks for them)."""
+        from lpsolver.solve import NO_SOLUTION_STATUSES
+
+        start = time.perf_counter()
+        x = np.array(self.value)
+        x[self.kept_cols] = result["x"] * self.col_scale
+        if result["status"] in NO_SOLUTION_STATUSES or not np.isfinite(result["x"]).all():
+            # No point to complete: the removed columns' values mean nothing on their own
+            x = np.full(len(x), np.nan)
+        out = dict(result, x=x)
+        if result.get("objective") is not None:
+            out["objective"] = result["objective"] + self.offset
+        if result.get("bound") is not None:
+            from lpsolver.solve import mip_gap
+
+            out["bound"] = result["bound"] + self.offset
+            out["gap"] = mip_gap(out["objective"], out["bound"])
+        if (sensitivity if sensitivity is not None else "duals" in result) and result["status"] == "Optimal":
+            out.update(self._postsolve_duals(result, x))
+        out["presolve"] = dict(self.report, postsolve_time=time.perf_counter() - start)
+        return out
+
+    def _postsolve_duals(self, result, x):
+        from lpsolver.sensitivity import sensitivity_from_point
+
+        model, r, s = self.original, self.row_scale, self.col_scale
+        c, rhs = np.asarray(model["c"], dtype=np.float64), np.asarray(model["rhs"], dtype=np.float64)
+        num_rows, num_cols = len(rhs), len(c)
+        sign = -1.0 if self.maximize else 1.0  # to minimization form
+        y = np.zeros(num_rows)
+        y[self.kept_rows] = result["duals"] * r
+
+        def a_transpose_y():
+            return np.bincount(self.cols, weights=self.vals * y[self.rows], minlength=num_cols)
+
+        # A tightened bound holding x in place carries its singleton row's dual
+        partial = c - a_transpose_y()
+        for j in np.flatnonzero((self.lb_row >= 0) | (self.ub_row >= 0)):
+            for i, bound in ((self.ub_row[j], self.ub[j]), (self.lb_row[j], self.lb[j])):
+                if i < 0 or abs(x[j] - bound) > 1e-7 * max(1.0, abs(bound)) or y[i]:
+                    continue
+                dual = partial[j] / self.singleton[i]
+                # Minimization form: a <= row needs a dual <= 0, a >= row a dual >= 0
+                if self.senses[i] == 0 or sign * dual * self.senses[i] >= 0:
+                    y[i] = dual
+                    partial[j] = 0.0
+        reduced_costs = c - a_transpose_y()
+        activity = np.bincount(self.rows, weights=self.vals * x[self.cols], minlength=num_rows)
+        slacks = rhs - activity
+
+        if not self._dual_feasible(x, y, reduced_costs, slacks):
+            # A chain of reductions the mapping does not follow: recover the basis on the original model
+            return sensitivity_from_point(model, x)
+
+        # Ranges: kept items from the reduced solve, narrowed where a dropped duplicate would start to bind.
+        # Round-off leaves loose rows a dual of about 1e-17, so "has a dual" allows for it
+        priced = np.abs(y) > DUAL_TOLERANCE * max(1.0, float(np.abs(c).max(initial=0.0)))
+        shift = rhs[self.kept_rows] - self.rhs[self.kept_rows]
+        rhs_lower, rhs_upper = np.array(rhs), np.array(rhs)
+        rhs_lower[self.kept_rows] = result["rhs_lower"] / r + shift
+        rhs_upper[self.kept_rows] = result["rhs_upper"] / r + shift
+        obj_lower, obj_upper = np.array(c), np.array(c)
+        obj_lower[self.kept_cols] = result["obj_lower"] / s
+        obj_upper[self.kept_cols] = result["obj_upper"] / s
+        for i in np.flatnonzero(self.row_kind == DUPLICATE):
+            # Row i is factor x its twin k: in k's units it limits k's activity from above (<=) or below (>=)
+            k, factor = self.twin[i], self.twin_factor[i]
+            if not priced[k]:
+                continue  # a loose twin stays loose whatever its right-hand side
+            sense, limit = self.senses[i] * np.sign(factor), rhs[i] / factor
+            if sense <= 0:
+                rhs_upper[k] = min(rhs_upper[k], limit)
+            if sense >= 0:
+                rhs_lower[k] = max(rhs_lower[k], limit)
+        # Dropped rows without a dual stay optional while they do not bind
+        loose = (self.row_kind != KEPT) & ~priced
+        rhs_upper[loose & (self.senses < 0)] = np.inf
+        rhs_lower[loose & (self.senses < 0)] = activity[loose & (self.senses < 0)]
+        rhs_lower[loose & (self.senses > 0)] = -np.inf
+        rhs_upper[loose & (self.senses > 0)] = activity[loose & (self.senses > 0)]
+        # Removed columns stay where they are while their reduced cost keeps its sign
+        lb, ub = np.asarray(model["lb"]), np.asarray(model["ub"])
+        removed = self.col_kind != KEPT
+        at_lb, at_ub = removed & np.isclose(x, lb), removed & np.isclose(x, ub)
+        price = c - reduced_costs
+        either = at_lb & at_ub
+        obj_lower[either], obj_upper[either] = -np.inf, np.inf
+        for mask, towards_infinity in ((at_lb & ~at_ub, not self.maximize), (at_ub & ~at_lb, self.maximize)):
+            if towards_infinity:
+                obj_lower[mask], obj_upper[mask] = price[mask], np.inf
+            else:
+                obj_lower[mask], obj_upper[mask] = -np.inf, price[mask]
+        # A dropped row with a dual binds through the bound it became, and a removed column held
+        # by such a bound moves with its dual: how far either can go depends on the whole basis,
+        # so their ranges come from one on the original model
+        carried = (self.row_kind != KEPT) & priced
+        held = removed & (((self.lb_row >= 0) & carried[self.lb_row]) | ((self.ub_row >= 0) & carried[self.ub_row]))
+        if carried.any():
+            ranged = sensitivity_from_point(model, x)
+            if ranged:
+                rhs_lower[carried], rhs_upper[carried] = ranged["rhs_lower"][carried], ranged["rhs_upper"][carried]
+                obj_lower[held], obj_upper[held] = ranged["obj_lower"][held], ranged["obj_upper"][held]
+        return {"duals": y, "slacks": slacks, "reduced_costs": reduced_costs, "obj_lower": obj_lower,
+                "obj_upper": obj_upper, "rhs_lower": rhs_lower, "rhs_upper": rhs_upper}
+
+    def _dual_feasible(self, x, y, reduced_costs, slacks):
+        model = self.original
+        sign = -1.0 if self.maximize else 1.0
+        tol = DUAL_TOLERANCE * max(1.0, float(np.abs(model["c"]).max(initial=0.0)))
+        d, dual = sign * reduced_costs, sign * y
+        lb, ub = np.asarray(model["lb"]), np.asarray(model["ub"])
+        at_lb = np.isclose(x, lb, atol=1e-7)
+        at_ub = np.isclose(x, ub, atol=1e-7)
+        columns_ok = np.where(at_lb & at_ub, True, np.where(at_lb, d >= -tol, np.where(at_ub, d <= tol, np.abs(d) <= tol)))
+        binding = np.abs(slacks) <= 1e-7 * np.maximum(1.0, np.abs(model["rhs"]))
+        senses = np.asarray(model["senses"])
+        rows_ok = np.where(~binding, np.abs(dual) <= tol, np.where(senses < 0, dual <= tol,
+                                                                   np.where(senses > 0, dual >= -tol, True)))
+        return bool(columns_ok.all() and rows_ok.all())
@@ -0,0 +1,137 @@
+"""Lightweight per-phase timing: one PhaseTimer per app run, one PhaseMetrics per process.
+
+A PhaseTimer records the wall time of each named phase of a run (inputs, model build,
+solve, rendering, plotting, export) with any extra facts about it, such as the solver's
+own iteration count. PhaseMetrics accumulates finished runs into Prometheus histograms
+and counters, and renders them in the text exposition format.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds, from widget handling to long CBC runs
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.started = time.time()
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name, **info):
+        """Times the ``with`` block; the yielded dict can be filled with details inside it."""
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.record(name, time.perf_counter() - start, **info)
+
+    def record(self, name, seconds, **info):
+        self.phases.append({"phase": name, "seconds": seconds, **info})
+
+    def total(self):
+        return sum(phase["seconds"] for phase in self.phases)
+
+    def report(self):
+        return {"started": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started)),
+                "total_seconds": self.total(), "phases": self.phases}
+
+    def to_json(self):
+        return json.dumps(self.report(), indent=2, default=str)
+
+
+def solver_details(result):
+    """The solver's own figures from a result dict, for the solve phase."""
+    details = {"solver": result.get("solver"), "status": result.get("status"), "cached": result.get("cached", False)}
+    for key in ("iterations", "solve_time", "solver_time", "build_time", "warm_start", "queue_wait", "gap", "nodes"):
+        if result.get(key) is not None:
+            details[key] = result[key]
+    return details
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class PhaseMetrics:
+    """Thread-safe process-wide totals over every observed PhaseTimer."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.runs = 0
+        self._phases = {}  # name -> [bucket counts..., count, sum]
+        self._solves = {}  # (solver, status, cached) -> count
+        self._iterations = {}  # solver -> total iterations
+        self._queue_wait = self._new_histogram()  # seconds solves waited for a solver slot
+        self._lock = threading.Lock()
+
+    def _new_histogram(self):
+        return [0] * len(self.buckets) + [0, 0.0]  # bucket counts..., count, sum
+
+    def _add(self, stats, seconds):
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                stats[i] += 1
+        stats[-2] += 1
+        stats[-1] += seconds
+
+    def _histogram_lines(self, name, stats, **labels):
+        lines = [f"{name}_bucket{_labels(**labels, le=repr(float(bound)))} {count}"
+                 for bound, count in zip(self.buckets, stats)]
+        lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {stats[-2]}")
+        lines.append(f"{name}_sum{_labels(**labels) if labels else ''} {stats[-1]!r}")
+        lines.append(f"{name}_count{_labels(**labels) if labels else ''} {stats[-2]}")
+        return lines
+
+    def observe(self, timer):
+        with self._lock:
+            self.runs += 1
+            for phase in timer.phases:
+                self._add(self._phases.setdefault(phase["phase"], self._new_histogram()), phase["seconds"])
+                if phase["phase"] == "solve" and phase.get("queue_wait") is not None:
+                    self._add(self._queue_wait, phase["queue_wait"])
+                if phase["phase"] == "solve" and phase.get("solver") is not None:
+                    key = (phase["solver"], phase.get("status"), bool(phase.get("cached")))
+                    self._solves[key] = self._solves.get(key, 0) + 1
+                    if not phase.get("cached") and phase.get("iterations") is not None:
+                        self._iterations[phase["solver"]] = self._iterations.get(phase["solver"], 0) + phase["iterations"]
+
+    def prometheus_text(self, prefix="lp_solver", extra=()):
+        """Snapshot in the Prometheus text exposition format. ``extra`` adds single-sample
+        metrics as (name, type, help, value) tuples, e.g. cache counters and sizes."""
+        with self._lock:
+            lines = [f"# HELP {prefix}_runs_total App runs observed.", f"# TYPE {prefix}_runs_total counter",
+                     f"{prefix}_runs_total {self.runs}",
+                     f"# HELP {prefix}_phase_seconds Wall time per app phase.",
+                     f"# TYPE {prefix}_phase_seconds histogram"]
+            for name, stats in sorted(self._phases.items()):
+                lines += self._histogram_lines(f"{prefix}_phase_seconds", stats, phase=name)
+            lines += [f"# HELP {prefix}_solve_queue_wait_seconds Time solves waited for a free solver slot.",
+                      f"# TYPE {prefix}_solve_queue_wait_seconds histogram",
+                      *self._histogram_lines(f"{prefix}_solve_queue_wait_seconds", self._queue_wait)]
+            lines += [f"# HELP {prefix}_solves_total Solves by solver, status and cache hit.",
+                      f"# TYPE {prefix}_solves_total counter"]
+            for (solver, status, cached), count in sorted(self._solves.items(), key=str):
+                lines.append(f"{prefix}_solves_total{_labels(solver=solver, status=status, cached=str(cached).lower())} {count}")
+            lines += [f"# HELP {prefix}_solver_iterations_total Simplex iterations reported by the solver.",
+                      f"# TYPE {prefix}_solver_iterations_total counter"]
+            for solver, count in sorted(self._iterations.items()):
+                lines.append(f"{prefix}_solver_iterations_total{_labels(solver=solver)} {count}")
+        for name, kind, help_text, value in extra:
+            lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} {kind}", f"{prefix}_{name} {value!r}"]
+        return "\n".join(lines) + "\n"
+
+
+def write_text_atomic(path, text):
+    # For the node_exporter textfile collector, which must never read a half-written file
+    temporary = f"{path}.{threading.get_ident()}.tmp"
+    with open(temporary, "w") as f:
+        f.write(text)
+    os.replace(temporary, path)
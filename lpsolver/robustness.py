@@ -0,0 +1,205 @@
+"""Monte Carlo robustness analysis: how the optimum moves when objective coefficients and
+right-hand sides are uncertain.
+
+Each sample draws the perturbed parameters from their distributions. For an LP, one simplex
+solve of the base model gives an optimal basis, and all samples are checked against it at once:
+a handful of matrix products give every sample's basic solution and reduced costs, and where the
+basis stays primal and dual feasible that solution is optimal as it stands. Only the samples that
+leave the basis are re-solved, warm started from it, over the batch process pool.
+"""
+import copy
+import time
+
+import numpy as np
+
+from lpsolver.batch import resolve_parameters, solve_arrays
+from lpsolver.diagnosis import SIMPLEX_MAX_CELLS
+from lpsolver.model import is_mip, model_shape
+from lpsolver.simplex import OPTIMAL, SimplexSolver
+from lpsolver.warmstart import WarmStartSession
+
+DISTRIBUTIONS = ("normal", "uniform", "triangular", "lognormal")
+# Samples checked against the base basis per batch of matrix products
+BASIS_CHUNK = 1_000
+# Fewer re-solves than this run in-process; starting worker processes would cost more
+POOL_MIN_SAMPLES = 100
+# A constraint binds when its slack is within this of zero, relative to 1 + |rhs|
+BINDING_TOLERANCE = 1e-6
+NONZERO_TOLERANCE = 1e-9
+
+
+# ---------- Sampling ---------- #
+def perturbation_targets(model):
+    """Every parameter a perturbation can name: ``c:<variable>`` and ``rhs:<constraint>``."""
+    return [f"c:{name}" for name in model["var_names"]] + [f"rhs:{name}" for name in model["con_names"]]
+
+
+def _draws(rng, distribution, spread, base, size):
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{distribution}' (expected one of {', '.join(DISTRIBUTIONS)})")
+    if not spread >= 0:
+        raise ValueError(f"The spread must be zero or positive, not {spread}")
+    if distribution == "lognormal":
+        # Multiplicative and mean-preserving: keeps the sign of the base value
+        return base * np.exp(spread * rng.standard_normal(size) - spread ** 2 / 2)
+    scale = spread * (abs(base) if base else 1.0)
+    if distribution == "normal":
+        return base + scale * rng.standard_normal(size)
+    if distribution == "uniform":
+        return base + scale * rng.uniform(-1.0, 1.0, size)
+    return base + scale * rng.triangular(-1.0, 0.0, 1.0, size)
+
+
+def sample_parameters(model, perturbations, num_samples, seed=None):
+    """Returns (C, B): one objective and one RHS vector per sample.
+
+    ``perturbations`` maps a parameter label (as in batch scenario tables) to (distribution,
+    spread). The spread is relative to the base value: the standard deviation of a normal, the
+    half-width of a uniform or triangular, and the log-scale deviation of a lognormal. A zero
+    base value takes the spread as absolute (a lognormal leaves it at zero).
+    """
+    if num_samples < 1:
+        raise ValueError("At least one sample is needed")
+    rng = np.random.default_rng(seed)
+    C = np.tile(np.asarray(model["c"], dtype=np.float64), (num_samples, 1))
+    B = np.tile(np.asarray(model["rhs"], dtype=np.float64), (num_samples, 1))
+    for (kind, index), (distribution, spread) in zip(resolve_parameters(model, perturbations),
+                                                    perturbations.values()):
+        target = C if kind == "c" else B
+        target[:, index] = _draws(rng, distribution, float(spread), float(target[0, index]), num_samples)
+    return C, B
+
+
+# ---------- Analysis ---------- #
+def _activity(model, X):
+    # A·x for every row of X, straight from the CSR arrays in chunks of bounded size
+    data, indices, indptr = model["A_data"], model["A_indices"], model["A_indptr"]
+    activity = np.zeros((len(X), len(indptr) - 1))
+    filled = np.flatnonzero(np.diff(indptr) > 0)
+    if not len(filled):
+        return activity
+    step = max(1, 10_000_000 // max(len(data), 1))
+    for start in range(0, len(X), step):
+        products = X[start:start + step][:, indices] * data
+        activity[start:start + step, filled] = np.add.reduceat(products, indptr[filled], axis=1)
+    return activity
+
+
+def _fits_basis_check(model):
+    rows, cols = model_shape(model)
+    return not is_mip(model) and rows * (rows + cols) <= SIMPLEX_MAX_CELLS
+
+
+def robustness_analysis(model, perturbations, num_samples=1_000, options=None, max_workers=None, seed=None,
+                        progress=None):
+    """Solves ``num_samples`` perturbed copies of ``model`` (see sample_parameters).
+
+    Returns ``objective`` and ``x`` per sample (NaN where no optimum was found), ``status``,
+    ``parameters`` (the sampled value of each perturbed label, one column per label),
+    ``binding`` (the share of optimal samples in which each constraint binds), ``optimal``,
+    ``basis_reused`` (samples the base basis answered), ``resolved`` and ``seconds``.
+    Re-solves of an LP use the NumPy simplex from the base basis; otherwise ``options``'
+    backend. ``progress``, when given, is called with (samples done, samples).
+    """
+    start = time.perf_counter()
+    options = dict(options or {})
+    labels = list(perturbations)
+    C, B = sample_parameters(model, perturbations, num_samples, seed)
+    rows, cols = model_shape(model)
+    objective = np.full(num_samples, np.nan)
+    X = np.full((num_samples, cols), np.nan)
+    status = np.full(num_samples, "Not Solved", dtype=object)
+    reused = np.zeros(num_samples, dtype=bool)
+
+    seed_session, base_objective = None, None
+    if _fits_basis_check(model):
+        solver = SimplexSolver(model)
+        if solver.solve() == OPTIMAL:
+            base_objective = float(solver.c @ solver.x[:cols])
+            seed_session = WarmStartSession()
+            seed_session.adopt(model, solver)
+            # Every re-solve keeps the matrix, so the base basis inverse carries over as it is
+            seed_session.state = dict(seed_session.state, Binv=solver.Binv)
+            for first in range(0, num_samples, BASIS_CHUNK):
+                chunk = slice(first, first + BASIS_CHUNK)
+                X_chunk, optimal = solver.basis_solutions(C[chunk], B[chunk])
+                X[chunk][optimal] = X_chunk[optimal]
+                reused[chunk] = optimal
+                if progress is not None:
+                    progress(int(reused[:first + BASIS_CHUNK].sum()), num_samples)
+    objective[reused] = np.einsum("ij,ij->i", C[reused], X[reused])
+    status[reused] = "Optimal"
+
+    remaining = np.flatnonzero(~reused)
+    if len(remaining):
+        resolve_options = {"backend": "NumPy Simplex"} if seed_session is not None else options
+        if len(remaining) < POOL_MIN_SAMPLES or max_workers == 1:
+            from lpsolver.solve import run_solve
+
+            results = ((index, run_solve(dict(model, c=C[k], rhs=B[k]), resolve_options, copy.copy(seed_session)))
+                       for index, k in enumerate(remaining))
+        else:
+            results = solve_arrays(model, C[remaining], B[remaining], resolve_options, max_workers, seed=seed_session)
+        for done, (index, result) in enumerate(results, start=1):
+            k = remaining[index]
+            status[k] = result["status"]
+            if result["status"] == "Optimal":
+                X[k], objective[k] = result["x"], result["objective"]
+            if progress is not None:
+                progress(int(reused.sum()) + done, num_samples)
+
+    optimal = status == "Optimal"
+    binding = np.zeros(rows)
+    if optimal.any():
+        slack = np.abs(_activity(model, X[optimal]) - B[optimal])
+        binding = (slack <= BINDING_TOLERANCE * (1.0 + np.abs(B[optimal]))).mean(axis=0)
+    parameters = np.zeros((num_samples, len(labels)))
+    for column, (kind, index) in enumerate(resolve_parameters(model, labels)):
+        parameters[:, column] = (C if kind == "c" else B)[:, index]
+    return {
+        "samples": num_samples,
+        "labels": labels,
+        "parameters": parameters,
+        "objective": objective,
+        "x": X,
+        "status": status.tolist(),
+        "binding": binding,
+        "optimal": int(optimal.sum()),
+        "basis_reused": int(reused.sum()),
+        "resolved": int(len(remaining)),
+        "base_objective": base_objective,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+# ---------- Summaries ---------- #
+def _distribution(values):
+    # Column-wise statistics of the optimal samples; NaN when there are none
+    if not len(values):
+        missing = np.full(values.shape[1:], np.nan)
+        return {key: missing for key in ("Mean", "Std", "P5", "P50", "P95", "Min", "Max")}
+    p5, p50, p95 = np.percentile(values, [5, 50, 95], axis=0)
+    return {"Mean": values.mean(axis=0), "Std": values.std(axis=0), "P5": p5, "P50": p50, "P95": p95,
+            "Min": values.min(axis=0), "Max": values.max(axis=0)}
+
+
+def objective_summary(analysis):
+    """Mean, standard deviation, 5th/50th/95th percentiles, min and max of the optimal objectives."""
+    values = analysis["objective"][~np.isnan(analysis["objective"])]
+    return {key: float(value) for key, value in _distribution(values).items()}
+
+
+def variable_table(model, analysis):
+    """One row per variable: its distribution over the optimal samples and how often it is nonzero."""
+    X = analysis["x"][~np.isnan(analysis["objective"])]
+    stats = _distribution(X)
+    nonzero = 100 * (np.abs(X) > NONZERO_TOLERANCE).mean(axis=0) if len(X) else np.full(X.shape[1], np.nan)
+    return [{"Variable": name, **{key: float(stats[key][j]) for key in ("Mean", "Std", "P5", "P50", "P95")},
+             "Nonzero %": float(nonzero[j])}
+            for j, name in enumerate(model["var_names"])]
+
+
+def binding_table(model, analysis):
+    """One row per constraint: the percentage of optimal samples in which it binds."""
+    return [{"Constraint": name, "Binding %": float(100 * share)}
+            for name, share in zip(model["con_names"], analysis["binding"])]
@@ -0,0 +1,320 @@
+"""Server-wide solve scheduler: bounded concurrency, fair queuing, admission control and dedupe.
+
+Every session submits its solves here instead of starting jobs itself. Running SolveJob
+processes hold at most ``max_workers`` slots (one per CPU by default); a solve asking for
+several ``threads`` (a parallel MIP) takes that many, and a RaceJob those of all its racers.
+The rest wait in per-session queues that are served round-robin, so one session's burst
+cannot starve the others. Beyond the
+queue and per-session limits submissions are rejected with SchedulerBusy. A submission whose
+problem hash matches a queued or running task joins it rather than solving again. Work that
+runs its own processes (the batch pools) leases slots from the same budget.
+"""
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+
+from lpsolver.jobs import CANCELLED, FAILED, RUNNING, start_job_server
+from lpsolver.portfolio import start_job
+
+QUEUED = "queued"
+PENDING = (QUEUED, RUNNING)
+
+
+class SchedulerBusy(RuntimeError):
+    pass
+
+
+class _Task:
+    def __init__(self, key, model, options, warm_start, session):
+        self.key = key
+        self.model = model
+        self.options = dict(options or {})
+        self.warm_start = warm_start
+        self.session = session
+        self.subscribers = Counter()  # session -> open tickets
+        self.job = None
+        self.state = QUEUED
+        self.error = None  # why the job could not start, when it could not
+        # A race runs every racer at once
+        self.slots = max(1, int(self.options.get("threads") or 1)) * max(1, len(self.options.get("race") or ()))
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+
+
+class SolveTicket:
+    """One session's handle on a (possibly shared) task. Mirrors SolveJob's interface, with an
+    extra QUEUED state before a worker slot frees up."""
+
+    def __init__(self, scheduler, task, session, deduplicated):
+        self._scheduler = scheduler
+        self._task = task
+        self.session = session
+        self.deduplicated = deduplicated
+        self.submitted = time.perf_counter()
+        self.cancelled = False
+        self.finished = None
+
+    @property
+    def model(self):
+        return self._task.model
+
+    @property
+    def options(self):
+        return self._task.options
+
+    @property
+    def time_limit(self):
+        return self._task.options.get("time_limit") or None
+
+    @property
+    def state(self):
+        return CANCELLED if self.cancelled else self._task.state
+
+    @property
+    def job(self):
+        return self._task.job
+
+    @property
+    def result(self):
+        return None if self.cancelled or self.job is None else self.job.result
+
+    @property
+    def error(self):
+        if self.cancelled:
+            return "Cancelled"
+        return self._task.error if self.job is None else self.job.error
+
+    @property
+    def elapsed(self):
+        finished = self.finished
+        if finished is None and self.state not in PENDING:
+            finished = self.job.finished if self.job is not None else self._task.finished_at
+        return (finished or time.perf_counter()) - self.submitted
+
+    @property
+    def wait_seconds(self):
+        # Time this ticket spent queued: joining a running task costs none
+        started = self._task.started_at
+        if started is None:
+            return time.perf_counter() - self.submitted
+        return max(0.0, started - self.submitted)
+
+    @property
+    def position(self):
+        """1-based position among all queued tasks in dispatch order, or None once started."""
+        return self._scheduler.position(self._task)
+
+    def poll(self):
+        return self.state
+
+    def wait(self, timeout=None):
+        self._scheduler.wait(self, timeout)
+        return self.state
+
+    def cancel(self):
+        self._scheduler.cancel(self)
+        return self.state
+
+    def progress(self):
+        """The job's progress (``elapsed`` is its own run time) plus ``queued``, the seconds this
+        ticket waited for a solver slot."""
+        job = self.job
+        progress = job.progress() if job is not None else {"elapsed": 0.0}
+        return dict(progress, queued=self.wait_seconds)
+
+
+class SolveScheduler:
+    """Thread-safe; one per server process. A dispatcher thread starts queued tasks as worker
+    slots free up and polls the running jobs every ``poll_interval`` seconds."""
+
+    def __init__(self, max_workers=None, max_queued=None, max_per_session=2, poll_interval=0.02):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queued = max_queued if max_queued is not None else 4 * self.max_workers
+        self.max_per_session = max_per_session
+        self.poll_interval = poll_interval
+        self.submitted = 0
+        self.rejected = 0
+        self.deduplicated = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.wait_seconds_total = 0.0
+        self.started = 0
+        self.failed_to_start = 0
+        self._queues = OrderedDict()  # session -> deque of tasks, in round-robin order
+        self._tasks = {}  # key -> queued or running task
+        self._running = []
+        self._leased = 0  # slots held by leases
+        self._cond = threading.Condition()
+        self._thread = None
+        start_job_server()
+
+    # ---------- Submission ---------- #
+    def submit(self, session, key, model, options=None, warm_start=None):
+        """Queues a solve of ``model`` (``key`` is its problem hash with ``options``) for
+        ``session``; returns a SolveTicket, or raises SchedulerBusy when over a limit."""
+        with self._cond:
+            task = self._tasks.get(key)
+            load = sum(other.subscribers[session] for other in self._tasks.values())
+            if load >= self.max_per_session:
+                self.rejected += 1
+                raise SchedulerBusy(f"This session already has {load} solves in progress "
+                                    f"(limit {self.max_per_session}); cancel one or wait for it")
+            # Joining an in-flight task adds no work, so only new tasks count against the queue
+            if task is None and self._busy_slots() >= self.max_workers and self._queued_count() >= self.max_queued:
+                self.rejected += 1
+                raise SchedulerBusy(f"The server is at capacity ({len(self._running)} solves running, "
+                                    f"{self._queued_count()} queued); try again shortly")
+            self.submitted += 1
+            if task is not None:
+                self.deduplicated += 1
+            else:
+                task = self._tasks[key] = _Task(key, model, options, warm_start, session)
+                self._queues.setdefault(session, deque()).append(task)
+            task.subscribers[session] += 1
+            ticket = SolveTicket(self, task, session, deduplicated=sum(task.subscribers.values()) > 1)
+            self._dispatch()
+            self._ensure_dispatcher()
+            self._cond.notify_all()
+            return ticket
+
+    def cancel(self, ticket):
+        with self._cond:
+            if ticket.cancelled or ticket._task.state not in PENDING:
+                return
+            ticket.cancelled = True
+            ticket.finished = time.perf_counter()
+            self.cancelled += 1
+            task = ticket._task
+            task.subscribers[ticket.session] -= 1
+            # The work itself stops only when nobody else is waiting for it
+            if sum(task.subscribers.values()) <= 0:
+                if task.state == QUEUED:
+                    self._queues[task.session].remove(task)
+                    if not self._queues[task.session]:
+                        del self._queues[task.session]
+                    task.state = CANCELLED
+                else:
+                    task.job.cancel()
+                    self._running.remove(task)
+                    task.state = task.job.state
+                del self._tasks[task.key]
+                self._dispatch()
+            self._cond.notify_all()
+
+    def wait(self, ticket, timeout=None):
+        with self._cond:
+            self._cond.wait_for(lambda: ticket.state not in PENDING, timeout)
+
+    def position(self, task):
+        with self._cond:
+            if task.state != QUEUED:
+                return None
+            for index, queued in enumerate(self._dispatch_order()):
+                if queued is task:
+                    return index + 1
+            return None
+
+    # ---------- Leases ---------- #
+    @contextmanager
+    def lease(self, slots, timeout=None):
+        """Holds up to ``slots`` worker slots for work outside SolveJobs while the block runs and
+        yields how many were granted: at least one, once one is free, and no more than are.
+        Raises SchedulerBusy when none frees up within ``timeout`` seconds."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._busy_slots() < self.max_workers, timeout):
+                self.rejected += 1
+                raise SchedulerBusy(f"Every solver slot is busy ({self._busy_slots()} of {self.max_workers} held "
+                                    f"by solves and worker pools); try again shortly")
+            granted = min(max(1, slots), self.max_workers - self._busy_slots())
+            self._leased += granted
+        try:
+            yield granted
+        finally:
+            with self._cond:
+                self._leased -= granted
+                self._dispatch()
+                self._cond.notify_all()
+
+    # ---------- Dispatch ---------- #
+    def _queued_count(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _dispatch_order(self):
+        # Round-robin: the first task of every session in turn, then the second, and so on
+        queues = [list(queue) for queue in self._queues.values()]
+        return [queue[i] for i in range(max(map(len, queues), default=0)) for queue in queues if i < len(queue)]
+
+    def _busy_slots(self):
+        return self._leased + sum(min(task.slots, self.max_workers) for task in self._running)
+
+    def _dispatch(self):
+        while self._queues:
+            session, queue = next(iter(self._queues.items()))
+            task = queue[0]
+            # The next task in turn waits for enough free slots rather than being overtaken
+            if self._busy_slots() + min(task.slots, self.max_workers) > self.max_workers:
+                break
+            queue.popleft()
+            del self._queues[session]
+            if queue:
+                self._queues[session] = queue  # back of the rotation
+            task.started_at = time.perf_counter()
+            self.started += 1
+            self.wait_seconds_total += task.started_at - task.queued_at
+            try:
+                task.job = start_job(task.model, task.options, warm_start=task.warm_start)
+            except Exception as error:
+                # Fail it for every subscriber rather than leave them waiting on a task that never runs
+                task.state = FAILED
+                task.error = f"The solver process could not start ({type(error).__name__}: {error})"
+                task.finished_at = time.perf_counter()
+                del self._tasks[task.key]
+                self.failed_to_start += 1
+                self._cond.notify_all()
+                continue
+            task.state = RUNNING
+            self._running.append(task)
+
+    def _ensure_dispatcher(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="lp-solver-scheduler", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        with self._cond:
+            while True:
+                finished = [task for task in self._running if task.job.poll() not in PENDING]
+                for task in finished:
+                    self._running.remove(task)
+                    del self._tasks[task.key]
+                    task.state = task.job.state
+                    self.completed += 1
+                if finished:
+                    self._dispatch()
+                    self._cond.notify_all()
+                self._cond.wait(self.poll_interval if self._running else None)
+
+    # ---------- Metrics ---------- #
+    def stats(self):
+        with self._cond:
+            return {
+                "workers": self.max_workers,
+                "running": len(self._running),
+                "slots_busy": self._busy_slots(),
+                "slots_leased": self._leased,
+                "queued": self._queued_count(),
+                "sessions_queued": len(self._queues),
+                "max_queued": self.max_queued,
+                "max_per_session": self.max_per_session,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "deduplicated": self.deduplicated,
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "started": self.started,
+                "failed_to_start": self.failed_to_start,
+                "wait_seconds_total": self.wait_seconds_total,
+            }
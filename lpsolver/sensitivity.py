@@ -0,0 +1,53 @@
+"""Sensitivity analysis: shadow prices, slacks, reduced costs and ranging from the optimal basis.
+
+The simplex backend reads these straight off its final basis. For CBC solutions the basis is
+recovered by a crossover from the optimal point, which normally takes no pivots. Within a
+reported range, the effect of changing one right-hand side (dual x change) or one objective
+coefficient (x stays optimal) is known without re-solving.
+"""
+import numpy as np
+
+from lpsolver.simplex import OPTIMAL, SimplexSolver
+
+SENSITIVITY_KEYS = ("duals", "slacks", "reduced_costs", "obj_lower", "obj_upper", "rhs_lower", "rhs_upper")
+
+
+def sensitivity_from_point(model, x):
+    solver = SimplexSolver(model)
+    if solver.crossover(np.asarray(x, dtype=np.float64)) != OPTIMAL:
+        return {}
+    return solver.sensitivity()
+
+
+def has_sensitivity(result):
+    return all(key in result for key in SENSITIVITY_KEYS)
+
+
+def _clean(value):
+    # Round-off residue from the basis inverse is shown as a clean zero
+    value = float(value)
+    return 0.0 if abs(value) < 1e-12 else value
+
+
+def sensitivity_tables(model, result):
+    """Returns (variables, constraints): lists of row dicts for display and export."""
+    x, c = result["x"], model["c"]
+    variables = [{
+        "Variable": name,
+        "Value": _clean(x[j]),
+        "Reduced Cost": _clean(result["reduced_costs"][j]),
+        "Objective Coeff.": float(c[j]),
+        "Coeff. Lower": _clean(result["obj_lower"][j]),
+        "Coeff. Upper": _clean(result["obj_upper"][j]),
+    } for j, name in enumerate(model["var_names"])]
+
+    constraints = [{
+        "Constraint": name,
+        "Activity": _clean(model["rhs"][i] - result["slacks"][i]),
+        "Slack": _clean(result["slacks"][i]),
+        "Shadow Price": _clean(result["duals"][i]),
+        "RHS": float(model["rhs"][i]),
+        "RHS Lower": _clean(result["rhs_lower"][i]),
+        "RHS Upper": _clean(result["rhs_upper"][i]),
+    } for i, name in enumerate(model["con_names"])]
+    return variables, constraints
@@ -0,0 +1,622 @@
+"""In-process bounded-variable revised simplex on NumPy.
+
+The model is put in computational form ``min cost·z  s.t.  [A | I] z = b,  lower <= z <= upper``
+where the last ``m`` columns are row slacks whose bounds encode the constraint sense
+(``<=``: s >= 0, ``>=``: s <= 0, ``=``: s = 0). Rows whose slack cannot absorb the initial
+residual get an artificial column, which phase 1 drives to zero.
+
+The basis inverse is kept explicitly and updated with rank-one (product form) updates,
+refactorized every ``refactor_every`` pivots. This is meant for small and medium models,
+where avoiding CBC's MPS write / fork / solution read round trip dominates.
+"""
+import time
+
+import numpy as np
+
+from lpsolver.model import dense_matrix, is_mip
+
+# PuLP's status codes, so results are interchangeable with the CBC path
+OPTIMAL, NOT_SOLVED, INFEASIBLE, UNBOUNDED, UNDEFINED = 1, 0, -1, -2, -3
+STATUS_NAMES = {OPTIMAL: "Optimal", NOT_SOLVED: "Not Solved", INFEASIBLE: "Infeasible",
+                UNBOUNDED: "Unbounded", UNDEFINED: "Undefined"}
+
+# Variable status
+BASIC, AT_LOWER, AT_UPPER, AT_ZERO = 0, 1, 2, 3
+
+# Consecutive degenerate pivots before switching to Bland's rule to break cycling
+BLAND_AFTER = 50
+# A solver's ``progress`` callback, when set, is called with the solver every this many iterations
+PROGRESS_EVERY = 50
+# Option presets (``options["preset"]``): SimplexSolver keyword arguments
+PRESETS = {
+    "Default": {},
+    "Tight Tolerances": {"feas_tol": 1e-9, "opt_tol": 1e-11},
+    "Frequent Refactorization": {"refactor_every": 25},
+}
+
+
+class SimplexSolver:
+    def __init__(self, model, feas_tol=1e-7, opt_tol=1e-9, pivot_tol=1e-9, max_iter=None, refactor_every=100):
+        if is_mip(model):
+            raise ValueError("The NumPy simplex solves continuous LPs only; use CBC for integer variables")
+        A = dense_matrix(model)
+        self.m, self.n = A.shape
+        self.maximize = model["sense"] == "Maximize"
+        self.c = np.asarray(model["c"], dtype=np.float64)
+        self.feas_tol, self.opt_tol, self.pivot_tol = feas_tol, opt_tol, pivot_tol
+        self.max_iter = max_iter if max_iter is not None else 50 * (self.m + self.n) + 1000
+        self.refactor_every = refactor_every
+
+        senses = model["senses"]
+        self.K = np.hstack([A, np.eye(self.m)])
+        self.b = np.asarray(model["rhs"], dtype=np.float64).copy()
+        self.cost = np.r_[-self.c if self.maximize else self.c, np.zeros(self.m)]
+        self.lower = np.r_[model["lb"], np.where(senses == 1, -np.inf, 0.0)]
+        self.upper = np.r_[model["ub"], np.where(senses == -1, np.inf, 0.0)]
+
+        self.iterations = 0
+        self.basis = None
+        self.status = None
+        self.x = None
+        self.Binv = None
+        self.ray = None
+        self.warm_started = False
+        self.progress = None
+        self._since_refactor = 0
+
+    # ---------- Basis Bookkeeping ---------- #
+    @property
+    def num_columns(self):
+        return self.K.shape[1]
+
+    def _nonbasic_start(self):
+        # Nonbasic variables sit at a finite bound, or at zero when free
+        status = np.where(np.isfinite(self.lower), AT_LOWER, np.where(np.isfinite(self.upper), AT_UPPER, AT_ZERO))
+        x = np.where(status == AT_LOWER, self.lower, np.where(status == AT_UPPER, self.upper, 0.0))
+        return status.astype(np.int8), x
+
+    def _refactor(self):
+        self.Binv = np.linalg.inv(self.K[:, self.basis])
+        x_nonbasic = self.x.copy()
+        x_nonbasic[self.basis] = 0.0
+        self.x[self.basis] = self.Binv @ (self.b - self.K @ x_nonbasic)
+        self._since_refactor = 0
+
+    def _add_artificials(self, rows, signs, values):
+        num = len(rows)
+        columns = np.zeros((self.m, num))
+        columns[rows, np.arange(num)] = signs
+        self.K = np.hstack([self.K, columns])
+        self.cost = np.r_[self.cost, np.zeros(num)]
+        self.lower = np.r_[self.lower, np.zeros(num)]
+        self.upper = np.r_[self.upper, np.full(num, np.inf)]
+        self.status = np.r_[self.status, np.full(num, BASIC, dtype=np.int8)]
+        self.x = np.r_[self.x, values]
+
+    def _crash_basis(self):
+        # Slack basis; rows whose residual lies outside the slack bounds get an artificial
+        self.status, self.x = self._nonbasic_start()
+        slacks = self.n + np.arange(self.m)
+        residual = self.b - self.K[:, :self.n] @ self.x[:self.n]
+        clipped = np.clip(residual, self.lower[slacks], self.upper[slacks])
+        infeasible = np.abs(residual - clipped) > self.feas_tol
+
+        self.basis = slacks.copy()
+        self.status[slacks] = BASIC
+        self.x[slacks] = residual
+        rows = np.flatnonzero(infeasible)
+        if len(rows):
+            self.status[slacks[rows]] = np.where(clipped[rows] <= self.lower[slacks[rows]], AT_LOWER, AT_UPPER)
+            self.x[slacks[rows]] = clipped[rows]
+            gap = residual[rows] - clipped[rows]
+            first = self.num_columns
+            self._add_artificials(rows, np.sign(gap), np.abs(gap))
+            self.basis[rows] = first + np.arange(len(rows))
+        self._refactor()
+
+    # ---------- Primal Simplex ---------- #
+    def _reduced_costs(self, cost):
+        y = cost[self.basis] @ self.Binv
+        d = cost.copy()
+        # Slack columns are the identity, so their reduced costs need no matrix product
+        d[:self.n] -= y @ self.K[:, :self.n]
+        d[self.n:self.n + self.m] -= y
+        if self.num_columns > self.n + self.m:
+            d[self.n + self.m:] -= y @ self.K[:, self.n + self.m:]
+        d[self.basis] = 0.0
+        return y, d
+
+    def _entering(self, d, bland):
+        status = self.status
+        gain = np.where(status == AT_LOWER, -d, np.where(status == AT_UPPER, d, np.where(status == AT_ZERO, np.abs(d), 0.0)))
+        gain[self.upper <= self.lower] = 0.0  # fixed variables never move
+        candidates = np.flatnonzero(gain > self.opt_tol)
+        if not len(candidates):
+            return None
+        return int(candidates[0]) if bland else int(candidates[np.argmax(gain[candidates])])
+
+    def _basic_steps(self, rate):
+        # How far each basic variable can move at ``rate`` per unit step before hitting a bound
+        x_basic = self.x[self.basis]
+        lower, upper = self.lower[self.basis], self.upper[self.basis]
+        steps = np.full(self.m, np.inf)
+        falling, rising = rate < -self.pivot_tol, rate > self.pivot_tol
+        steps[falling] = (x_basic[falling] - lower[falling]) / -rate[falling]
+        steps[rising] = (upper[rising] - x_basic[rising]) / rate[rising]
+        return np.maximum(steps, 0.0)
+
+    def _ratio_test(self, rate, q):
+        steps = self._basic_steps(rate)
+        flip = self.upper[q] - self.lower[q]
+        best = steps.min() if self.m else np.inf
+        if flip <= best:
+            return flip, None
+        # Among (near) ties prefer the largest pivot element for numerical stability
+        ties = np.flatnonzero(steps <= best + self.feas_tol)
+        p = int(ties[np.argmax(np.abs(rate[ties]))])
+        return steps[p], p
+
+    def _pivot(self, p, q, alpha):
+        leaving = self.basis[p]
+        self.status[leaving] = AT_LOWER if abs(self.x[leaving] - self.lower[leaving]) <= abs(self.x[leaving] - self.upper[leaving]) else AT_UPPER
+        self.x[leaving] = self.lower[leaving] if self.status[leaving] == AT_LOWER else self.upper[leaving]
+        self.status[q] = BASIC
+        self.basis[p] = q
+
+        # Product-form update; a sparse entering column only touches its nonzero rows
+        pivot_row = self.Binv[p] / alpha[p]
+        rows = np.flatnonzero(alpha)
+        if 2 * len(rows) < self.m:
+            self.Binv[rows] -= np.outer(alpha[rows], pivot_row)
+        else:
+            self.Binv -= np.outer(alpha, pivot_row)
+        self.Binv[p] = pivot_row
+        self._since_refactor += 1
+        if self._since_refactor >= self.refactor_every:
+            self._refactor()
+
+    def _primal(self, cost):
+        degenerate = 0
+        while True:
+            _, d = self._reduced_costs(cost)
+            q = self._entering(d, bland=degenerate > BLAND_AFTER)
+            if q is None:
+                return OPTIMAL
+            if self.iterations >= self.max_iter:
+                return NOT_SOLVED
+
+            direction = 1.0 if d[q] < 0 else -1.0
+            alpha = self.Binv @ self.K[:, q]
+            rate = -direction * alpha
+            step, p = self._ratio_test(rate, q)
+            if not np.isfinite(step):
+                self.ray = np.zeros(self.num_columns)
+                self.ray[q] = direction
+                self.ray[self.basis] = rate
+                return UNBOUNDED
+
+            self.x[self.basis] += rate * step
+            self.x[q] += direction * step
+            if p is None:
+                self.status[q] = AT_UPPER if direction > 0 else AT_LOWER
+            else:
+                self._pivot(p, q, alpha)
+            self.iterations += 1
+            self._report()
+            degenerate = degenerate + 1 if step <= self.feas_tol else 0
+
+    # ---------- Dual Simplex ---------- #
+    def _primal_infeasibility(self):
+        x_basic = self.x[self.basis]
+        return np.maximum(self.lower[self.basis] - x_basic, x_basic - self.upper[self.basis])
+
+    def _dual_infeasibility(self, d):
+        status = self.status
+        violation = np.where(status == AT_LOWER, -d, np.where(status == AT_UPPER, d, np.where(status == AT_ZERO, np.abs(d), 0.0)))
+        violation[self.upper <= self.lower] = 0.0
+        return violation
+
+    def _dual_entering(self, p, below, cost):
+        # Entering candidates move the leaving variable towards its violated bound
+        row = self.Binv[p] @ self.K
+        _, d = self._reduced_costs(cost)
+        status = self.status
+        toward = -row if below else row
+        eligible = (((status == AT_LOWER) & (toward > self.pivot_tol))
+                    | ((status == AT_UPPER) & (toward < -self.pivot_tol))
+                    | ((status == AT_ZERO) & (np.abs(row) > self.pivot_tol)))
+        eligible &= self.upper > self.lower
+        candidates = np.flatnonzero(eligible)
+        if not len(candidates):
+            return None
+
+        ratios = np.abs(d[candidates]) / np.abs(row[candidates])
+        ties = candidates[ratios <= ratios.min() + self.opt_tol]
+        return int(ties[np.argmax(np.abs(row[ties]))])
+
+    def _dual(self, cost):
+        # Needs a dual feasible basis; restores primal feasibility one leaving row at a time
+        while True:
+            infeasibility = self._primal_infeasibility()
+            p = int(np.argmax(infeasibility)) if self.m else 0
+            if not self.m or infeasibility[p] <= self.feas_tol:
+                return OPTIMAL
+            if self.iterations >= self.max_iter:
+                return NOT_SOLVED
+
+            leaving = self.basis[p]
+            below = self.x[leaving] < self.lower[leaving]
+            target = self.lower[leaving] if below else self.upper[leaving]
+            q = self._dual_entering(p, below, cost)
+            if q is None:
+                return INFEASIBLE
+
+            alpha = self.Binv @ self.K[:, q]
+            step = (self.x[leaving] - target) / alpha[p]
+            self.x[self.basis] -= alpha * step
+            self.x[q] += step
+            self._pivot(p, q, alpha)
+            self.iterations += 1
+            self._report()
+
+    def _report(self):
+        if self.progress is not None and not self.iterations % PROGRESS_EVERY:
+            self.progress(self)
+
+    # ---------- Warm Starts ---------- #
+    def basis_state(self):
+        # Only bases made of structural and slack columns can be carried over to another model
+        if self.basis is None or (self.basis >= self.n + self.m).any():
+            return None
+        return {"basis": self.basis.copy(), "status": self.status[:self.n + self.m].copy()}
+
+    def load_basis(self, state):
+        # A state may carry "Binv", the inverse of this basis in the same matrix, to skip the factorization
+        basis, status = np.asarray(state["basis"]), np.asarray(state["status"], dtype=np.int8)
+        if len(basis) != self.m or len(status) != self.num_columns:
+            raise ValueError("Basis does not match the model dimensions")
+        x = np.where(status == AT_LOWER, self.lower, np.where(status == AT_UPPER, self.upper, 0.0))
+        if not np.isfinite(x).all():
+            raise ValueError("Basis places a nonbasic variable at an infinite bound")
+        self.basis, self.status, self.x = basis.astype(np.int64).copy(), status.copy(), x
+        self.status[self.basis] = BASIC
+        if state.get("Binv") is not None and state["Binv"].shape == (self.m, self.m):
+            self.Binv = state["Binv"].copy()
+            x[self.basis] = self.Binv @ (self.b - self.K @ x)
+            self._since_refactor = 0
+        else:
+            self._refactor()
+
+    def warm_solve(self, state, dual_cost=None):
+        """Re-optimizes from ``state``, the basis of an earlier optimal solve.
+
+        An unchanged basis that is still primal feasible (only the objective moved) goes
+        straight to primal simplex. Otherwise (right-hand sides moved or rows were appended)
+        dual simplex restores feasibility first, using ``dual_cost`` - the computational-form
+        cost the basis was optimal for - and primal simplex then adopts the new objective.
+        Falls back to a cold solve when the basis is unusable.
+        """
+        start = time.perf_counter()
+        try:
+            self.load_basis(state)
+            status = OPTIMAL
+            if self._primal_infeasibility().max(initial=0.0) > self.feas_tol:
+                dual_cost = self.cost if dual_cost is None else dual_cost
+                if self._dual_infeasibility(self._reduced_costs(dual_cost)[1]).max(initial=0.0) > self.opt_tol * 1e3:
+                    raise ValueError("Basis is neither primal nor dual feasible")
+                status = self._dual(dual_cost)
+            if status == OPTIMAL:
+                status = self._primal(self.cost)
+                if status == OPTIMAL:
+                    self._refactor()
+        except (ValueError, np.linalg.LinAlgError):
+            return self.solve()
+        self.warm_started = True
+        self.solve_time = time.perf_counter() - start
+        return status
+
+    # ---------- Phases ---------- #
+    def _phase1(self):
+        artificials = np.arange(self.n + self.m, self.num_columns)
+        if not len(artificials):
+            return OPTIMAL
+        phase1_cost = np.zeros(self.num_columns)
+        phase1_cost[artificials] = 1.0
+        status = self._primal(phase1_cost)
+        if status != OPTIMAL:
+            return status
+
+        self._refactor()
+        if self.x[artificials].sum() > self.feas_tol * (1.0 + np.abs(self.b).max(initial=0.0)):
+            return INFEASIBLE
+
+        # Artificials are pinned at zero from now on; pivot basic ones out where the row allows it
+        self.upper[artificials] = 0.0
+        self.x[artificials] = 0.0
+        for p in np.flatnonzero(self.basis >= self.n + self.m):
+            row = self.Binv[p] @ self.K[:, :self.n + self.m]
+            row[self.basis[self.basis < self.n + self.m]] = 0.0
+            q = int(np.argmax(np.abs(row)))
+            if abs(row[q]) > 1e-7:
+                self._pivot(p, q, self.Binv @ self.K[:, q])
+        self._refactor()
+        return OPTIMAL
+
+    def solve(self):
+        start = time.perf_counter()
+        self.warm_started = False
+        try:
+            self.K, self.cost = self.K[:, :self.n + self.m], self.cost[:self.n + self.m]
+            self.lower, self.upper = self.lower[:self.n + self.m], self.upper[:self.n + self.m]
+            self._crash_basis()
+            status = self._phase1()
+            if status == OPTIMAL:
+                status = self._primal(self.cost)
+                if status == OPTIMAL:
+                    self._refactor()
+        except np.linalg.LinAlgError:
+            status = UNDEFINED
+        self.solve_time = time.perf_counter() - start
+        return status
+
+    def infeasibility_certificate(self):
+        """Row multipliers proving the last INFEASIBLE status: no point within the variable bounds
+        satisfies this combination of the constraints, so the rows with nonzero weight conflict."""
+        artificial = (self.basis >= self.n + self.m).astype(np.float64)
+        if artificial.any():
+            # Phase 1 stopped with artificials left: its duals are the certificate
+            return artificial @ self.Binv
+        # Dual simplex stopped on a row no entering column can repair
+        return self.Binv[int(np.argmax(self._primal_infeasibility()))].copy()
+
+    def basis_solutions(self, C, B):
+        """The current optimal basis applied at once to many cases: objectives ``C`` and right-hand
+        sides ``B``, one row per case. Returns (X, optimal): each case's basic solution and whether
+        the basis is still optimal for it (primal and dual feasible); other cases need a re-solve."""
+        n, cols = self.n, self.n + self.m
+        if self.basis is None or (self.basis >= cols).any():
+            return np.full((len(C), n), np.nan), np.zeros(len(C), dtype=bool)
+        K, basis, status = self.K[:, :cols], self.basis, self.status[:cols]
+        nonbasic = np.where(status == BASIC, 0.0, self.x[:cols])
+        Z = np.tile(nonbasic, (len(C), 1))
+        Z[:, basis] = (B - K @ nonbasic) @ self.Binv.T
+        tol = self.feas_tol * np.maximum(1.0, np.abs(B).max(axis=1, initial=0.0))[:, None]
+        primal = ((Z[:, basis] >= self.lower[basis] - tol) & (Z[:, basis] <= self.upper[basis] + tol)).all(axis=1)
+
+        cost = np.hstack([-C if self.maximize else C, np.zeros((len(C), self.m))])
+        D = cost - (cost[:, basis] @ self.Binv) @ K
+        violation = np.where(status == AT_LOWER, -D, np.where(status == AT_UPPER, D, np.where(status == AT_ZERO, np.abs(D), 0.0)))
+        violation[:, (status == BASIC) | (self.upper[:cols] <= self.lower[:cols])] = 0.0
+        tol = self.opt_tol * 1e3 * np.maximum(1.0, np.abs(C).max(axis=1, initial=0.0))
+        return Z[:, :n], primal & (violation.max(axis=1, initial=0.0) <= tol)
+
+    # ---------- Sensitivity ---------- #
+    def crossover(self, x):
+        """Recovers an optimal basis from a primal optimal point ``x`` (e.g. CBC's solution).
+
+        Columns strictly between their bounds become basic and the basis is completed with
+        linearly independent slacks, then re-optimized; from a vertex this takes no pivots.
+        """
+        tol = self.feas_tol
+        z = np.r_[x, self.b - self.K[:, :self.n] @ x]
+        at_lower = np.isfinite(self.lower) & (np.abs(z - self.lower) <= tol * (1.0 + np.abs(self.lower)))
+        at_upper = np.isfinite(self.upper) & (np.abs(z - self.upper) <= tol * (1.0 + np.abs(self.upper))) & ~at_lower
+        interior = ~at_lower & ~at_upper & ~(np.isinf(self.lower) & np.isinf(self.upper) & (np.abs(z) <= tol))
+
+        # Greedy Gram-Schmidt: interior columns first, then slacks, then the rest
+        slacks = self.n + np.arange(self.m)
+        order = np.r_[np.flatnonzero(interior), slacks[~interior[slacks]], np.flatnonzero(~interior[:self.n])]
+        Q, basis = np.zeros((self.m, self.m)), []
+        for j in order.tolist():
+            v = self.K[:, j]
+            r = v - Q[:, :len(basis)] @ (Q[:, :len(basis)].T @ v)
+            r -= Q[:, :len(basis)] @ (Q[:, :len(basis)].T @ r)
+            norm = np.linalg.norm(r)
+            if norm > 1e-9 * max(1.0, np.linalg.norm(v)):
+                Q[:, len(basis)] = r / norm
+                basis.append(j)
+                if len(basis) == self.m:
+                    break
+
+        status, _ = self._nonbasic_start()
+        status[at_upper] = AT_UPPER
+        status[at_lower] = AT_LOWER
+        status[basis] = BASIC
+        return self.warm_solve({"basis": np.array(basis, dtype=np.int64), "status": status})
+
+    def sensitivity(self):
+        """Duals, slacks, reduced costs and ranging intervals read off the optimal basis.
+
+        Signs follow the original objective: a dual is the change in the objective per unit
+        increase of the right-hand side. ``rhs_lower/upper`` bound the right-hand side over
+        which the duals stay valid, and ``obj_lower/upper`` bound each objective coefficient
+        over which the current solution stays optimal.
+        """
+        n, m, tol = self.n, self.m, self.pivot_tol
+        sign = -1.0 if self.maximize else 1.0
+        y, d = self._reduced_costs(self.cost)
+        basis, status = self.basis, self.status
+        fixed = self.upper <= self.lower
+        # Round-off can give a nonbasic column the wrong sign; a fixed column may have either sign
+        clipped = np.where(status == AT_LOWER, np.maximum(d, 0.0), np.where(status == AT_UPPER, np.minimum(d, 0.0), d))
+        d = np.where(fixed, d, clipped)
+
+        # Right-hand side ranging: x_B moves by delta * Binv[:, i] and must stay within its bounds
+        x_basic = self.x[basis]
+        below = np.minimum(self.lower[basis] - x_basic, 0.0)[:, None]
+        above = np.maximum(self.upper[basis] - x_basic, 0.0)[:, None]
+        G = self.Binv
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rising, falling = G > tol, G < -tol
+            delta_up = np.where(rising, above / G, np.where(falling, below / G, np.inf)).min(axis=0, initial=np.inf)
+            delta_down = np.where(rising, below / G, np.where(falling, above / G, -np.inf)).max(axis=0, initial=-np.inf)
+
+        # Objective ranging in computational (minimization) form
+        low, high = np.full(n, -np.inf), np.full(n, np.inf)
+        structural = np.arange(n)
+        nonbasic = (status[:n] != BASIC) & ~fixed[:n]
+        low[nonbasic & (status[:n] == AT_LOWER)] = -d[:n][nonbasic & (status[:n] == AT_LOWER)]
+        high[nonbasic & (status[:n] == AT_UPPER)] = -d[:n][nonbasic & (status[:n] == AT_UPPER)]
+        free = nonbasic & (status[:n] == AT_ZERO)
+        low[free] = high[free] = 0.0
+
+        positions = np.flatnonzero(basis < n)
+        if len(positions):
+            # Raising the cost of basic column j by delta shifts every reduced cost by -delta * alpha_pk
+            rows = self.Binv[positions] @ self.K
+            candidates = (status != BASIC) & ~fixed
+            at_lower, at_upper = candidates & (status == AT_LOWER), candidates & (status == AT_UPPER)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = d / rows
+                upper_limit = np.where((at_lower & (rows > tol)) | (at_upper & (rows < -tol)), ratio, np.inf)
+                lower_limit = np.where((at_lower & (rows < -tol)) | (at_upper & (rows > tol)), ratio, -np.inf)
+            pinned = (candidates & (status == AT_ZERO) & (np.abs(rows) > tol)).any(axis=1)
+            j = basis[positions]
+            high[j] = np.where(pinned, 0.0, upper_limit.min(axis=1))
+            low[j] = np.where(pinned, 0.0, lower_limit.max(axis=1))
+
+        cost = self.cost[structural]
+        obj_low, obj_high = sign * (cost + low), sign * (cost + high)
+        if self.maximize:
+            obj_low, obj_high = obj_high, obj_low
+        return {
+            "duals": sign * y,
+            "slacks": self.b - self.K[:, :n] @ self.x[:n],
+            "reduced_costs": sign * d[:n],
+            "obj_lower": obj_low,
+            "obj_upper": obj_high,
+            "rhs_lower": self.b + delta_down,
+            "rhs_upper": self.b + delta_up,
+        }
+
+    # ---------- Parametric ---------- #
+    def _objective_value(self):
+        # In the original sense, from the current (possibly parametrized) cost vector
+        return float((-1.0 if self.maximize else 1.0) * self.cost[:self.n] @ self.x[:self.n])
+
+    def _breakpoint(self, offset):
+        return offset, self._objective_value(), self.x[:self.n].copy()
+
+    def parametric_rhs(self, row, length):
+        """Moves ``b[row]`` by ``length`` from the current optimal basis.
+
+        Returns ``(points, status)``: the breakpoints of the optimal-value function as
+        (offset, objective, x) tuples, and OPTIMAL when the whole range was covered or
+        INFEASIBLE when the problem has no solution past the last point. Between breakpoints
+        the basis stays optimal; at each one the blocking basic variable leaves by a dual
+        simplex pivot, so the sweep costs one pivot per breakpoint.
+        """
+        sign, distance, offset = np.sign(length), abs(length), 0.0
+        points = [self._breakpoint(0.0)]
+        while True:
+            rate = sign * self.Binv[:, row]
+            steps = self._basic_steps(rate)
+            step = steps.min() if self.m else np.inf
+            # Round-off in the accumulated offset must not leave a sliver before the end
+            done = offset + step >= distance - 1e-12 * max(1.0, distance)
+            if done:
+                step = distance - offset
+            self.b[row] += sign * step
+            self.x[self.basis] += rate * step
+            offset = distance if done else offset + step
+            points.append(self._breakpoint(sign * offset))
+            if done:
+                return points, OPTIMAL
+            if self.iterations >= self.max_iter:
+                return points, NOT_SOLVED
+
+            ties = np.flatnonzero(steps <= step + self.feas_tol)
+            p = int(ties[np.argmax(np.abs(rate[ties]))])
+            q = self._dual_entering(p, rate[p] < 0, self.cost)
+            if q is None:
+                return points, INFEASIBLE
+            self._pivot(p, q, self.Binv @ self.K[:, q])
+            self.iterations += 1
+
+    def parametric_cost(self, column, length):
+        """Moves the objective coefficient of ``column`` by ``length`` from the current
+        optimal basis; returns ``(points, status)`` like :meth:`parametric_rhs`, with
+        UNBOUNDED when the objective is unbounded past the last point.
+
+        The solution stays optimal until a nonbasic reduced cost changes sign; there the
+        column enters by a primal simplex pivot.
+        """
+        sign, distance, offset = np.sign(length), abs(length), 0.0
+        dc = np.zeros(self.num_columns)
+        dc[column] = -sign if self.maximize else sign
+        points = [self._breakpoint(0.0)]
+        while True:
+            _, d = self._reduced_costs(self.cost)
+            _, dd = self._reduced_costs(dc)
+            status, steps = self.status, np.full(self.num_columns, np.inf)
+            movable = self.upper > self.lower
+            rising = movable & (status == AT_LOWER) & (dd < -self.pivot_tol)
+            falling = movable & (status == AT_UPPER) & (dd > self.pivot_tol)
+            steps[rising] = np.maximum(d[rising], 0.0) / -dd[rising]
+            steps[falling] = np.maximum(-d[falling], 0.0) / dd[falling]
+            steps[movable & (status == AT_ZERO) & (np.abs(dd) > self.pivot_tol)] = 0.0
+            step = steps.min()
+            # Round-off in the accumulated offset must not leave a sliver before the end
+            done = offset + step >= distance - 1e-12 * max(1.0, distance)
+            if done:
+                step = distance - offset
+            self.cost += step * dc
+            offset = distance if done else offset + step
+            points.append(self._breakpoint(sign * offset))
+            if done:
+                return points, OPTIMAL
+            if self.iterations >= self.max_iter:
+                return points, NOT_SOLVED
+
+            ties = np.flatnonzero(steps <= step + self.opt_tol)
+            q = int(ties[np.argmax(np.abs(dd[ties]))])
+            # Past the breakpoint the entering reduced cost has the sign of dd
+            direction = 1.0 if dd[q] < 0 else -1.0
+            alpha = self.Binv @ self.K[:, q]
+            rate = -direction * alpha
+            move, p = self._ratio_test(rate, q)
+            if not np.isfinite(move):
+                return points, UNBOUNDED
+            self.x[self.basis] += rate * move
+            self.x[q] += direction * move
+            if p is None:
+                self.status[q] = AT_UPPER if direction > 0 else AT_LOWER
+            else:
+                self._pivot(p, q, alpha)
+            self.iterations += 1
+
+    # ---------- Results ---------- #
+    def primal_values(self):
+        return self.x[:self.n].copy()
+
+    def result(self, status):
+        # Like the PuLP path, an infeasible or unbounded model has no values to report
+        solved = status not in (INFEASIBLE, UNBOUNDED)
+        x = self.primal_values() if solved else np.full(self.n, np.nan)
+        return {
+            "status": STATUS_NAMES[status],
+            "status_code": status,
+            "x": x,
+            "objective": float(self.c @ x) if solved else None,
+            "solver": "NumPy Simplex",
+            "solve_time": self.solve_time,
+            "iterations": self.iterations,
+        }
+
+
+def simplex_solver(model, options=None):
+    """A SimplexSolver set up from solve options: ``preset``, ``max_iter`` and ``progress``."""
+    options = options or {}
+    solver = SimplexSolver(model, max_iter=options.get("max_iter"), **PRESETS[options.get("preset") or "Default"])
+    solver.progress = options.get("progress")
+    return solver
+
+
+def solve_simplex(model, options=None):
+    options = options or {}
+    solver = simplex_solver(model, options)
+    status = solver.solve()
+    result = solver.result(status)
+    if options.get("sensitivity") and status == OPTIMAL:
+        result.update(solver.sensitivity())
+    return result
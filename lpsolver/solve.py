@@ -0,0 +1,314 @@
+"""Solving an array model and reducing the outcome to a compact result dict."""
+import math
+import os
+import re
+import tempfile
+import time
+
+import numpy as np
+
+from lpsolver.cache import problem_hash
+from lpsolver.diagnosis import DIAGNOSIS_TIME_S, diagnose
+from lpsolver.model import build_pulp_problem, is_mip
+from lpsolver.presolve import Presolve
+from lpsolver.sensitivity import sensitivity_from_point
+from lpsolver.simplex import PRESETS as SIMPLEX_PRESETS, solve_simplex
+
+
+# CBC's own figures in its log: LP iterations ("... - 9 iterations time 0.002", once per LP phase),
+# branch-and-bound iterations ("Total iterations: 9") and the wall time of the whole run
+CBC_ITERATIONS = re.compile(r"(?:- (\d+) iterations|Total iterations:\s*(\d+))")
+CBC_WALL_TIME = re.compile(r"Wallclock seconds\):\s*([\d.]+)")
+# Its periodic simplex lines ("6857  Obj 37416.576 Primal inf 1495.4 (311)"); while the dual simplex
+# still has primal infeasibilities, its objective is a bound on the optimum
+CBC_SIMPLEX_LINE = re.compile(r"^\s*(\d+)\s+Obj\s+(\S+)(\s+Primal inf)?", re.MULTILINE)
+# Branch-and-bound status lines ("After 1000 nodes, 184 on tree, -446 best solution, best possible
+# -459.7") and new incumbents ("Integer solution of -446 found by ..."); CBC minimizes internally,
+# so for a maximization these carry the negated objective, and 1e+50 means no solution yet
+CBC_MIP_LINE = re.compile(r"After (\d+) nodes, \d+ on tree, (\S+) best solution, best possible (\S+)"
+                          r"|Integer solution of (\S+) found")
+CBC_NO_SOLUTION = 1e50
+# The closing summary is in the model's own sense; a search stopped by the gap tolerance instead
+# reports the absolute gap it stopped at
+CBC_MIP_SUMMARY = re.compile(r"^(Lower bound|Upper bound|Enumerated nodes):\s*(\S+)", re.MULTILINE)
+CBC_GAP_EXIT = re.compile(r"Exiting as integer gap of (\S+)")
+
+# A MIP stopped at a time or node limit with an integer solution in hand (PuLP calls it Optimal)
+FEASIBLE = "Feasible"
+# Runs cut short by a limit: their results are shown but not cached, so solving again retries them
+INCOMPLETE_STATUSES = ("Not Solved", FEASIBLE)
+# Proven outcomes without a solution; lpsolver.diagnosis explains them
+NO_SOLUTION_STATUSES = ("Infeasible", "Unbounded")
+# Solver controls passed through to CBC for models with integer variables
+MIP_OPTIONS = {"threads": "threads", "gap_rel": "gapRel", "gap_abs": "gapAbs", "max_nodes": "maxNodes"}
+
+# Named algorithm settings per backend (``options["preset"]``); the PuLP ones are extra keyword
+# arguments for the backend's PuLP solver, the simplex ones for SimplexSolver
+PRESETS = {
+    "CBC": {
+        "Default": {},
+        "Dual Simplex": {"options": ["dualSimplex"]},
+        "Primal Simplex": {"options": ["primalSimplex"]},
+        "Barrier": {"options": ["barrier"]},
+        "No Presolve": {"presolve": False},
+        "No Cuts": {"cuts": False},
+    },
+    "GLPK": {
+        "Default": {},
+        "Primal Simplex": {"options": ["--primal"]},
+        "Dual Simplex": {"options": ["--dual"]},
+        "Interior Point": {"options": ["--interior"]},
+        "Exact Arithmetic": {"options": ["--exact"]},
+    },
+    "HiGHS": {
+        "Default": {},
+        "Dual Simplex": {"solver": "simplex", "simplex_strategy": 1},
+        "Primal Simplex": {"solver": "simplex", "simplex_strategy": 4},
+        "Interior Point": {"solver": "ipm"},
+        "No Presolve": {"presolve": "off"},
+    },
+    "NumPy Simplex": SIMPLEX_PRESETS,
+}
+DEFAULT_PRESET = "Default"
+
+
+def parse_cbc_log(text):
+    """Returns (iterations, wall seconds) from a CBC log; None for whatever it does not report."""
+    matches = CBC_ITERATIONS.findall(text)
+    totals = [int(mip) for lp, mip in matches if mip]
+    # An algorithm preset runs its LP before the final solve, which then reports 0 iterations
+    iterations = totals[-1] if totals else sum(int(lp) for lp, mip in matches) if matches else None
+    wall = CBC_WALL_TIME.findall(text)
+    return iterations, (float(wall[-1]) if wall else None)
+
+
+def cbc_progress(text, maximize=False):
+    """Latest iteration count, objective and bound in a (partial) CBC log, as far as it reports them;
+    during branch and bound also the ``incumbent`` (best integer solution) and explored ``nodes``."""
+    progress = {}
+    lines = CBC_SIMPLEX_LINE.findall(text)
+    if lines:
+        iterations, objective, dual = lines[-1]
+        progress["iterations"] = int(iterations)
+        try:
+            progress["bound" if dual else "objective"] = float(objective)
+        except ValueError:
+            pass
+    sign = -1.0 if maximize else 1.0
+    for nodes, incumbent, bound, found in CBC_MIP_LINE.findall(text):
+        incumbent = found or incumbent
+        if abs(float(incumbent)) < CBC_NO_SOLUTION:
+            progress["incumbent"] = sign * float(incumbent)
+        if nodes:
+            progress.update(nodes=int(nodes), bound=sign * float(bound))
+    return progress
+
+
+def mip_gap(incumbent, bound):
+    """Relative gap between the incumbent and the best bound, as CBC measures it; None without both."""
+    if incumbent is None or bound is None:
+        return None
+    return abs(bound - incumbent) / max(abs(incumbent), 1e-10)
+
+
+def cbc_mip_summary(text, maximize, objective, optimal):
+    """Best bound, relative gap and explored node count of a finished CBC branch and bound."""
+    summary = dict(CBC_MIP_SUMMARY.findall(text))
+    bound = summary.get("Lower bound", summary.get("Upper bound"))
+    if bound is not None:
+        bound = float(bound)
+    elif optimal and objective is not None:
+        # Proven optimal, possibly only to within the gap tolerance
+        gaps = CBC_GAP_EXIT.findall(text)
+        bound = objective + (1.0 if maximize else -1.0) * (float(gaps[-1]) if gaps else 0.0)
+    else:
+        bound = cbc_progress(text, maximize).get("bound")
+    nodes = summary.get("Enumerated nodes")
+    return {"bound": bound, "gap": mip_gap(objective, bound), "nodes": None if nodes is None else int(nodes)}
+
+
+def _pulp_solver(backend, options, mip, log_path):
+    import pulp
+
+    params = dict(PRESETS[backend][options.get("preset") or DEFAULT_PRESET])
+    controls = {arg: options[key] for key, arg in MIP_OPTIONS.items() if mip and options.get(key) is not None}
+    time_limit = options.get("time_limit")
+    if backend == "GLPK":
+        # glpsol takes whole seconds and only a relative gap
+        if "gapRel" in controls:
+            params["options"] = params.get("options", []) + ["--mipgap", str(controls["gapRel"])]
+        return pulp.GLPK_CMD(msg=False, timeLimit=max(1, math.ceil(time_limit)) if time_limit else None,
+                             **params)
+    if backend == "HiGHS":
+        # PuLP cannot map the status HiGHS stops with at a node limit, so there is none
+        controls.pop("maxNodes", None)
+        return pulp.HiGHS(msg=False, timeLimit=time_limit, **controls, **params)
+    return pulp.PULP_CBC_CMD(msg=False, logPath=log_path, timeLimit=time_limit, **controls, **params)
+
+
+def _highs_figures(prob, maximize, objective, mip):
+    # HiGHS minimizes the negated objective of a maximization, as CBC does
+    info = prob.solverModel.getInfo()
+    figures = {"iterations": int(info.simplex_iteration_count) or int(info.ipm_iteration_count) or None,
+               "solver_time": prob.solverModel.getRunTime()}
+    if mip:
+        bound = (-1.0 if maximize else 1.0) * info.mip_dual_bound
+        bound = bound if math.isfinite(bound) else None
+        figures.update(bound=bound, gap=mip_gap(objective, bound), nodes=int(info.mip_node_count))
+    return figures
+
+
+def solve_pulp(model, options=None):
+    """Solves with one of the PuLP-driven backends: CBC (the default), GLPK or HiGHS."""
+    from pulp import LpSolutionIntegerFeasible, LpSolutionOptimal, LpStatus, LpStatusNotSolved, LpStatusOptimal, value
+
+    start = time.perf_counter()
+    prob, vars_lp = build_pulp_problem(model)
+    build_time = time.perf_counter() - start
+
+    # CBC's log goes to a file rather than the server's stdout so its iteration count can be read back;
+    # a caller-supplied ``log_path`` (e.g. one a background job tails for progress) is left in place
+    options = options or {}
+    backend = options.get("backend", "CBC")
+    mip = is_mip(model)
+    maximize = model["sense"] == "Maximize"
+    log_path = options.get("log_path") if backend == "CBC" else None
+    if backend == "CBC" and log_path is None:
+        fd, log_path = tempfile.mkstemp(prefix="lp-solver-cbc-", suffix=".log")
+        os.close(fd)
+    log = ""
+    try:
+        start = time.perf_counter()
+        # At the time limit the solver stops and reports the best point it has
+        prob.solve(_pulp_solver(backend, options, mip, log_path))
+        solve_time = time.perf_counter() - start
+        if log_path is not None:
+            with open(log_path, errors="replace") as f:
+                log = f.read()
+    finally:
+        if log_path is not None and options.get("log_path") is None:
+            os.remove(log_path)
+    iterations, solver_time = parse_cbc_log(log)
+
+    # PuLP calls a run stopped at a limit Optimal whenever the solver had a point; for an LP that
+    # point need not even be feasible, so it is reported (with its values) as Not Solved. A MIP's
+    # integer solution is feasible, just not proven optimal
+    status = prob.status
+    status_name = LpStatus[status]
+    if status == LpStatusOptimal and prob.sol_status != LpSolutionOptimal:
+        status = LpStatusNotSolved
+        status_name = FEASIBLE if mip and prob.sol_status == LpSolutionIntegerFeasible else LpStatus[status]
+    objective = value(prob.objective)
+    x = np.array([np.nan if var.varValue is None else var.varValue for var in vars_lp], dtype=np.float64)
+    if status_name in NO_SOLUTION_STATUSES:
+        # The solver's last iterate is not a solution
+        x, objective = np.full(len(vars_lp), np.nan), None
+    result = {
+        "status": status_name,
+        "status_code": status,
+        "x": x,
+        "objective": None if objective is None else float(objective),
+        "solver": backend,
+        "solve_time": solve_time,
+        "build_time": build_time,
+        "solver_time": solver_time,
+        "iterations": iterations,
+    }
+    if backend == "HiGHS":
+        result.update(_highs_figures(prob, maximize, result["objective"], mip))
+    elif backend == "CBC" and mip:
+        result.update(cbc_mip_summary(log, maximize, result["objective"], status == LpStatusOptimal))
+    elif mip:
+        # glpsol's status and solution carry no bound or node count
+        result.update(bound=None, gap=None, nodes=None)
+    # PuLP reports no basis, so ranging comes from a crossover at its optimal point (a MIP has no duals)
+    if options.get("sensitivity") and status == LpStatusOptimal and not mip:
+        result.update(sensitivity_from_point(model, result["x"]))
+    return result
+
+
+# Selectable backends; the in-process simplex skips CBC's MPS write, fork/exec and solution read.
+# GLPK and HiGHS are optional: available_backends() lists those installed here
+BACKENDS = {
+    "CBC": solve_pulp,
+    "GLPK": solve_pulp,
+    "HiGHS": solve_pulp,
+    "NumPy Simplex": solve_simplex,
+}
+# Backends without branch and bound
+LP_ONLY_BACKENDS = ("NumPy Simplex",)
+
+_available = None
+
+
+def available_backends():
+    """The backends whose solvers are installed, in BACKENDS order."""
+    global _available
+    if _available is None:
+        import pulp
+
+        installed = {"CBC": pulp.PULP_CBC_CMD(msg=False).available(),
+                     "GLPK": pulp.GLPK_CMD(msg=False).available(),
+                     "HiGHS": pulp.HiGHS(msg=False).available()}
+        _available = [name for name in BACKENDS if installed.get(name, True)]
+    return list(_available)
+
+
+def run_solve(model, options, warm_start=None):
+    """One uncached solve with the backend ``options`` name. With ``options["presolve"]`` the solver
+    gets the presolved (and, unless ``options["scale"]`` is False, scaled) model, and the result is
+    postsolved back to ``model``. With ``options["diagnose"]`` an infeasible result gets a conflict and an
+    unbounded one a ray (see lpsolver.diagnosis), within what is left of ``options["time_limit"]``."""
+    start = time.perf_counter()
+    result = _presolved_solve(model, options, warm_start)
+    if options.get("diagnose") and result["status"] in NO_SOLUTION_STATUSES:
+        time_limit = DIAGNOSIS_TIME_S
+        if options.get("time_limit"):
+            time_limit = min(time_limit, options["time_limit"] - (time.perf_counter() - start))
+        if time_limit > 0:
+            result.update(diagnose(model, result, options, time_limit))
+    return result
+
+
+def _presolved_solve(model, options, warm_start):
+    backend = options.get("backend", "CBC")
+    # A WarmStartSession re-optimizes simplex solves from the previous optimal basis
+    solve = warm_start.solve if warm_start is not None and backend == "NumPy Simplex" else BACKENDS[backend]
+    # Checked here too: presolve may decide a MIP without ever calling the backend
+    if backend in LP_ONLY_BACKENDS and is_mip(model):
+        raise ValueError(f"The {backend} backend solves continuous LPs only; use CBC for integer variables")
+    if not options.get("presolve"):
+        return solve(model, options)
+    presolved = Presolve(model, scale=options.get("scale", True))
+    if presolved.model is None:
+        result = presolved.decided_result(backend, sensitivity=bool(options.get("sensitivity")) and not is_mip(model))
+    else:
+        result = presolved.postsolve(solve(presolved.model, options))
+    # The same settings without presolve, to time the solve on the original model against
+    result["presolve"]["options"] = {key: value for key, value in options.items()
+                                     if key not in ("presolve", "scale", "progress", "log_path")}
+    return result
+
+
+def solve_model(model, options=None, cache=None, warm_start=None):
+    options = options or {}
+    backend = options.get("backend", "CBC")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown solver backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+    if BACKENDS[backend] is solve_pulp and backend not in available_backends():
+        raise ValueError(f"The {backend} solver is not installed here")
+    preset = options.get("preset") or DEFAULT_PRESET
+    if preset not in PRESETS[backend]:
+        raise ValueError(f"Unknown {backend} preset '{preset}' (expected one of {', '.join(PRESETS[backend])})")
+
+    # Identical problems (same arrays, bounds and options) are answered from the cache
+    key = problem_hash(model, options) if cache is not None else None
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return dict(cached, cached=True, key=key)
+
+    result = run_solve(model, options, warm_start)
+    if key is not None and result["status"] not in INCOMPLETE_STATUSES:
+        cache.put(key, result)
+    return dict(result, cached=False, key=key)
@@ -0,0 +1,88 @@
+"""Per-session warm starts: re-solve edited models from the previous optimal basis."""
+import numpy as np
+
+from lpsolver.simplex import BASIC, OPTIMAL, simplex_solver
+
+
+def _same(a, b):
+    return len(a) == len(b) and np.array_equal(a, b)
+
+
+def classify_change(old, new):
+    """Describes how ``new`` differs from ``old``: None when a warm start is impossible,
+    otherwise a dict with ``objective``/``rhs`` flags and the number of appended rows."""
+    old_rows, new_rows = len(old["rhs"]), len(new["rhs"])
+    if len(old["c"]) != len(new["c"]) or new_rows < old_rows:
+        return None
+    if not (_same(old["lb"], new["lb"]) and _same(old["ub"], new["ub"])):
+        return None
+
+    # The first old_rows rows of the matrix and their senses must be untouched
+    old_nnz = old["A_indptr"][-1]
+    if not (_same(old["A_indptr"], new["A_indptr"][:old_rows + 1])
+            and _same(old["A_indices"], new["A_indices"][:old_nnz])
+            and _same(old["A_data"], new["A_data"][:old_nnz])
+            and _same(old["senses"], new["senses"][:old_rows])):
+        return None
+
+    return {
+        "objective": old["sense"] != new["sense"] or not _same(old["c"], new["c"]),
+        "rhs": not _same(old["rhs"], new["rhs"][:old_rows]),
+        "added_rows": new_rows - old_rows,
+    }
+
+
+class WarmStartSession:
+    """Remembers the last optimal basis so small edits re-solve in a handful of pivots.
+
+    Warm results carry ``cold_iterations_reference``: the pivots of the cold solve this chain of
+    warm starts began from. That solve was of an earlier model, so the count gives scale only;
+    it is not what a cold solve of the current model would take.
+    """
+
+    def __init__(self):
+        self.model = None
+        self.state = None
+        self.dual_cost = None
+        self.cold_iterations_reference = None
+
+    def reset(self):
+        self.__init__()
+
+    def adopt(self, model, solver, cold_iterations_reference=None):
+        """Starts from ``solver``'s optimal basis for ``model``, e.g. one solved outside the session."""
+        # Phase 1 may have left artificial columns behind; the basis never includes them
+        self.model, self.state = model, solver.basis_state()
+        self.dual_cost = solver.cost[:solver.n + solver.m].copy()
+        self.cold_iterations_reference = (cold_iterations_reference if cold_iterations_reference is not None
+                                          else solver.iterations)
+
+    def solve(self, model, options=None):
+        solver = simplex_solver(model, options)
+        change = classify_change(self.model, model) if self.state is not None else None
+
+        if change is None:
+            status = solver.solve()
+        else:
+            state = self.state
+            if change["added_rows"]:
+                # New rows enter with their slack basic, which keeps the basis dual feasible
+                num_vars, old_rows = len(model["c"]), len(self.model["rhs"])
+                new_slacks = num_vars + old_rows + np.arange(change["added_rows"])
+                state = {"basis": np.r_[state["basis"], new_slacks],
+                         "status": np.r_[state["status"], np.full(change["added_rows"], BASIC, dtype=np.int8)]}
+            dual_cost = np.r_[self.dual_cost, np.zeros(change["added_rows"])]
+            status = solver.warm_solve(state, dual_cost=dual_cost)
+
+        result = solver.result(status)
+        if (options or {}).get("sensitivity") and status == OPTIMAL:
+            result.update(solver.sensitivity())
+        result["warm_start"] = solver.warm_started
+        if solver.warm_started and self.cold_iterations_reference is not None:
+            result["cold_iterations_reference"] = self.cold_iterations_reference
+
+        if status == OPTIMAL and solver.basis_state() is not None:
+            self.adopt(model, solver, self.cold_iterations_reference if solver.warm_started else solver.iterations)
+        else:
+            self.reset()
+        return result
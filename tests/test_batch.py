@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from lpsolver.batch import scenario_arrays, solve_scenarios
+from lpsolver.model import make_model
+
+
+def wyndor():
+    return make_model([3.0, 5.0], [[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]], ["<=", "<=", "<="], [4.0, 12.0, 18.0],
+                      con_names=["a", "b", "c"])
+
+
+def test_scenario_arrays_override_only_filled_cells():
+    table = pd.DataFrame({"scenario": ["base", "more c"], "rhs:c": [np.nan, 24.0], "c:x1": [4.0, np.nan]})
+    names, C, B = scenario_arrays(wyndor(), table)
+    assert names == ["base", "more c"]
+    np.testing.assert_array_equal(C, [[4.0, 5.0], [3.0, 5.0]])
+    np.testing.assert_array_equal(B, [[4.0, 12.0, 18.0], [4.0, 12.0, 24.0]])
+
+
+def test_models_without_an_integer_key_solve_in_the_pool():
+    model = wyndor()
+    del model["integer"]
+    table = pd.DataFrame({"rhs:c": [18.0, 24.0]})
+    results = {index: result for index, _, result in
+               solve_scenarios(model, table, {"backend": "NumPy Simplex"}, max_workers=1)}
+    assert [results[k]["objective"] for k in sorted(results)] == pytest.approx([36.0, 42.0])
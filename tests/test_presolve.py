@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from lpsolver.model import make_model
+from lpsolver.presolve import Presolve
+from lpsolver.sensitivity import SENSITIVITY_KEYS
+from lpsolver.solve import run_solve
+
+BACKENDS = ("NumPy Simplex", "CBC")
+
+
+def wyndor(**bounds):
+    return make_model([3.0, 5.0], [[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]], ["<=", "<=", "<="], [4.0, 12.0, 18.0],
+                      **bounds)
+
+
+MODELS = {
+    # Rows a and b become bounds, and b binds through its bound
+    "wyndor": wyndor(),
+    "fixed column": wyndor(lb=[1.0, 0.0], ub=[1.0, np.inf]),
+    # A scaled copy of c that binds with it, and a row no point within the bounds can violate
+    "duplicate and redundant": make_model(
+        [3.0, 5.0], [[1.0, 0.0], [0.0, 2.0], [3.0, 2.0], [6.0, 4.0], [1.0, 1.0]], ["<=", "<=", "<=", "<=", "<="],
+        [4.0, 12.0, 18.0, 40.0, 100.0], ub=[10.0, 10.0]),
+    "diet": make_model([2.0, 3.0, 1.5], [[1.0, 2.0, 1.0], [3.0, 1.0, 2.0], [0.0, 0.0, 1.0]], [">=", ">=", "<="],
+                       [8.0, 9.0, 2.0], sense="Minimize"),
+}
+
+
+def solve(model, backend, presolve):
+    return run_solve(model, {"backend": backend, "sensitivity": True, "presolve": presolve})
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", list(MODELS))
+def test_sensitivity_is_the_same_with_and_without_presolve(backend, name):
+    model = MODELS[name]
+    plain, presolved = solve(model, backend, False), solve(model, backend, True)
+    assert presolved["status"] == plain["status"] == "Optimal"
+    assert presolved["objective"] == pytest.approx(plain["objective"])
+    np.testing.assert_allclose(presolved["x"], plain["x"], atol=1e-9)
+    for key in SENSITIVITY_KEYS:
+        np.testing.assert_allclose(presolved[key], plain[key], atol=1e-9, err_msg=key)
+
+
+def test_wyndor_ranges_with_presolve():
+    presolve = Presolve(wyndor())
+    assert presolve.report["removed_rows"]["singleton"] == 2
+    result = solve(wyndor(), "NumPy Simplex", True)
+    np.testing.assert_allclose(result["rhs_lower"], [2.0, 6.0, 12.0])
+    np.testing.assert_allclose(result["rhs_upper"], [np.inf, 18.0, 24.0])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("status, model", [
+    ("Infeasible", make_model([1.0, 1.0, 1.0], [[1.0, 1.0, 1.0], [1.0, 2.0, 0.0]], [">=", "<="], [10.0, 4.0],
+                              sense="Minimize", lb=[0.0, 0.0, 1.0], ub=[np.inf, np.inf, 1.0])),
+    ("Unbounded", make_model([1.0, 1.0, 1.0], [[1.0, -1.0, 1.0]], ["<="], [1.0],
+                             lb=[0.0, 0.0, 1.0], ub=[np.inf, np.inf, 1.0])),
+])
+def test_no_solution_has_no_values(backend, status, model):
+    # The fixed column is removed by presolve; its value is no solution on its own
+    result = solve(model, backend, True)
+    assert result["status"] == status and result["objective"] is None
+    assert np.isnan(result["x"]).all()
+
+
+def test_lp_only_backend_rejects_a_mip_presolve_decides():
+    model = make_model([1.0, 2.0], [[1.0, 0.0], [0.0, 1.0]], ["=", "="], [2.0, 3.0], integer=[True, False])
+    assert Presolve(model).status == "Optimal"
+    with pytest.raises(ValueError, match="continuous LPs only"):
+        run_solve(model, {"backend": "NumPy Simplex", "presolve": True})
+    assert run_solve(model, {"backend": "CBC", "presolve": True})["objective"] == pytest.approx(8.0)
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+import lpsolver.scheduler as scheduler_module
+from lpsolver.jobs import DONE, FAILED
+from lpsolver.model import make_model
+from lpsolver.scheduler import QUEUED, SchedulerBusy, SolveScheduler
+
+OPTIONS = {"backend": "NumPy Simplex"}
+
+
+def wyndor(rhs=18.0):
+    return make_model([3.0, 5.0], [[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]], ["<=", "<=", "<="], [4.0, 12.0, rhs])
+
+
+def failing_start(model, options, warm_start=None):
+    raise OSError("fork failed")
+
+
+def test_lease_grants_only_free_slots_and_holds_back_solves():
+    scheduler = SolveScheduler(max_workers=2)
+    with scheduler.lease(8) as granted:
+        assert granted == 2 and scheduler.stats()["slots_busy"] == 2
+        with pytest.raises(SchedulerBusy):
+            with scheduler.lease(1, timeout=0.05):
+                pass
+        ticket = scheduler.submit("a", "wyndor", wyndor(), OPTIONS)
+        assert ticket.state == QUEUED
+    assert ticket.wait(60) == DONE
+    assert ticket.result["objective"] == pytest.approx(36.0)
+    assert scheduler.stats()["slots_busy"] == 0
+
+
+def test_a_job_that_cannot_start_fails_its_subscribers(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "start_job", failing_start)
+    scheduler = SolveScheduler(max_workers=1)
+    ticket = scheduler.submit("a", "wyndor", wyndor(), OPTIONS)
+    assert ticket.wait(1) == FAILED
+    assert "fork failed" in ticket.error and ticket.result is None
+    stats = scheduler.stats()
+    assert stats["slots_busy"] == 0 and stats["failed_to_start"] == 1
+    # The failed task is not joined by later submissions of the same problem
+    assert not scheduler.submit("b", "wyndor", wyndor(), OPTIONS).deduplicated
+
+
+def test_queued_tasks_fail_when_dispatched_after_a_lease(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "start_job", failing_start)
+    scheduler = SolveScheduler(max_workers=1, max_per_session=4)
+    with scheduler.lease(1):
+        tickets = [scheduler.submit("a", "wyndor", wyndor(), OPTIONS),
+                   scheduler.submit("b", "wyndor", wyndor(), OPTIONS),
+                   scheduler.submit("a", "other", wyndor(24.0), OPTIONS)]
+        assert tickets[1].deduplicated and all(ticket.state == QUEUED for ticket in tickets)
+    waiters = [threading.Thread(target=ticket.wait, args=(5,)) for ticket in tickets]
+    for waiter in waiters:
+        waiter.start()
+    for waiter in waiters:
+        waiter.join(5)
+    assert [ticket.state for ticket in tickets] == [FAILED] * 3
+    assert scheduler.stats()["queued"] == 0
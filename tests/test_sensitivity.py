@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from lpsolver.model import make_model
+from lpsolver.solve import run_solve
+
+BACKENDS = ("NumPy Simplex", "CBC")
+
+
+def wyndor(**bounds):
+    return make_model([3.0, 5.0], [[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]], ["<=", "<=", "<="], [4.0, 12.0, 18.0],
+                      **bounds)
+
+
+def ranged(model, backend, presolve=False):
+    return run_solve(model, {"backend": backend, "sensitivity": True, "presolve": presolve})
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_wyndor_ranges(backend):
+    result = ranged(wyndor(), backend)
+    np.testing.assert_allclose(result["duals"], [0.0, 1.5, 1.0], atol=1e-9)
+    np.testing.assert_allclose(result["slacks"], [2.0, 0.0, 0.0], atol=1e-9)
+    np.testing.assert_allclose(result["rhs_lower"], [2.0, 6.0, 12.0])
+    np.testing.assert_allclose(result["rhs_upper"], [np.inf, 18.0, 24.0])
+    np.testing.assert_allclose(result["obj_lower"], [0.0, 2.0], atol=1e-9)
+    np.testing.assert_allclose(result["obj_upper"], [7.5, np.inf])
+    np.testing.assert_allclose(result["reduced_costs"], [0.0, 0.0], atol=1e-9)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("cost", [3.0, -1.0])
+def test_fixed_column_keeps_its_reduced_cost_sign(backend, cost):
+    # A fixed column is optimal at either sign of its reduced cost, so none is clipped away
+    model = dict(wyndor(lb=[1.0, 0.0], ub=[1.0, np.inf]), c=np.array([cost, 5.0]))
+    result = ranged(model, backend)
+    np.testing.assert_allclose(result["x"], [1.0, 6.0])
+    np.testing.assert_allclose(result["duals"], [0.0, 2.5, 0.0], atol=1e-9)
+    np.testing.assert_allclose(result["reduced_costs"], [cost, 0.0], atol=1e-9)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from lpsolver.model import make_model
+from lpsolver.simplex import SimplexSolver
+from lpsolver.warmstart import WarmStartSession, classify_change
+
+
+def wyndor(rhs=(4.0, 12.0, 18.0)):
+    return make_model([3.0, 5.0], [[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]], ["<=", "<=", "<="], rhs)
+
+
+def cold(model):
+    solver = SimplexSolver(model)
+    return solver.result(solver.solve())
+
+
+def test_classify_change():
+    assert classify_change(wyndor(), wyndor((4.0, 12.0, 24.0))) == {"objective": False, "rhs": True, "added_rows": 0}
+    assert classify_change(wyndor(), dict(wyndor(), c=np.array([3.0, 4.0])))["objective"]
+    assert classify_change(wyndor(), dict(wyndor(), ub=np.array([1.0, np.inf]))) is None
+
+
+def test_rhs_edit_resolves_warm_to_the_cold_optimum():
+    session = WarmStartSession()
+    first = session.solve(wyndor())
+    assert not first["warm_start"] and first["objective"] == pytest.approx(36.0)
+
+    edited = wyndor((4.0, 12.0, 24.0))
+    warm = session.solve(edited)
+    assert warm["warm_start"] and warm["status"] == "Optimal"
+    assert warm["objective"] == pytest.approx(cold(edited)["objective"]) == pytest.approx(42.0)
+    np.testing.assert_allclose(warm["x"], [4.0, 6.0])
+
+
+def test_cold_iteration_count_is_a_reference_not_a_saving():
+    session = WarmStartSession()
+    first = session.solve(wyndor())
+    warm = session.solve(wyndor((4.0, 12.0, 24.0)))
+    again = session.solve(wyndor((4.0, 10.0, 24.0)))
+    assert "pivots_saved" not in warm
+    # Every warm solve in the chain refers back to the one cold solve it started from
+    assert warm["cold_iterations_reference"] == again["cold_iterations_reference"] == first["iterations"]
+
+
+def test_infeasible_edit_resets_the_session():
+    session = WarmStartSession()
+    session.solve(wyndor())
+    result = session.solve(make_model([3.0, 5.0], [[1.0, 0.0], [0.0, 2.0], [3.0, 2.0], [1.0, 1.0]],
+                                      ["<=", "<=", "<=", ">="], [4.0, 12.0, 18.0, 100.0]))
+    assert result["status"] == "Infeasible" and np.isnan(result["x"]).all()
+    assert session.state is None